@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User
+from .models import RevokedToken, User
 
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
@@ -11,7 +11,8 @@ class UserAdmin(BaseUserAdmin):
     
     fieldsets = BaseUserAdmin.fieldsets + (
         ('Additional Info', {
-            'fields': ('full_name', 'role', 'organization', 'phone', 'address', 'is_email_verified')
+            'fields': ('full_name', 'role', 'organization', 'phone', 'address', 'latitude', 'longitude',
+                       'is_email_verified', 'notification_digest_minutes')
         }),
     )
     
@@ -19,4 +20,11 @@ class UserAdmin(BaseUserAdmin):
         ('Additional Info', {
             'fields': ('email', 'full_name', 'role', 'organization', 'phone', 'address')
         }),
-    )
\ No newline at end of file
+    )
+
+@admin.register(RevokedToken)
+class RevokedTokenAdmin(admin.ModelAdmin):
+    list_display = ('jti', 'token_type', 'user', 'revoked_at', 'expires_at')
+    list_filter = ('token_type', 'revoked_at')
+    search_fields = ('jti', 'user__email')
+    ordering = ('-revoked_at',)
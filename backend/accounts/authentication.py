@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .revocation import is_token_revoked
+from .tokens import USER_CLAIM_FIELDS
+
+User = get_user_model()
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that, with settings.JWT_STATELESS_AUTH on, builds
+    request.user from the token's claims instead of SELECTing the user row.
+
+    The user is a regular User instance whose other fields are deferred; the
+    first access to any of them loads the rest of the row in one query (see
+    User.refresh_from_db). Tokens issued before the claims existed fall back
+    to the database lookup. Deactivating a user takes effect once their access
+    token expires.
+
+    Revoked tokens (see accounts.revocation) are rejected in both modes.
+    """
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        if is_token_revoked(token):
+            raise InvalidToken({'detail': 'Token has been revoked', 'code': 'token_not_valid'})
+        return token
+
+    def get_user(self, validated_token):
+        if not settings.JWT_STATELESS_AUTH or any(field not in validated_token for field in USER_CLAIM_FIELDS):
+            return super().get_user(validated_token)
+
+        known = {field: validated_token[field] for field in USER_CLAIM_FIELDS}
+        known[api_settings.USER_ID_FIELD] = validated_token.get(api_settings.USER_ID_CLAIM)
+        known['is_active'] = True
+        if known[api_settings.USER_ID_FIELD] is None:
+            return super().get_user(validated_token)
+
+        # from_db() expects the loaded fields in concrete field order
+        field_names, values = [], []
+        for field in User._meta.concrete_fields:
+            if field.attname in known:
+                field_names.append(field.attname)
+                values.append(known[field.attname])
+        user = User.from_db(DEFAULT_DB_ALIAS, field_names, values)
+        user._load_deferred_together = True
+        return user
+
+class QueryParameterJWTAuthentication(StatelessJWTAuthentication):
+    """
+    Also accepts the access token as ?token=..., for browser EventSource
+    connections, which can't send an Authorization header.
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            return result
+        raw_token = request.query_params.get('token')
+        if not raw_token:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return self.get_user(validated_token), validated_token
@@ -0,0 +1,90 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.tokens import get_tokens_for_user
+from food_listings.models import FoodListing
+from requests_app.models import FoodRequest
+
+User = get_user_model()
+
+# (label, role of the caller, path)
+ENDPOINTS = [
+    ('provider dashboard', 'FoodProvider', '/api/food/dashboard-stats/'),
+    ('provider listings', 'FoodProvider', '/api/food/'),
+    ('requests for my food', 'FoodProvider', '/api/requests/for-my-food/'),
+    ('NGO dashboard', 'NGO/Volunteer', '/api/food/dashboard-stats/'),
+    ('available food', 'NGO/Volunteer', '/api/food/available/'),
+    ('my requests', 'NGO/Volunteer', '/api/requests/my-requests/'),
+    ('profile (all fields)', 'NGO/Volunteer', '/api/auth/profile/'),
+]
+
+class Command(BaseCommand):
+    help = 'Compare queries and latency per request with database-backed vs stateless JWT auth (rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def handle(self, *args, **options):
+        with transaction.atomic(), override_settings(ALLOWED_HOSTS=['*']):
+            clients = self.seed()
+            self.stdout.write(
+                f"{'endpoint':<24}{'db queries':>12}{'stateless':>11}{'saved':>7}{'db ms':>9}{'stateless ms':>14}"
+            )
+            for label, role, path in ENDPOINTS:
+                client = clients[role]
+                client.get(path)  # warm caches so both modes see the same state
+                with override_settings(JWT_STATELESS_AUTH=False):
+                    db_queries, db_ms = self.measure(client, path, options['repeat'])
+                with override_settings(JWT_STATELESS_AUTH=True):
+                    token_queries, token_ms = self.measure(client, path, options['repeat'])
+                self.stdout.write(
+                    f"{label:<24}{db_queries:>12}{token_queries:>11}{db_queries - token_queries:>7}"
+                    f"{db_ms:>9.2f}{token_ms:>14.2f}"
+                )
+            transaction.set_rollback(True)
+
+    def seed(self):
+        provider = User.objects.create_user(
+            username='auth-bench-provider', email='auth-bench-provider@example.com', password=None,
+            full_name='Auth Benchmark Provider', role='FoodProvider',
+        )
+        ngo = User.objects.create_user(
+            username='auth-bench-ngo', email='auth-bench-ngo@example.com', password=None,
+            full_name='Auth Benchmark NGO', role='NGO/Volunteer',
+        )
+        listings = [
+            FoodListing.objects.create(
+                title=f'Auth benchmark {n}', description='Synthetic', location='Nowhere',
+                expiry_time=timezone.now() + timedelta(days=1), created_by=provider,
+            )
+            for n in range(5)
+        ]
+        FoodRequest.objects.create(food_item=listings[0], requested_by=ngo)
+
+        clients = {}
+        for user in (provider, ngo):
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {get_tokens_for_user(user).access_token}')
+            clients[user.role] = client
+        return clients
+
+    def measure(self, client, path, repeat):
+        """(queries per request, mean milliseconds per request)"""
+        # Count with an execute wrapper: request_started resets connection.queries
+        queries = []
+        with connection.execute_wrapper(lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)):
+            response = client.get(path)
+        if response.status_code != 200:
+            raise CommandError(f"GET {path} returned {response.status_code}")
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            client.get(path)
+        return len(queries), (time.perf_counter() - start) * 1000 / repeat
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts.models import RevokedToken
+
+class Command(BaseCommand):
+    help = 'Delete revocation records of tokens that have expired anyway, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        pruned = 0
+        while True:
+            # Delete by primary key in chunks so each statement stays short
+            ids = list(
+                RevokedToken.objects.filter(expires_at__lte=now)
+                .values_list('id', flat=True)[:options['batch_size']]
+            )
+            if not ids:
+                break
+            pruned += RevokedToken.objects.filter(id__in=ids).delete()[0]
+        self.stdout.write(self.style.SUCCESS(f"Pruned {pruned} expired revocations"))
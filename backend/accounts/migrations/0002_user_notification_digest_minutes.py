@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='notification_digest_minutes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.core.validators import MaxValueValidator, MinValueValidator
 
 class User(AbstractUser):
     ROLE_CHOICES = [
@@ -15,7 +16,15 @@ class User(AbstractUser):
     organization = models.CharField(max_length=255, blank=True, null=True)
     phone = models.CharField(max_length=20, blank=True, null=True)
     address = models.TextField(blank=True, null=True)
+    latitude = models.FloatField(
+        blank=True, null=True, validators=[MinValueValidator(-90), MaxValueValidator(90)]
+    )
+    longitude = models.FloatField(
+        blank=True, null=True, validators=[MinValueValidator(-180), MaxValueValidator(180)]
+    )
     is_email_verified = models.BooleanField(default=False)
+    # 0 sends request notifications immediately, otherwise they are batched into a digest
+    notification_digest_minutes = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -25,5 +34,33 @@ class User(AbstractUser):
     def __str__(self):
         return f"{self.full_name} ({self.email})"
 
+    def refresh_from_db(self, using=None, fields=None):
+        # Users built from token claims fetch all their deferred fields on the
+        # first access to any of them, instead of one query per field
+        if fields is not None and getattr(self, '_load_deferred_together', False):
+            self._load_deferred_together = False
+            fields = set(fields) | self.get_deferred_fields()
+        super().refresh_from_db(using=using, fields=fields)
+
+    class Meta:
+        db_table = 'users'
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='user_created_idx'),
+        ]
+
+class RevokedToken(models.Model):
+    """A revoked JWT, identified by its jti and kept until it would have expired anyway"""
+    jti = models.CharField(max_length=255, unique=True)
+    token_type = models.CharField(max_length=20)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='revoked_tokens', blank=True, null=True
+    )
+    expires_at = models.DateTimeField(db_index=True)
+    # Indexed for the incremental sync of per-process revocation filters
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.token_type} {self.jti}"
+
     class Meta:
-        db_table = 'users'
\ No newline at end of file
+        db_table = 'revoked_tokens'
@@ -0,0 +1,20 @@
+from food_donation.query_budgets import BUDGET_PASSWORD, QueryBudget
+
+from .tokens import get_tokens_for_user
+
+def refresh_token(world):
+    return {'refresh': str(get_tokens_for_user(world['ngo']))}
+
+QUERY_BUDGETS = [
+    QueryBudget('register', 'POST', '/api/auth/register/', None, 4, data={
+        'email': 'budget-new@example.com', 'username': 'budget-new', 'full_name': 'Budget Newcomer',
+        'role': 'Individual', 'password': 'Un1que-budget-pass', 'password_confirm': 'Un1que-budget-pass',
+    }),
+    QueryBudget('login', 'POST', '/api/auth/login/', None, 1,
+                data={'email': 'budget-ngo@example.com', 'password': BUDGET_PASSWORD}),
+    QueryBudget('refresh_token', 'POST', '/api/auth/refresh/', None, 2, data=refresh_token),
+    QueryBudget('logout', 'POST', '/api/auth/logout/', 'NGO/Volunteer', 3, data=refresh_token),
+    QueryBudget('profile', 'GET', '/api/auth/profile/', 'NGO/Volunteer', 1),
+    QueryBudget('profile_update', 'PATCH', '/api/auth/profile/', 'NGO/Volunteer', 2, data={'phone': '5550100'}),
+    QueryBudget('user_list', 'GET', '/api/auth/users/', 'Admin', 3),
+]
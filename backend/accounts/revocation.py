@@ -0,0 +1,113 @@
+"""
+JWT revocation with a per-process bloom filter in front of the database.
+
+Revoked tokens are stored in RevokedToken until they expire. Every process
+keeps a bloom filter of revoked jtis, so checking a token that was never
+revoked (nearly all of them) needs no query: the filter can only say
+"definitely not revoked" or "maybe", and only a "maybe" is confirmed against
+the table.
+
+The filter is warmed from the table on first use, picks up revocations made
+by other processes incrementally (rows revoked since the last sync, with an
+overlap for in-flight inserts and clock skew) at most every
+TOKEN_REVOCATION_SYNC_SECONDS, and is rebuilt every
+TOKEN_BLOOM_REBUILD_SECONDS so entries removed by `manage.py
+prune_revoked_tokens` stop causing lookups.
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import RevokedToken
+
+SYNC_OVERLAP = timedelta(seconds=30)
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+class RevocationList:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.filter = None
+        self.synced_since = None  # wall-clock time the next incremental sync reads from
+        self.synced_at = 0.0
+        self.built_at = 0.0
+
+    def rebuild(self):
+        started = timezone.now()
+        jtis = list(RevokedToken.objects.filter(expires_at__gt=started).values_list('jti', flat=True))
+        bloom = BloomFilter(max(settings.TOKEN_BLOOM_CAPACITY, 2 * len(jtis)), settings.TOKEN_BLOOM_ERROR_RATE)
+        for jti in jtis:
+            bloom.add(jti)
+        self.filter = bloom
+        self.synced_since = started - SYNC_OVERLAP
+        self.built_at = self.synced_at = time.monotonic()
+
+    def sync(self):
+        now = time.monotonic()
+        if self.filter is not None and now - self.synced_at < settings.TOKEN_REVOCATION_SYNC_SECONDS:
+            return
+        with self.lock:
+            if self.filter is None or now - self.built_at >= settings.TOKEN_BLOOM_REBUILD_SECONDS:
+                self.rebuild()
+                return
+            if now - self.synced_at < settings.TOKEN_REVOCATION_SYNC_SECONDS:
+                return
+            started = timezone.now()
+            # Re-reading the overlap is harmless: adding a jti twice is a no-op
+            for jti in RevokedToken.objects.filter(revoked_at__gte=self.synced_since).values_list('jti', flat=True):
+                self.filter.add(jti)
+            self.synced_since = started - SYNC_OVERLAP
+            self.synced_at = now
+
+    def is_revoked(self, jti):
+        self.sync()
+        if jti not in self.filter:
+            return False
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def add(self, jti):
+        self.sync()
+        self.filter.add(jti)
+
+revocation_list = RevocationList()
+
+def is_token_revoked(token):
+    jti = token.get(api_settings.JTI_CLAIM)
+    return jti is not None and revocation_list.is_revoked(jti)
+
+def revoke_token(token, user=None):
+    """Persist a token's revocation and add it to this process's filter right away"""
+    jti = token[api_settings.JTI_CLAIM]
+    RevokedToken.objects.bulk_create(
+        [RevokedToken(
+            jti=jti,
+            token_type=token.get(api_settings.TOKEN_TYPE_CLAIM, ''),
+            user=user,
+            expires_at=datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc),
+        )],
+        ignore_conflicts=True,
+    )
+    revocation_list.add(jti)
@@ -19,11 +19,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data.pop('password_confirm')
-        password = validated_data.pop('password')
-        user = User.objects.create_user(**validated_data)
-        user.set_password(password)
-        user.save()
-        return user
+        return User.objects.create_user(**validated_data)
 
 class UserLoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
@@ -48,10 +44,12 @@ class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('id', 'email', 'username', 'full_name', 'role', 'organization', 
-                 'phone', 'address', 'is_email_verified', 'created_at')
+                 'phone', 'address', 'latitude', 'longitude', 'is_email_verified',
+                 'notification_digest_minutes', 'created_at')
         read_only_fields = ('id', 'email', 'created_at')
 
 class UserProfileUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = ('full_name', 'organization', 'phone', 'address')
\ No newline at end of file
+        fields = ('full_name', 'organization', 'phone', 'address', 'latitude', 'longitude',
+                  'notification_digest_minutes')
\ No newline at end of file
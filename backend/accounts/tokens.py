@@ -0,0 +1,21 @@
+"""
+JWTs carrying the user's stable profile claims.
+
+The claims let StatelessJWTAuthentication build request.user without a
+database query. They are copied into every access token minted from the
+refresh token, and refreshed from the database whenever a new access token is
+issued, so a role change is picked up within ACCESS_TOKEN_LIFETIME.
+"""
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# User fields embedded in tokens; keep to fields that rarely change
+USER_CLAIM_FIELDS = ('role', 'email', 'full_name')
+
+def add_user_claims(token, user):
+    for field in USER_CLAIM_FIELDS:
+        token[field] = getattr(user, field)
+    return token
+
+def get_tokens_for_user(user):
+    """A refresh token (and, via .access_token, an access token) with the user's claims"""
+    return add_user_claims(RefreshToken.for_user(user), user)
@@ -1,7 +1,10 @@
-from django.core.mail import send_mail
+import logging
+
 from django.conf import settings
 from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+from notifications.utils import queue_email
+
+logger = logging.getLogger(__name__)
 
 def send_welcome_email(user):
     """Send welcome email to newly registered user"""
@@ -14,42 +17,27 @@ def send_welcome_email(user):
         'user': user,
         'role_description': get_role_description(user.role)
     })
-    plain_message = strip_tags(html_message)
     
     try:
-        send_mail(
-            subject=subject,
-            message=plain_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            html_message=html_message,
-            fail_silently=False,
-        )
-        print(f"Welcome email sent to {user.email}")
-    except Exception as e:
-        print(f"Failed to send welcome email to {user.email}: {str(e)}")
+        # Delivered by the outbox worker (manage.py send_queued_emails)
+        queue_email(user.email, subject, html_message)
+        logger.info('Welcome email queued for %s', user.email)
+    except Exception:
+        logger.exception('Failed to queue welcome email for %s', user.email)
 
 def send_notification_email(user, subject, template_name, context):
-    """Generic function to send notification emails"""
+    """Render a notification email and queue it for the outbox worker"""
     if not settings.NOTIFICATION_EMAIL_ENABLED:
         return
     
     context['user'] = user
     html_message = render_to_string(f'emails/{template_name}', context)
-    plain_message = strip_tags(html_message)
     
     try:
-        send_mail(
-            subject=subject,
-            message=plain_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            html_message=html_message,
-            fail_silently=False,
-        )
-        print(f"Notification email sent to {user.email}: {subject}")
-    except Exception as e:
-        print(f"Failed to send notification email to {user.email}: {str(e)}")
+        queue_email(user.email, subject, html_message)
+        logger.info('Notification email queued for %s: %s', user.email, subject)
+    except Exception:
+        logger.exception('Failed to queue notification email for %s', user.email)
 
 def get_role_description(role):
     """Get description for user role"""
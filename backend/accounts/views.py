@@ -2,7 +2,9 @@ from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 from django.contrib.auth import get_user_model
 from django.core.mail import send_mail
 from django.conf import settings
@@ -16,6 +18,8 @@ from .serializers import (
     UserSerializer,
     UserProfileUpdateSerializer
 )
+from .revocation import is_token_revoked, revoke_token
+from .tokens import USER_CLAIM_FIELDS, add_user_claims, get_tokens_for_user
 from .utils import send_welcome_email
 
 User = get_user_model()
@@ -35,7 +39,7 @@ class RegisterView(generics.CreateAPIView):
             send_welcome_email(user)
         
         # Generate tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = get_tokens_for_user(user)
         
         return Response({
             'user': UserSerializer(user).data,
@@ -53,7 +57,7 @@ class LoginView(generics.GenericAPIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data['user']
         
-        refresh = RefreshToken.for_user(user)
+        refresh = get_tokens_for_user(user)
         
         return Response({
             'user': UserSerializer(user).data,
@@ -89,9 +93,19 @@ def refresh_token(request):
     try:
         refresh_token = request.data['refresh']
         token = RefreshToken(refresh_token)
-        return Response({
-            'access': str(token.access_token)
-        })
+        if is_token_revoked(token):
+            raise InvalidToken('Token has been revoked')
+        # Re-read the claims so profile/role changes reach new access tokens
+        user = User.objects.only('id', *USER_CLAIM_FIELDS).get(id=token[jwt_settings.USER_ID_CLAIM], is_active=True)
+        data = {}
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            if jwt_settings.BLACKLIST_AFTER_ROTATION:
+                revoke_token(token, user=user)
+            token = get_tokens_for_user(user)
+            data['refresh'] = str(token)
+        access = add_user_claims(token.access_token, user)
+        data['access'] = str(access)
+        return Response(data)
     except Exception as e:
         return Response(
             {'error': 'Invalid refresh token'}, 
@@ -104,7 +118,15 @@ def logout(request):
     try:
         refresh_token = request.data['refresh']
         token = RefreshToken(refresh_token)
-        token.blacklist()
+        if str(token[jwt_settings.USER_ID_CLAIM]) != str(request.user.id):
+            return Response(
+                {'error': 'This refresh token belongs to another user'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        revoke_token(token, user=request.user)
+        # Also end the access token this request was made with
+        if isinstance(request.auth, AccessToken):
+            revoke_token(request.auth, user=request.user)
         return Response({'message': 'Logout successful!'})
     except Exception as e:
         return Response(
@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import DailyImpact
+
+@admin.register(DailyImpact)
+class DailyImpactAdmin(admin.ModelAdmin):
+    list_display = ('day', 'scope', 'user', 'listed', 'requested', 'distributed', 'expired')
+    list_filter = ('scope', 'day')
+    ordering = ('-day',)
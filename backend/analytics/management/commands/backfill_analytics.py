@@ -0,0 +1,109 @@
+from collections import Counter, defaultdict
+from datetime import date, datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, F, Min, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from analytics.models import DailyImpact
+from food_listings.models import FoodListing
+from requests_app.models import FoodRequest
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild daily impact rollups for past days from food_listings and food_requests, one chunk '
+        'of days per transaction. History has no transition times, so distributions, expiries and '
+        'completions are dated by updated_at; deleted listings are not counted.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=date.fromisoformat, help='First day (default: the first listing)')
+        parser.add_argument('--end', type=date.fromisoformat, help='Last day (default: yesterday)')
+        parser.add_argument('--chunk-days', type=int, default=31)
+
+    def handle(self, *args, **options):
+        yesterday = timezone.localdate() - timedelta(days=1)
+        end = options['end'] or yesterday
+        if end > yesterday:
+            # Today's rows are being written by live transitions
+            raise CommandError('Only past days can be backfilled; today is maintained as it happens')
+        start = options['start']
+        if start is None:
+            first = FoodListing.objects.aggregate(first=Min('created_at'))['first']
+            if first is None:
+                self.stdout.write('No listings yet; nothing to backfill')
+                return
+            start = timezone.localtime(first).date()
+
+        rows = 0
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(chunk_start + timedelta(days=options['chunk_days'] - 1), end)
+            written = self.rebuild(chunk_start, chunk_end)
+            self.stdout.write(f"{chunk_start} .. {chunk_end}: {written} rows")
+            rows += written
+            chunk_start = chunk_end + timedelta(days=1)
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {rows} rows from {start} to {end}"))
+
+    def rebuild(self, start, end):
+        """Recompute and replace the rows of days `start` to `end` in one transaction"""
+        tz = timezone.get_current_timezone()
+        since = timezone.make_aware(datetime.combine(start, time.min), tz)
+        until = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz)
+        totals = defaultdict(Counter)
+
+        def add(day, scope, user_id, metric, count, quantity):
+            keys = [(day, scope, user_id)]
+            if scope == 'provider':
+                # Platform totals are the sum over providers
+                keys.append((day, 'global', None))
+            for key in keys:
+                totals[key][metric] += count
+                totals[key][f'{metric}_quantity'] += quantity or 0
+
+        listed = (
+            FoodListing.objects.filter(created_at__gte=since, created_at__lt=until)
+            .annotate(day=TruncDate('created_at')).order_by()
+            .values('day', 'created_by_id').annotate(count=Count('id'), quantity=Sum('quantity'))
+        )
+        for row in listed:
+            add(row['day'], 'provider', row['created_by_id'], 'listed', row['count'], row['quantity'])
+
+        finished = (
+            FoodListing.objects.filter(status__in=['Distributed', 'Expired'], updated_at__gte=since, updated_at__lt=until)
+            .annotate(day=TruncDate('updated_at')).order_by()
+            .values('day', 'created_by_id', 'status').annotate(count=Count('id'), quantity=Sum('quantity'))
+        )
+        for row in finished:
+            add(row['day'], 'provider', row['created_by_id'], row['status'].lower(), row['count'], row['quantity'])
+
+        requested = (
+            FoodRequest.objects.filter(created_at__gte=since, created_at__lt=until)
+            .annotate(day=TruncDate('created_at'), provider_id=F('food_item__created_by_id')).order_by()
+            .values('day', 'requested_by_id', 'provider_id')
+            .annotate(count=Count('id'), quantity=Sum('food_item__quantity'))
+        )
+        for row in requested:
+            add(row['day'], 'provider', row['provider_id'], 'requested', row['count'], row['quantity'])
+            add(row['day'], 'ngo', row['requested_by_id'], 'requested', row['count'], row['quantity'])
+
+        completed = (
+            FoodRequest.objects.filter(status='Completed', updated_at__gte=since, updated_at__lt=until)
+            .annotate(day=TruncDate('updated_at')).order_by()
+            .values('day', 'requested_by_id').annotate(count=Count('id'), quantity=Sum('food_item__quantity'))
+        )
+        for row in completed:
+            add(row['day'], 'ngo', row['requested_by_id'], 'distributed', row['count'], row['quantity'])
+
+        with transaction.atomic():
+            DailyImpact.objects.filter(day__range=(start, end)).delete()
+            DailyImpact.objects.bulk_create(
+                [
+                    DailyImpact(day=day, scope=scope, user_id=user_id, **values)
+                    for (day, scope, user_id), values in totals.items()
+                ],
+                batch_size=1000,
+            )
+        return len(totals)
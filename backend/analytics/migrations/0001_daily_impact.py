@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:09
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyImpact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('scope', models.CharField(choices=[('global', 'Global'), ('provider', 'Provider'), ('ngo', 'NGO')], max_length=10)),
+                ('listed', models.IntegerField(default=0)),
+                ('listed_quantity', models.IntegerField(default=0)),
+                ('requested', models.IntegerField(default=0)),
+                ('requested_quantity', models.IntegerField(default=0)),
+                ('distributed', models.IntegerField(default=0)),
+                ('distributed_quantity', models.IntegerField(default=0)),
+                ('expired', models.IntegerField(default=0)),
+                ('expired_quantity', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_impact', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'analytics_daily_impact',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyimpact',
+            constraint=models.UniqueConstraint(fields=('scope', 'user', 'day'), name='daily_impact_entity_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyimpact',
+            constraint=models.UniqueConstraint(condition=models.Q(('scope', 'global')), fields=('day',), name='daily_impact_global_uniq'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+
+User = get_user_model()
+
+# Impact metrics; each has a count column and a <metric>_quantity column
+METRICS = ('listed', 'requested', 'distributed', 'expired')
+
+class DailyImpact(models.Model):
+    """
+    Impact numbers for one day, platform-wide (scope 'global', user None) or
+    for one provider or NGO.
+
+    - listed: listings created (providers, global)
+    - requested: requests made, with the requested listing's quantity
+      (the requesting NGO, the listing's provider, global)
+    - distributed: listings distributed (providers, global), or requests
+      completed (NGOs)
+    - expired: listings that expired unclaimed (providers, global)
+
+    Maintained transactionally by analytics/signals.py; past days can be
+    rebuilt with `manage.py backfill_analytics`.
+    """
+    SCOPE_CHOICES = [
+        ('global', 'Global'),
+        ('provider', 'Provider'),
+        ('ngo', 'NGO'),
+    ]
+
+    day = models.DateField()
+    scope = models.CharField(max_length=10, choices=SCOPE_CHOICES)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='daily_impact', blank=True, null=True)
+    listed = models.IntegerField(default=0)
+    listed_quantity = models.IntegerField(default=0)
+    requested = models.IntegerField(default=0)
+    requested_quantity = models.IntegerField(default=0)
+    distributed = models.IntegerField(default=0)
+    distributed_quantity = models.IntegerField(default=0)
+    expired = models.IntegerField(default=0)
+    expired_quantity = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'analytics_daily_impact'
+        constraints = [
+            # Also the index behind range queries for one scope and user
+            models.UniqueConstraint(fields=['scope', 'user', 'day'], name='daily_impact_entity_uniq'),
+            models.UniqueConstraint(
+                fields=['day'], condition=models.Q(scope='global'), name='daily_impact_global_uniq'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.scope} {self.user_id or ''}".strip()
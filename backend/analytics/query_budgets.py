@@ -0,0 +1,7 @@
+from food_donation.query_budgets import QueryBudget
+
+QUERY_BUDGETS = [
+    QueryBudget('analytics_provider', 'GET', '/api/analytics/', 'FoodProvider', 2),
+    QueryBudget('analytics_ngo', 'GET', '/api/analytics/?interval=week', 'NGO/Volunteer', 2),
+    QueryBudget('analytics_admin', 'GET', '/api/analytics/?interval=month', 'Admin', 2),
+]
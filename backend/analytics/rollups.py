@@ -0,0 +1,97 @@
+"""
+Incrementally maintained daily impact rollups (analytics.models.DailyImpact).
+
+Changes are described as facts: (day, scope, user_id, metric, quantity)
+tuples, each one more `metric` event of `quantity` units. Facts are folded into
+per-row deltas and applied with a single conditional UPDATE. Rows a day has not
+seen yet are inserted first, then incremented the same way.
+"""
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+
+from .models import METRICS, DailyImpact
+
+def impact_deltas(facts):
+    """Fold facts into {(day, scope, user_id): Counter({column: delta})}"""
+    deltas = defaultdict(Counter)
+    for day, scope, user_id, metric, quantity in facts:
+        key = (day, scope, None if scope == 'global' else user_id)
+        deltas[key][metric] += 1
+        deltas[key][f'{metric}_quantity'] += quantity
+    return deltas
+
+def _condition(day, scope, user_id):
+    if user_id is None:
+        return Q(day=day, scope=scope, user__isnull=True)
+    return Q(day=day, scope=scope, user_id=user_id)
+
+def _increment(deltas):
+    """Add `deltas` to their rows with one UPDATE; return the number of rows matched"""
+    scope = Q()
+    whens = defaultdict(list)
+    for key, delta in deltas.items():
+        condition = _condition(*key)
+        scope |= condition
+        for column, amount in delta.items():
+            whens[column].append(When(condition, then=Value(amount)))
+    return DailyImpact.objects.filter(scope).update(**{
+        column: F(column) + Case(*column_whens, default=Value(0))
+        for column, column_whens in whens.items()
+    })
+
+def apply_impact(facts):
+    """Add facts to the rollups. Normally a single UPDATE."""
+    deltas = impact_deltas(facts)
+    if not deltas:
+        return
+
+    with transaction.atomic():
+        if _increment(deltas) == len(deltas):
+            return
+
+        scope = Q()
+        for key in deltas:
+            scope |= _condition(*key)
+        existing = set(DailyImpact.objects.filter(scope).values_list('day', 'scope', 'user_id'))
+        missing = {key: delta for key, delta in deltas.items() if key not in existing}
+        # Rows another transaction created in the meantime are skipped here
+        # and incremented below like the rest
+        DailyImpact.objects.bulk_create(
+            [DailyImpact(day=day, scope=scope_name, user_id=user_id) for day, scope_name, user_id in missing],
+            ignore_conflicts=True,
+        )
+        _increment(missing)
+
+def period_start(day, interval):
+    if interval == 'week':
+        return day - timedelta(days=day.weekday())
+    if interval == 'month':
+        return day.replace(day=1)
+    return day
+
+def get_impact_series(scope, user_id, start, end, interval='day'):
+    """
+    Metrics from `start` to `end` (inclusive) in day, week (from Monday) or
+    month buckets: (series, totals), with empty buckets filled with zeros.
+    """
+    columns = [column for metric in METRICS for column in (metric, f'{metric}_quantity')]
+    buckets = {}
+    day = start
+    while day <= end:
+        buckets.setdefault(period_start(day, interval), dict.fromkeys(columns, 0))
+        day += timedelta(days=1)
+
+    rows = DailyImpact.objects.filter(scope=scope, day__range=(start, end))
+    rows = rows.filter(user__isnull=True) if user_id is None else rows.filter(user_id=user_id)
+    totals = dict.fromkeys(columns, 0)
+    for row in rows.values('day', *columns):
+        bucket = buckets[period_start(row['day'], interval)]
+        for column in columns:
+            bucket[column] += row[column]
+            totals[column] += row[column]
+
+    series = [{'period': period.isoformat(), **values} for period, values in buckets.items()]
+    return series, totals
@@ -0,0 +1,93 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from food_listings.models import FoodListing
+from food_listings.signals import listings_bulk_changed
+from requests_app.models import FoodRequest
+from requests_app.signals import requests_bulk_changed
+from .rollups import apply_impact
+
+# Listing statuses that count as impact when a listing reaches them
+LISTING_METRICS = {'Distributed': 'distributed', 'Expired': 'expired'}
+
+def listing_metric(old_status, new_status):
+    if old_status is None:
+        return 'listed' if new_status is not None else None
+    if old_status != new_status:
+        return LISTING_METRICS.get(new_status)
+    return None
+
+def request_metric(old_status, new_status):
+    if old_status is None:
+        return 'requested' if new_status is not None else None
+    if old_status != new_status and new_status == 'Completed':
+        return 'distributed'
+    return None
+
+def listing_facts(provider_id, old_status, new_status, quantity):
+    metric = listing_metric(old_status, new_status)
+    if metric is None:
+        return []
+    day = timezone.localdate()
+    return [(day, 'provider', provider_id, metric, quantity), (day, 'global', None, metric, quantity)]
+
+def request_facts(requester_id, provider_id, old_status, new_status, quantity):
+    metric = request_metric(old_status, new_status)
+    if metric is None:
+        return []
+    day = timezone.localdate()
+    if metric == 'distributed':
+        # Listing-side distribution is counted when the listing moves
+        return [(day, 'ngo', requester_id, metric, quantity)]
+    return [
+        (day, 'ngo', requester_id, metric, quantity),
+        (day, 'provider', provider_id, metric, quantity),
+        (day, 'global', None, metric, quantity),
+    ]
+
+def listing_quantities(listing_ids):
+    return dict(FoodListing.objects.filter(id__in=listing_ids).values_list('id', 'quantity'))
+
+@receiver(post_save, sender=FoodListing)
+def roll_up_saved_listing(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_status = None if created else getattr(instance, '_loaded_values', {}).get('status', instance.status)
+    apply_impact(listing_facts(instance.created_by_id, old_status, instance.status, instance.quantity))
+
+@receiver(listings_bulk_changed)
+def roll_up_bulk_listing_changes(sender, changes, **kwargs):
+    changes = [change for change in changes if listing_metric(change[2], change[3])]
+    if not changes:
+        return
+    quantities = listing_quantities([listing_id for listing_id, _, _, _ in changes])
+    apply_impact([
+        fact
+        for listing_id, provider_id, old_status, new_status in changes
+        for fact in listing_facts(provider_id, old_status, new_status, quantities.get(listing_id, 0))
+    ])
+
+@receiver(post_save, sender=FoodRequest)
+def roll_up_saved_request(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_status = None if created else getattr(instance, '_loaded_values', {}).get('status', instance.status)
+    if request_metric(old_status, instance.status) is None:
+        return
+    listing = instance.food_item
+    apply_impact(request_facts(
+        instance.requested_by_id, listing.created_by_id, old_status, instance.status, listing.quantity
+    ))
+
+@receiver(requests_bulk_changed)
+def roll_up_bulk_request_changes(sender, changes, **kwargs):
+    changes = [change for change in changes if request_metric(change[4], change[5])]
+    if not changes:
+        return
+    quantities = listing_quantities({change[1] for change in changes})
+    apply_impact([
+        fact
+        for _request_id, listing_id, requester_id, provider_id, old_status, new_status in changes
+        for fact in request_facts(requester_id, provider_id, old_status, new_status, quantities.get(listing_id, 0))
+    ])
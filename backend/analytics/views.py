@@ -0,0 +1,80 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from .models import METRICS
+from .rollups import get_impact_series
+
+# The entity scope each role sees by default
+ROLE_SCOPES = {'FoodProvider': 'provider', 'NGO/Volunteer': 'ngo', 'Admin': 'global'}
+INTERVALS = ('day', 'week', 'month')
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def impact(request):
+    """
+    Impact time series from the daily rollups.
+
+    Query parameters: scope (global, provider or ngo; defaults to the caller's
+    own), user (Admins only, for another provider or NGO), start and end
+    (YYYY-MM-DD, inclusive; the last 30 days by default) and interval
+    (day, week or month).
+    """
+    user = request.user
+    params = request.query_params
+    scope = params.get('scope', ROLE_SCOPES.get(user.role, 'global'))
+    interval = params.get('interval', 'day')
+
+    if scope not in ROLE_SCOPES.values() or interval not in INTERVALS:
+        return Response(
+            {'error': f'scope must be one of global, provider, ngo and interval one of {", ".join(INTERVALS)}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        end = date.fromisoformat(params['end']) if 'end' in params else timezone.localdate()
+        start = date.fromisoformat(params['start']) if 'start' in params else end - timedelta(days=29)
+        user_id = int(params['user']) if 'user' in params else None
+    except ValueError:
+        return Response(
+            {'error': 'start and end must be YYYY-MM-DD dates and user an id'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if start > end or (end - start).days >= settings.ANALYTICS_MAX_RANGE_DAYS:
+        return Response(
+            {'error': f'start must not be after end, and ranges are limited to {settings.ANALYTICS_MAX_RANGE_DAYS} days'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if scope == 'global':
+        user_id = None
+    elif user.role == 'Admin':
+        if user_id is None:
+            return Response(
+                {'error': f'user is required for the {scope} scope'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    elif scope != ROLE_SCOPES.get(user.role) or user_id not in (None, user.id):
+        return Response(
+            {'error': 'You can only view your own or platform-wide impact'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    else:
+        user_id = user.id
+
+    series, totals = get_impact_series(scope, user_id, start, end, interval)
+    return Response({
+        'scope': scope,
+        'user': user_id,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'interval': interval,
+        'metrics': list(METRICS),
+        'series': series,
+        'totals': totals,
+    })
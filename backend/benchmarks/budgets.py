@@ -0,0 +1,163 @@
+"""
+Measuring the query budgets declared in <app>/query_budgets.py.
+
+check_budgets() calls every endpoint against the dataset described in
+food_donation/query_budgets.py, once with 1 row and once with N rows per
+collection, inside transactions that are rolled back. It is shared by
+`manage.py check_query_budgets` and the benchmarks test suite.
+"""
+import re
+import uuid
+from collections import Counter
+from datetime import timedelta
+from importlib import import_module
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+from django.utils.module_loading import module_has_submodule
+from rest_framework.test import APIClient
+
+from accounts.tokens import get_tokens_for_user
+from food_donation.query_budgets import BUDGET_PASSWORD
+from food_listings.models import FoodListing, ListingStatusCounter
+from requests_app.models import FoodRequest
+
+User = get_user_model()
+
+# Literals and savepoint ids differ per call; strip them so repeated statements group together
+LITERALS = re.compile(r"'[^']*'|\bs\d+_x\d+\b|\b\d+\b")
+
+def collect_budgets(selected=None):
+    """QUERY_BUDGETS from every installed app's query_budgets module"""
+    budgets = []
+    for app_config in apps.get_app_configs():
+        if module_has_submodule(app_config.module, 'query_budgets'):
+            module = import_module(f'{app_config.name}.query_budgets')
+            budgets.extend(getattr(module, 'QUERY_BUDGETS', []))
+    if selected:
+        budgets = [budget for budget in budgets if budget.name in selected]
+    return budgets
+
+def check_budgets(budgets, rows):
+    """
+    Measure `budgets` with 1 and with `rows` rows per collection.
+
+    Returns one {'budget', 'small', 'large', 'problems'} per budget, where
+    small/large are {'status', 'sql'} and problems is empty when it passed.
+    """
+    # Fresh caches per run and no revocation re-syncs mid-measurement, so
+    # the 1-row and N-row runs see the same cache state
+    with override_settings(ALLOWED_HOSTS=['*'], TOKEN_REVOCATION_SYNC_SECONDS=10 ** 9,
+                           TOKEN_BLOOM_REBUILD_SECONDS=10 ** 9):
+        small = measure_all(budgets, 1)
+        large = measure_all(budgets, rows)
+
+    results = []
+    for budget in budgets:
+        one, many = small[budget.name], large[budget.name]
+        problems = []
+        if one['status'] >= 400 or many['status'] >= 400:
+            problems.append(f"HTTP {one['status']}/{many['status']}")
+        if len(many['sql']) > len(one['sql']):
+            problems.append('grows with N')
+        if max(len(one['sql']), len(many['sql'])) > budget.queries:
+            problems.append('over budget')
+        results.append({'budget': budget, 'small': one, 'large': many, 'problems': problems})
+    return results
+
+def measure_all(budgets, rows):
+    """{budget name: {'status', 'sql'}} against a dataset with `rows` rows per collection"""
+    results = {}
+    cache = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'query-budgets-{uuid.uuid4()}'}
+    with transaction.atomic(), override_settings(CACHES={'default': cache}):
+        world = seed(rows)
+        users = {user.role: user for user in world.values() if isinstance(user, User)}
+        # Loads per-process state (revocation filter, content types) outside the measurement
+        client_for(users['Admin']).get('/api/auth/profile/')
+
+        placeholders = {key: value.pk for key, value in world.items()}
+        for budget in budgets:
+            # A fresh token per call, so logging out doesn't affect later calls
+            client = client_for(users[budget.role]) if budget.role else APIClient()
+            results[budget.name] = measure(client, budget, world, placeholders)
+        transaction.set_rollback(True)
+    return results
+
+def client_for(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {get_tokens_for_user(user).access_token}')
+    return client
+
+def measure(client, budget, world, placeholders):
+    path = budget.path.format_map(placeholders)
+    data = budget.data(world) if callable(budget.data) else budget.data
+    if isinstance(data, dict):
+        data = {key: value.format_map(placeholders) if isinstance(value, str) else value
+                for key, value in data.items()}
+    statements = []
+
+    def record(execute, sql, params, many, context):
+        statements.append(sql)
+        return execute(sql, params, many, context)
+
+    # Each call runs in a savepoint so writes don't leak into the next budget
+    with transaction.atomic():
+        with connection.execute_wrapper(record):
+            response = getattr(client, budget.method.lower())(path, data, format='json')
+            if hasattr(response, 'streaming_content'):
+                b''.join(response.streaming_content)
+        transaction.set_rollback(True)
+    return {'status': response.status_code, 'sql': statements}
+
+def sql_report(small, large):
+    """Lines for the large run's statements, marking those that ran more often than with 1 row"""
+    baseline = Counter(LITERALS.sub('?', sql) for sql in small)
+    return [
+        f"  {'!!' if count > baseline[shape] else '  '} {count:>3} x {shape}"
+        for shape, count in Counter(LITERALS.sub('?', sql) for sql in large).items()
+    ]
+
+def seed(rows):
+    """The dataset described in food_donation/query_budgets.py"""
+    now = timezone.now()
+    password = make_password(BUDGET_PASSWORD)
+    world = {}
+    for key, role in (('provider', 'FoodProvider'), ('ngo', 'NGO/Volunteer'),
+                      ('individual', 'Individual'), ('admin', 'Admin')):
+        world[key] = User.objects.create(
+            username=f'budget-{key}', email=f'budget-{key}@example.com', password=password,
+            full_name=f'Budget {role}', role=role, latitude=28.6, longitude=77.2,
+        )
+
+    for n in range(rows):
+        listing = FoodListing.objects.create(
+            title=f'Budget available {n}', description='Synthetic', location='Nowhere',
+            latitude=28.6 + n / 1000, longitude=77.2, expiry_time=now + timedelta(hours=12 + n),
+            created_by=world['provider'],
+        )
+        requested = FoodListing.objects.create(
+            title=f'Budget requested {n}', description='Synthetic', location='Nowhere',
+            latitude=28.6, longitude=77.2 + n / 1000, expiry_time=now + timedelta(hours=12 + n),
+            status='Requested', created_by=world['provider'],
+        )
+        other_ngo = User.objects.create_user(
+            username=f'budget-ngo-{n}', email=f'budget-ngo-{n}@example.com', password=None,
+            full_name=f'Budget NGO {n}', role='NGO/Volunteer',
+        )
+        request = FoodRequest.objects.create(food_item=requested, requested_by=world['ngo'])
+        FoodRequest.objects.create(food_item=requested, requested_by=other_ngo)
+        if n == 0:
+            world.update(listing=listing, requested_listing=requested, request=request)
+
+    # Counter rows are created the first time a provider reaches a status,
+    # which would make the first transition into it cost extra queries
+    ListingStatusCounter.objects.bulk_create([
+        ListingStatusCounter(provider=provider, status=status, count=0)
+        for provider in (world['provider'], None)
+        for status, _ in FoodListing.STATUS_CHOICES
+    ], ignore_conflicts=True)
+    return world
@@ -0,0 +1,128 @@
+"""
+Synthetic data for load benchmarks.
+
+Everything is written with bulk_create, so the side effects that normally
+happen in save() and signal handlers are applied explicitly: geohashes are
+computed, the search index is filled and listings_bulk_changed keeps the
+status counters and feed cache in step.
+
+Generated users have `bench-` emails and share BENCHMARK_PASSWORD, so they can
+log in and be removed again with clear_synthetic_data().
+"""
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from food_listings.geo import encode_geohash
+from food_listings.models import FoodListing
+from food_listings.search import get_backend, index_listings
+from food_listings.signals import listings_bulk_changed
+from requests_app.models import FoodRequest
+
+User = get_user_model()
+
+BENCHMARK_PASSWORD = 'bench-password'
+EMAIL_PREFIX = 'bench-'
+
+FOODS = ['rice', 'dal', 'biryani', 'chapati', 'paneer', 'sandwich', 'bread', 'fruit', 'salad',
+         'curry', 'noodles', 'pasta', 'idli', 'dosa', 'samosa', 'milk', 'curd', 'vegetables',
+         'pulao', 'khichdi', 'soup', 'cake', 'muffins', 'poha', 'upma', 'halwa']
+ADJECTIVES = ['Fresh', 'Leftover', 'Surplus', 'Packed', 'Hot', 'Vegetarian', 'Homemade', 'Frozen']
+# (place, latitude, longitude)
+PLACES = [
+    ('Connaught Place, Delhi', 28.6315, 77.2167), ('Karol Bagh, Delhi', 28.6519, 77.1909),
+    ('Sector 18, Noida', 28.5708, 77.3261), ('Cyber City, Gurgaon', 28.4949, 77.0887),
+    ('Dwarka, Delhi', 28.5921, 77.0460), ('Saket, Delhi', 28.5245, 77.2066),
+    ('Andheri, Mumbai', 19.1136, 72.8697), ('Bandra, Mumbai', 19.0596, 72.8295),
+    ('Koramangala, Bangalore', 12.9352, 77.6245), ('Indiranagar, Bangalore', 12.9784, 77.6408),
+]
+# Share of listings per status, and the status their requests end up in
+LISTING_STATUSES = {'Available': 30, 'Requested': 10, 'Collected': 10, 'Distributed': 35, 'Expired': 15}
+REQUEST_STATUS_FOR_LISTING = {
+    'Requested': 'Pending', 'Collected': 'Approved', 'Distributed': 'Completed', 'Expired': 'Rejected',
+}
+
+def generate_synthetic_data(users_per_role, listings, max_requests_per_listing=3, seed=0, batch_size=2000):
+    """
+    Create users ({role: count}), listings and requests. Returns {model: rows created}.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    password = make_password(BENCHMARK_PASSWORD)
+    offset = User.objects.filter(email__startswith=EMAIL_PREFIX).count()
+
+    with transaction.atomic():
+        users = []
+        for role, count in users_per_role.items():
+            slug = role.lower().replace('/', '-')
+            for n in range(count):
+                number = offset + len(users)
+                place, lat, lng = rng.choice(PLACES)
+                users.append(User(
+                    username=f'{EMAIL_PREFIX}{slug}-{number}', email=f'{EMAIL_PREFIX}{slug}-{number}@example.com',
+                    password=password, full_name=f'Benchmark {role} {number}', role=role,
+                    organization=f'Benchmark Org {number % 50}', address=place, latitude=lat, longitude=lng,
+                    is_staff=role == 'Admin',
+                ))
+        users = User.objects.bulk_create(users, batch_size=batch_size)
+        providers = [user.id for user in users if user.role == 'FoodProvider']
+        requesters = [user.id for user in users if user.role in ('NGO/Volunteer', 'Individual')]
+
+        created_listings = created_requests = 0
+        statuses, weights = zip(*LISTING_STATUSES.items())
+        for start in range(0, listings if providers else 0, batch_size):
+            batch = []
+            for _ in range(min(batch_size, listings - start)):
+                place, lat, lng = rng.choice(PLACES)
+                lat += rng.uniform(-0.05, 0.05)
+                lng += rng.uniform(-0.05, 0.05)
+                status = rng.choices(statuses, weights)[0]
+                if status == 'Expired':
+                    expiry = now - timedelta(hours=rng.uniform(1, 24 * 30))
+                elif status == 'Available':
+                    expiry = now + timedelta(hours=rng.uniform(1, 72))
+                else:
+                    expiry = now + timedelta(hours=rng.uniform(-24 * 30, 72))
+                food = rng.choice(FOODS)
+                batch.append(FoodListing(
+                    title=f'{rng.choice(ADJECTIVES)} {food}',
+                    description=f'{rng.randint(2, 40)} servings of {food} and {rng.choice(FOODS)}, packed and ready',
+                    quantity=rng.randint(1, 50), location=place, latitude=lat, longitude=lng,
+                    geohash=encode_geohash(lat, lng), expiry_time=expiry, status=status,
+                    created_by_id=rng.choice(providers),
+                ))
+            batch = FoodListing.objects.bulk_create(batch)
+            if get_backend() == 'inverted':
+                index_listings(batch)
+            listings_bulk_changed.send(
+                sender=FoodListing,
+                changes=[(listing.id, listing.created_by_id, None, listing.status) for listing in batch],
+            )
+            created_listings += len(batch)
+
+            requests = []
+            for listing in batch:
+                request_status = REQUEST_STATUS_FOR_LISTING.get(listing.status)
+                if request_status is None or not requesters:
+                    continue
+                count = rng.randint(1, min(max_requests_per_listing, len(requesters)))
+                for index, requester in enumerate(rng.sample(requesters, count)):
+                    # One request decided the listing's fate; the others were turned down
+                    status = request_status if index == 0 or request_status == 'Pending' else 'Rejected'
+                    requests.append(FoodRequest(
+                        food_item_id=listing.id, requested_by_id=requester, status=status,
+                        message=rng.choice(['', 'We can pick up within the hour', 'For our evening meal service']),
+                    ))
+            created_requests += len(FoodRequest.objects.bulk_create(requests, batch_size=batch_size))
+
+    return {'users': len(users), 'listings': created_listings, 'requests': created_requests}
+
+def clear_synthetic_data():
+    """Delete generated users; their listings and requests cascade (counters follow via post_delete)"""
+    with transaction.atomic():
+        deleted, _ = User.objects.filter(email__startswith=EMAIL_PREFIX).delete()
+    return deleted
@@ -0,0 +1,85 @@
+import json
+import math
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from benchmarks.management.commands.run_benchmarks import percentile
+from requests_app.routes import plan_route
+
+# Where synthetic pickups are scattered (central Delhi)
+CENTER = (28.6139, 77.2090)
+
+class Command(BaseCommand):
+    help = (
+        'Time pickup route planning (nearest neighbour + 2-opt with deadlines) on random stop sets, '
+        'without the distance matrix or plan caches; fails if p95 exceeds --max-ms'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stops', type=int, default=50)
+        parser.add_argument('--runs', type=int, default=50, help='Random stop sets to plan')
+        parser.add_argument('--radius-km', type=float, default=15)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--max-ms', type=float, default=100, help='p95 planning time to pass')
+        parser.add_argument('--json', metavar='PATH', help="Also write results as JSON ('-' for stdout)")
+
+    def random_stops(self, rng, departure, count, radius_km):
+        stops = []
+        for _ in range(count):
+            distance = radius_km * math.sqrt(rng.random())
+            bearing = rng.uniform(0, 2 * math.pi)
+            stops.append({
+                'latitude': CENTER[0] + distance * math.cos(bearing) / 111.32,
+                'longitude': CENTER[1] + distance * math.sin(bearing) / (111.32 * math.cos(math.radians(CENTER[0]))),
+                # Listings expire from one to twelve hours out
+                'deadline': departure + timedelta(minutes=rng.uniform(60, 720)),
+            })
+        return stops
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        departure = timezone.now().replace(second=0, microsecond=0)
+        timings, distances, late = [], [], []
+
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}):
+            for _ in range(options['runs']):
+                stops = self.random_stops(rng, departure, options['stops'], options['radius_km'])
+                started = time.perf_counter()
+                plan = plan_route(CENTER, stops, departure)
+                timings.append((time.perf_counter() - started) * 1000)
+                distances.append(plan['distance_km'])
+                late.append(plan['late'])
+
+        timings.sort()
+        report = {
+            'stops': options['stops'],
+            'runs': options['runs'],
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'max_ms': round(timings[-1], 2),
+            'mean_distance_km': round(statistics.mean(distances), 2),
+            'mean_late_stops': round(statistics.mean(late), 2),
+        }
+
+        if options['json'] != '-':
+            self.stdout.write(
+                f"{report['stops']} stops x {report['runs']} runs: p50 {report['p50_ms']} ms, "
+                f"p95 {report['p95_ms']} ms, max {report['max_ms']} ms; "
+                f"mean route {report['mean_distance_km']} km, {report['mean_late_stops']} late stops"
+            )
+        if options['json'] == '-':
+            self.stdout.write(json.dumps(report, indent=2))
+        elif options['json']:
+            with open(options['json'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Wrote {options['json']}")
+
+        if report['p95_ms'] > options['max_ms']:
+            raise CommandError(f"p95 planning time {report['p95_ms']} ms exceeds {options['max_ms']} ms")
+        self.stdout.write(self.style.SUCCESS(f"Planning is within {options['max_ms']} ms at p95"))
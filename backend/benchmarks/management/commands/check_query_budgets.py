@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.budgets import check_budgets, collect_budgets, sql_report
+
+class Command(BaseCommand):
+    help = (
+        'Call every endpoint declared in <app>/query_budgets.py with 1 and with N rows and fail '
+        'if its query count grows with N or exceeds the budget (everything is rolled back)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10, help='N: rows per collection in the large run')
+        parser.add_argument('--budget', action='append', help='Only check these budgets (repeatable)')
+        parser.add_argument('--show-sql', action='store_true', help='Print the SQL of every endpoint')
+
+    def handle(self, *args, **options):
+        budgets = collect_budgets(options['budget'])
+        if not budgets:
+            raise CommandError('No query budgets found')
+        rows = options['rows']
+        if rows < 2:
+            raise CommandError('--rows must be at least 2')
+
+        self.stdout.write(f"{'endpoint':<30}{'method':<8}{'budget':>7}{'1 row':>7}{f'{rows} rows':>9}  result")
+        failures = []
+        for result in check_budgets(budgets, rows):
+            budget, one, many, problems = result['budget'], result['small'], result['large'], result['problems']
+            outcome = self.style.ERROR(', '.join(problems)) if problems else self.style.SUCCESS('ok')
+            self.stdout.write(
+                f"{budget.name:<30}{budget.method:<8}{budget.queries:>7}{len(one['sql']):>7}{len(many['sql']):>9}  {outcome}"
+            )
+            if problems:
+                failures.append(budget.name)
+            if problems or options['show_sql']:
+                self.stdout.write('\n'.join(sql_report(one['sql'], many['sql'])))
+
+        if failures:
+            raise CommandError(f"{len(failures)} endpoint(s) broke their query budget: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS(f'All {len(budgets)} endpoints are within budget'))
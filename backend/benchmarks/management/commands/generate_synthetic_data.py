@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from benchmarks.generator import BENCHMARK_PASSWORD, clear_synthetic_data, generate_synthetic_data
+
+class Command(BaseCommand):
+    help = 'Bulk-create synthetic users (every role), listings and requests for load benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--listings', type=int, default=10_000)
+        parser.add_argument('--providers', type=int, default=100)
+        parser.add_argument('--ngos', type=int, default=200)
+        parser.add_argument('--individuals', type=int, default=100)
+        parser.add_argument('--admins', type=int, default=2)
+        parser.add_argument('--max-requests-per-listing', type=int, default=3)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--clear', action='store_true', help='Delete previously generated data first')
+        parser.add_argument('--delete', action='store_true', help='Only delete previously generated data')
+
+    def handle(self, *args, **options):
+        if options['clear'] or options['delete']:
+            self.stdout.write(f"Deleted {clear_synthetic_data()} rows of earlier synthetic data")
+            if options['delete']:
+                return
+
+        users_per_role = {
+            'FoodProvider': options['providers'],
+            'NGO/Volunteer': options['ngos'],
+            'Individual': options['individuals'],
+            'Admin': options['admins'],
+        }
+
+        created = generate_synthetic_data(
+            users_per_role, options['listings'], options['max_requests_per_listing'],
+            seed=options['seed'], batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {created['users']} users, {created['listings']} listings and {created['requests']} requests "
+            f"(password for all generated users: {BENCHMARK_PASSWORD})"
+        ))
@@ -0,0 +1,215 @@
+import json
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.tokens import get_tokens_for_user
+from benchmarks.generator import BENCHMARK_PASSWORD, EMAIL_PREFIX
+from food_listings.models import FoodListing
+from requests_app.models import FoodRequest
+
+User = get_user_model()
+
+# (name, role of the caller, method, path)
+SCENARIOS = [
+    ('food_list', 'FoodProvider', 'GET', '/api/food/'),
+    ('available_food', 'NGO/Volunteer', 'GET', '/api/food/available/'),
+    ('dashboard_provider', 'FoodProvider', 'GET', '/api/food/dashboard-stats/'),
+    ('dashboard_ngo', 'NGO/Volunteer', 'GET', '/api/food/dashboard-stats/'),
+    ('dashboard_admin', 'Admin', 'GET', '/api/food/dashboard-stats/'),
+    ('requests_list', 'Admin', 'GET', '/api/requests/'),
+    ('login', 'NGO/Volunteer', 'POST', '/api/auth/login/'),
+]
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a sorted list"""
+    index = max(0, min(len(samples) - 1, round(pct / 100 * len(samples)) - 1))
+    return samples[index]
+
+class Command(BaseCommand):
+    help = (
+        'Load-test the hot endpoints as generated users (see generate_synthetic_data) and report '
+        'latency percentiles, throughput and queries per request'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per scenario')
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument('--scenario', action='append', choices=[name for name, *_ in SCENARIOS],
+                            help='Only run these scenarios (repeatable)')
+        parser.add_argument('--base-url', help='Benchmark a running server over HTTP instead of in-process')
+        parser.add_argument('--concurrency', type=int, default=1, help='Parallel clients with --base-url')
+        parser.add_argument('--json', metavar='PATH', help="Also write results as JSON ('-' for stdout)")
+
+    def handle(self, *args, **options):
+        users = self.pick_users()
+        scenarios = [s for s in SCENARIOS if not options['scenario'] or s[0] in options['scenario']]
+        run = self.run_http if options['base_url'] else self.run_in_process
+
+        results = []
+        with override_settings(ALLOWED_HOSTS=['*']):
+            for name, role, method, path in scenarios:
+                if role not in users:
+                    self.stderr.write(f"Skipping {name}: no generated {role} user")
+                    continue
+                result = run(users[role], method, path, options)
+                result.update(name=name, role=role, method=method, path=path)
+                results.append(result)
+
+        report = {
+            'timestamp': timezone.now().isoformat(),
+            'mode': 'http' if options['base_url'] else 'in-process',
+            'base_url': options['base_url'],
+            'concurrency': options['concurrency'] if options['base_url'] else 1,
+            'database': connection.vendor,
+            'settings': {
+                'DEBUG': settings.DEBUG,
+                'JWT_STATELESS_AUTH': settings.JWT_STATELESS_AUTH,
+                'FOOD_SEARCH_BACKEND': settings.FOOD_SEARCH_BACKEND,
+                'CACHE_BACKEND': settings.CACHES['default']['BACKEND'],
+            },
+            'dataset': {
+                'users': User.objects.count(),
+                'listings': FoodListing.objects.count(),
+                'requests': FoodRequest.objects.count(),
+            },
+            'results': results,
+        }
+
+        if options['json'] != '-':
+            self.print_table(report)
+        if options['json'] == '-':
+            self.stdout.write(json.dumps(report, indent=2))
+        elif options['json']:
+            with open(options['json'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Wrote {options['json']}")
+
+    def pick_users(self):
+        """The first generated user of each role"""
+        users = {}
+        for role, _label in User.ROLE_CHOICES:
+            user = User.objects.filter(email__startswith=EMAIL_PREFIX, role=role).order_by('id').first()
+            if user is not None:
+                users[role] = user
+        if not users:
+            raise CommandError('No generated users found; run `manage.py generate_synthetic_data` first')
+        return users
+
+    def request_args(self, user, method, path):
+        """(headers, body) for one request as `user`"""
+        if method == 'POST':
+            return {}, {'email': user.email, 'password': BENCHMARK_PASSWORD}
+        return {'Authorization': f'Bearer {get_tokens_for_user(user).access_token}'}, None
+
+    def run_in_process(self, user, method, path, options):
+        headers, body = self.request_args(user, method, path)
+        client = APIClient()
+        if 'Authorization' in headers:
+            client.credentials(HTTP_AUTHORIZATION=headers['Authorization'])
+
+        def send():
+            if method == 'POST':
+                return client.post(path, body, format='json')
+            return client.get(path)
+
+        for _ in range(options['warmup']):
+            send()
+
+        timings = []
+        queries = 0
+        errors = 0
+        # Count with an execute wrapper: request_started resets connection.queries
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        with connection.execute_wrapper(count):
+            for _ in range(options['requests']):
+                before = time.perf_counter()
+                response = send()
+                timings.append(time.perf_counter() - before)
+                errors += response.status_code >= 400
+        elapsed = time.perf_counter() - started
+        return self.summarize(timings, elapsed, errors, queries / max(len(timings), 1))
+
+    def run_http(self, user, method, path, options):
+        headers, body = self.request_args(user, method, path)
+        headers['Accept'] = 'application/json'
+        url = options['base_url'].rstrip('/') + path
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode()
+            headers['Content-Type'] = 'application/json'
+
+        def send(_=None):
+            request = urllib.request.Request(url, data=data, headers=headers, method=method)
+            before = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request) as response:
+                    response.read()
+                    failed = False
+            except urllib.error.HTTPError as e:
+                e.read()
+                failed = e.code >= 400
+            except urllib.error.URLError as e:
+                raise CommandError(f"{method} {url} failed: {e.reason}")
+            return time.perf_counter() - before, failed
+
+        for _ in range(options['warmup']):
+            send()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(options['concurrency'], 1)) as pool:
+            outcomes = list(pool.map(send, range(options['requests'])))
+        elapsed = time.perf_counter() - started
+        # Queries run in the server process and can't be counted from here
+        return self.summarize(
+            [timing for timing, _ in outcomes], elapsed, sum(failed for _, failed in outcomes), None
+        )
+
+    def summarize(self, timings, elapsed, errors, queries):
+        samples = sorted(timing * 1000 for timing in timings)
+        if not samples:
+            return {'requests': 0, 'errors': errors}
+        return {
+            'requests': len(samples),
+            'errors': errors,
+            'p50_ms': round(percentile(samples, 50), 3),
+            'p95_ms': round(percentile(samples, 95), 3),
+            'p99_ms': round(percentile(samples, 99), 3),
+            'mean_ms': round(statistics.fmean(samples), 3),
+            'max_ms': round(samples[-1], 3),
+            'throughput_rps': round(len(samples) / elapsed, 1) if elapsed else None,
+            'queries_per_request': round(queries, 2) if queries is not None else None,
+        }
+
+    def print_table(self, report):
+        dataset = report['dataset']
+        self.stdout.write(
+            f"{report['mode']} on {report['database']}: {dataset['users']} users, "
+            f"{dataset['listings']} listings, {dataset['requests']} requests"
+        )
+        self.stdout.write(
+            f"{'scenario':<22}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'queries':>9}{'errors':>8}"
+        )
+        for result in report['results']:
+            if not result['requests']:
+                continue
+            queries = result['queries_per_request']
+            self.stdout.write(
+                f"{result['name']:<22}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+                f"{result['throughput_rps']:>9.1f}{'-' if queries is None else queries:>9}{result['errors']:>8}"
+            )
@@ -0,0 +1,14 @@
+from django.test import TestCase
+
+from .budgets import check_budgets, collect_budgets, sql_report
+
+class QueryBudgetTests(TestCase):
+    def test_endpoints_stay_within_their_query_budgets(self):
+        budgets = collect_budgets()
+        self.assertTrue(budgets)
+        for result in check_budgets(budgets, rows=10):
+            with self.subTest(result['budget'].name):
+                self.assertEqual(
+                    result['problems'], [],
+                    '\n'.join([repr(result['budget'])] + sql_report(result['small']['sql'], result['large']['sql'])),
+                )
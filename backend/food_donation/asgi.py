@@ -0,0 +1,19 @@
+"""
+ASGI config for food_donation project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server (e.g. ``uvicorn food_donation.asgi:application``)
+so idle realtime event streams (/api/realtime/events/) don't each hold a
+worker thread.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'food_donation.settings')
+
+application = get_asgi_application()
@@ -0,0 +1,106 @@
+"""
+Conditional GET (ETag / Last-Modified) for list and detail endpoints.
+
+Validators are computed from cheap metadata instead of the response body:
+
+- Collections: one aggregate query over the view's (role-scoped, filtered)
+  queryset returning the row count, the newest `updated_at` of the rows and of
+  every nested object the serializer embeds, and how many rows are expired or
+  expiring soon (those flags change with time, not with writes). The ETag
+  hashes these together with the user and the full request path, so every
+  role/filter/page combination has its own validator.
+- Objects: the same timestamps and expiry flags read from the loaded instance.
+
+A matching If-None-Match (or, for single objects, If-Modified-Since) is
+answered with 304 before anything is serialized. Collections send no
+Last-Modified: a timestamp cannot tell that a row was deleted or left the
+filter, the row count in the ETag can.
+
+Writes that bypass Model.save() (QuerySet.update(), bulk_update()) must set
+`updated_at` themselves for validators to notice them.
+"""
+import hashlib
+from datetime import timedelta
+
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+EXPIRING_SOON = timedelta(hours=24)
+
+def make_etag(request, *parts):
+    scope = (getattr(request.user, 'pk', None), getattr(request.user, 'role', None), request.get_full_path())
+    raw = '|'.join(str(part) for part in scope + parts)
+    return quote_etag(hashlib.md5(raw.encode('utf-8'), usedforsecurity=False).hexdigest())
+
+def collection_etag(request, queryset, modified_fields=('updated_at',), expiry_field=None):
+    """ETag for a list response, from a single aggregate over `queryset`"""
+    aggregates = {'count': Count('pk')}
+    for index, field in enumerate(modified_fields):
+        aggregates[f'modified_{index}'] = Max(field)
+    if expiry_field:
+        now = timezone.now()
+        aggregates['expired'] = Count('pk', filter=Q(**{f'{expiry_field}__lte': now}))
+        aggregates['expiring'] = Count('pk', filter=Q(**{f'{expiry_field}__lte': now + EXPIRING_SOON}))
+    values = queryset.order_by().aggregate(**aggregates)
+    return make_etag(request, *values.values())
+
+def object_validators(request, instance, modified_fields=('updated_at',), expiry_field=None):
+    """(ETag, Last-Modified timestamp) for a detail response"""
+    timestamps = [_resolve(instance, field) for field in modified_fields]
+    parts = list(timestamps)
+    if expiry_field:
+        now = timezone.now()
+        expiry_time = _resolve(instance, expiry_field)
+        parts += [expiry_time <= now, expiry_time <= now + EXPIRING_SOON]
+    known = [value for value in timestamps if value is not None]
+    last_modified = int(max(known).timestamp()) if known else None
+    return make_etag(request, *parts), last_modified
+
+def not_modified(request, etag, last_modified=None):
+    """The 304 response if the client's copy is current, else None"""
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+def set_validators(response, etag, last_modified=None):
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        # Clients may keep the response but must revalidate it on every use
+        response['Cache-Control'] = 'private, no-cache'
+    return response
+
+def _resolve(instance, path):
+    for attribute in path.split('__'):
+        instance = getattr(instance, attribute)
+    return instance
+
+class ConditionalListMixin:
+    """Answer conditional GETs of a generic list view from `collection_etag`"""
+    etag_modified_fields = ('updated_at',)
+    etag_expiry_field = None
+
+    def get(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        etag = collection_etag(request, queryset, self.etag_modified_fields, self.etag_expiry_field)
+        response = not_modified(request, etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return set_validators(response, etag)
+
+class ConditionalRetrieveMixin:
+    """Answer conditional GETs of a generic detail view before serializing the object"""
+    etag_modified_fields = ('updated_at',)
+    etag_expiry_field = None
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = object_validators(
+            request, instance, self.etag_modified_fields, self.etag_expiry_field
+        )
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            response = Response(self.get_serializer(instance).data)
+        return set_validators(response, etag, last_modified)
@@ -0,0 +1,163 @@
+"""
+Per-request timing: total time, SQL query count and time, and serializer time.
+
+RequestTimingMiddleware wraps every query on the default connection with
+connection.execute_wrapper, so the cost per query is two perf_counter calls
+and a comparison against the slow-query threshold. SQL text and stacks are
+only captured for slow queries. Each request gets:
+
+- a `Server-Timing` header (total, db and serialize durations), readable in
+  the browser's network panel
+- one JSON log line on the `food_donation.requests` logger with the view
+  name, status, timings and query count
+- a warning on `food_donation.slow_queries` with the SQL, parameters and the
+  application stack for every query slower than SLOW_QUERY_THRESHOLD_MS
+
+Serializer time covers the compiled serializers, streamed chunks
+(food_donation/streaming.py) and JSON encoding in TimedJSONRenderer, the
+default renderer. Queries run meanwhile are not counted. DRF's
+`serializer.data` in ordinary views runs before rendering and is not part of it.
+
+For streamed responses the header only covers the time to the first byte.
+The log line is written when the stream has been sent, so it includes
+everything. Async streams (realtime events under ASGI) are only timed as a
+whole.
+"""
+import json
+import logging
+import time
+import traceback
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger('food_donation.requests')
+slow_query_logger = logging.getLogger('food_donation.slow_queries')
+
+_current = ContextVar('request_timing', default=None)
+
+class RequestTiming:
+    def __init__(self, slow_query_ms):
+        self.started = time.perf_counter()
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.slow_queries = 0
+        self._serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook"""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.queries += 1
+            self.db_seconds += elapsed
+            if elapsed >= self.slow_query_seconds:
+                self.slow_queries += 1
+                log_slow_query(sql, params, many, elapsed)
+
+    @property
+    def total_seconds(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self):
+        return (
+            f'total;dur={self.total_seconds * 1000:.1f}, '
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries", '
+            f'serialize;dur={self.serialize_seconds * 1000:.1f}'
+        )
+
+def log_slow_query(sql, params, many, elapsed):
+    # Only application frames are interesting; drop Django, DRF and this module
+    stack = [
+        frame for frame in traceback.extract_stack()[:-2]
+        if str(settings.BASE_DIR) in frame.filename and '/site-packages/' not in frame.filename
+        and frame.filename != __file__
+    ][-settings.SLOW_QUERY_STACK_DEPTH:]
+    slow_query_logger.warning(
+        'Slow query (%.1f ms): %s\nParams: %s\nStack (most recent call last):\n%s',
+        elapsed * 1000, sql, '<executemany>' if many else repr(params)[:1000],
+        ''.join(traceback.format_list(stack)).rstrip(),
+    )
+
+@contextmanager
+def serialization_timer():
+    """Count the block as serializer time (minus its queries) for the current request"""
+    timing = _current.get()
+    if timing is None or timing._serializing:
+        yield
+        return
+    timing._serializing = True
+    start, db_before = time.perf_counter(), timing.db_seconds
+    try:
+        yield
+    finally:
+        timing._serializing = False
+        timing.serialize_seconds += time.perf_counter() - start - (timing.db_seconds - db_before)
+
+class RequestTimingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.REQUEST_TIMING_ENABLED:
+            return self.get_response(request)
+
+        timing = RequestTiming(settings.SLOW_QUERY_THRESHOLD_MS)
+        token = _current.set(timing)
+        try:
+            with connection.execute_wrapper(timing):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        if settings.SERVER_TIMING_HEADER:
+            response['Server-Timing'] = timing.server_timing()
+        if response.streaming and response.is_async:
+            response.streaming_content = self.astream(request, response, response.streaming_content, timing)
+        elif response.streaming:
+            response.streaming_content = self.stream(request, response, response.streaming_content, timing)
+        else:
+            self.log(request, response, timing)
+        return response
+
+    def stream(self, request, response, content, timing):
+        """Keep timing queries and serializers while the body is generated, then log"""
+        # Not a token reset: the server may close the generator from another context
+        _current.set(timing)
+        try:
+            with connection.execute_wrapper(timing):
+                yield from content
+        finally:
+            _current.set(None)
+            self.log(request, response, timing)
+
+    async def astream(self, request, response, content, timing):
+        """Async bodies (ASGI event streams) run in the event loop; just log when they end"""
+        try:
+            async for chunk in content:
+                yield chunk
+        finally:
+            self.log(request, response, timing)
+
+    def log(self, request, response, timing):
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        match = request.resolver_match
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(timing.total_seconds * 1000, 2),
+            'db_ms': round(timing.db_seconds * 1000, 2),
+            'queries': timing.queries,
+            'slow_queries': timing.slow_queries,
+            'serialize_ms': round(timing.serialize_seconds * 1000, 2),
+            'streamed': response.streaming,
+        }))
@@ -0,0 +1,142 @@
+"""
+Pagination used by all list endpoints.
+
+Page-number pagination stays the default contract. Clients can opt into
+keyset (cursor) pagination with ?pagination=cursor; the response then carries
+opaque `next`/`previous` cursors instead of page numbers and `count`. Keyset
+pages are located with an indexed (created_at, id) comparison, so every page
+costs the same no matter how deep it is and no COUNT(*) is run.
+"""
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination, replace_query_param
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination keyed on (-created_at, -id)"""
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+
+        if position is None:
+            reverse = False
+            queryset = queryset.order_by('-created_at', '-id')
+        else:
+            reverse, created_at, pk = position
+            if reverse:
+                queryset = queryset.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+                ).order_by('created_at', 'id')
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+                ).order_by('-created_at', '-id')
+
+        # Fetch one extra row to learn whether another page exists
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+            if size > 0:
+                return min(size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            decoded = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii')
+            direction, created_at, pk = decoded.split('|')
+            return direction == 'r', datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, item, reverse=False):
+        # Pages hold model instances, or .values() rows for compiled serializers
+        if isinstance(item, dict):
+            created_at, pk = item['created_at'], item['id']
+        else:
+            created_at, pk = item.created_at, item.pk
+        raw = f"{'r' if reverse else 'f'}|{created_at.isoformat()}|{pk}"
+        cursor = base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii')
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+class HybridPagination(PageNumberPagination):
+    """Page numbers by default, keyset cursors with ?pagination=cursor (or any ?cursor=)"""
+    mode_query_param = 'pagination'
+    keyset_class = KeysetPagination
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or KeysetPagination.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
\ No newline at end of file
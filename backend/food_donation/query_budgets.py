@@ -0,0 +1,40 @@
+"""
+Declarative SQL query budgets per endpoint.
+
+Each app lists its endpoints in a `query_budgets.py` module as QUERY_BUDGETS.
+benchmarks/budgets.py calls every endpoint against a small seeded dataset with
+1 row and with N rows per collection. The check fails if the query count grows
+with N (an N+1 pattern) or exceeds the budget. It runs in the benchmarks test
+suite and as `manage.py check_query_budgets`, which prints the offending SQL.
+
+The seeded dataset, shared by all budgets, contains:
+- `provider`, `ngo`, `individual` and `admin` users, whose emails are
+  budget-<key>@example.com and whose password is BUDGET_PASSWORD
+- N Available listings owned by `provider`, near (28.6, 77.2)
+- N Requested listings owned by `provider`. Each has a Pending request from
+  `ngo` and one from another NGO, so every collection grows with N.
+- listing counter rows for every status, for `provider` and globally, so
+  query counts don't depend on which statuses were reached before
+
+Paths and request bodies can use these placeholders:
+- {listing}: an Available listing
+- {requested_listing}: a Requested listing
+- {request}: `ngo`'s request on {requested_listing}
+
+`data` may also be a callable that takes the dataset dict and returns the body.
+"""
+
+BUDGET_PASSWORD = 'budget-password'
+
+class QueryBudget:
+    def __init__(self, name, method, path, role, queries, data=None):
+        """`role` is the caller's role (None for anonymous calls); `queries` is the most the call may run"""
+        self.name = name
+        self.method = method
+        self.path = path
+        self.role = role
+        self.queries = queries
+        self.data = data
+
+    def __repr__(self):
+        return f'<QueryBudget {self.name}: {self.method} {self.path} <= {self.queries}>'
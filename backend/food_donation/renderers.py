@@ -0,0 +1,10 @@
+from rest_framework.renderers import JSONRenderer
+
+from .middleware import serialization_timer
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSONRenderer whose encoding time counts as serializer time (see food_donation/middleware.py)"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with serialization_timer():
+            return super().render(data, accepted_media_type, renderer_context)
@@ -39,9 +39,14 @@ INSTALLED_APPS = [
     'accounts',
     'food_listings',
     'requests_app',
+    'notifications',
+    'benchmarks',
+    'realtime',
+    'analytics',
 ]
 
 MIDDLEWARE = [
+    'food_donation.middleware.RequestTimingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -72,6 +77,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'food_donation.wsgi.application'
+ASGI_APPLICATION = 'food_donation.asgi.application'
 
 # Database
 DATABASE_URL = os.getenv('DATABASE_URL')
@@ -87,9 +93,20 @@ else:
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            # A file rather than in-memory, so the concurrent claim tests' threads
+            # share it and wait for each other's locks
+            'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
         }
     }
 
+# Cache
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 
@@ -132,13 +149,19 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.StatelessJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # JSON encoding is reported as serializer time by the request timing middleware
+    'DEFAULT_RENDERER_CLASSES': [
+        'food_donation.renderers.TimedJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    # Page numbers by default; ?pagination=cursor switches to keyset pagination
+    'DEFAULT_PAGINATION_CLASS': 'food_donation.pagination.HybridPagination',
     'PAGE_SIZE': 20,
 }
 
@@ -179,6 +202,8 @@ from datetime import timedelta
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
+    # /api/auth/refresh/ returns a new refresh token and revokes the old one
+    # through accounts.revocation (the token_blacklist app is not installed)
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
     'UPDATE_LAST_LOGIN': True,
@@ -193,6 +218,17 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
 
+# Build request.user from the role/email/full_name token claims instead of a
+# per-request user lookup; other user fields are loaded on first access
+JWT_STATELESS_AUTH = os.getenv('JWT_STATELESS_AUTH', 'False').lower() == 'true'
+
+# Token revocation: per-process bloom filter sizing and how often it catches up
+# with revocations made by other processes / is rebuilt from the table
+TOKEN_BLOOM_CAPACITY = int(os.getenv('TOKEN_BLOOM_CAPACITY', '100000'))
+TOKEN_BLOOM_ERROR_RATE = float(os.getenv('TOKEN_BLOOM_ERROR_RATE', '0.001'))
+TOKEN_REVOCATION_SYNC_SECONDS = float(os.getenv('TOKEN_REVOCATION_SYNC_SECONDS', '5'))
+TOKEN_BLOOM_REBUILD_SECONDS = float(os.getenv('TOKEN_BLOOM_REBUILD_SECONDS', '3600'))
+
 # Email Configuration
 EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = os.getenv('EMAIL_HOST', 'smtp.gmail.com')
@@ -203,4 +239,91 @@ EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'noreply@foodshare.com')
 
 # Notification Settings
-NOTIFICATION_EMAIL_ENABLED = os.getenv('NOTIFICATION_EMAIL_ENABLED', 'True').lower() == 'true'
\ No newline at end of file
+NOTIFICATION_EMAIL_ENABLED = os.getenv('NOTIFICATION_EMAIL_ENABLED', 'True').lower() == 'true'
+
+# Email outbox worker (python manage.py send_queued_emails)
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', '50'))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', '5'))
+EMAIL_OUTBOX_RETRY_BACKOFF = int(os.getenv('EMAIL_OUTBOX_RETRY_BACKOFF', '60'))  # seconds, doubled per attempt
+EMAIL_OUTBOX_LEASE_SECONDS = int(os.getenv('EMAIL_OUTBOX_LEASE_SECONDS', '300'))
+EMAIL_OUTBOX_POLL_INTERVAL = float(os.getenv('EMAIL_OUTBOX_POLL_INTERVAL', '5'))
+
+# Radius search (GET /api/food/nearby/)
+NEARBY_DEFAULT_RADIUS_KM = float(os.getenv('NEARBY_DEFAULT_RADIUS_KM', '10'))
+NEARBY_MAX_RADIUS_KM = float(os.getenv('NEARBY_MAX_RADIUS_KM', '100'))
+
+# Recommendations (GET /api/food/recommended/): each Available listing is
+# matched to its MATCHING_FANOUT best NGOs within MATCHING_RADIUS_KM.
+# NGO profiles are cached for MATCHING_PROFILE_TTL seconds.
+MATCHING_RADIUS_KM = float(os.getenv('MATCHING_RADIUS_KM', '25'))
+MATCHING_FANOUT = int(os.getenv('MATCHING_FANOUT', '10'))
+MATCHING_PROFILE_TTL = int(os.getenv('MATCHING_PROFILE_TTL', '300'))
+
+# Pickup routes (GET /api/requests/route/): straight-line travel at
+# ROUTE_SPEED_KMH plus ROUTE_STOP_MINUTES per pickup
+ROUTE_SPEED_KMH = float(os.getenv('ROUTE_SPEED_KMH', '20'))
+ROUTE_STOP_MINUTES = float(os.getenv('ROUTE_STOP_MINUTES', '5'))
+ROUTE_MAX_STOPS = int(os.getenv('ROUTE_MAX_STOPS', '100'))
+ROUTE_MAX_PASSES = int(os.getenv('ROUTE_MAX_PASSES', '20'))  # 2-opt improvement passes
+ROUTE_CACHE_TTL = int(os.getenv('ROUTE_CACHE_TTL', '300'))
+
+# Bulk listing imports (POST /api/food/import/, manage.py import_listings):
+# rows validated and inserted per chunk, and row errors kept for the report
+IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', '500'))
+IMPORT_MAX_REPORTED_ERRORS = int(os.getenv('IMPORT_MAX_REPORTED_ERRORS', '100'))
+
+# Listing search backend: 'auto' uses PostgreSQL full-text search when available,
+# otherwise the portable inverted index ('inverted')
+FOOD_SEARCH_BACKEND = os.getenv('FOOD_SEARCH_BACKEND', 'auto')
+
+# Rows serialized per chunk by ?stream=1 responses
+STREAMING_CHUNK_SIZE = int(os.getenv('STREAMING_CHUNK_SIZE', '500'))
+
+# Serve GET /api/requests/ and /api/food/available/ through the compiled
+# read-only serializers (food_donation/compiled_serializers.py)
+FAST_SERIALIZERS_ENABLED = os.getenv('FAST_SERIALIZERS_ENABLED', 'True').lower() == 'true'
+
+# Available-food feed cache: which cache alias to use and how long a version may be served
+FOOD_FEED_CACHE_ALIAS = os.getenv('FOOD_FEED_CACHE_ALIAS', 'default')
+FOOD_FEED_CACHE_TTL = int(os.getenv('FOOD_FEED_CACHE_TTL', '30'))
+# Realtime event stream (GET /api/realtime/events/). Use
+# 'realtime.broker.PostgresNotifyBroker' when running more than one worker.
+REALTIME_BROKER = os.getenv('REALTIME_BROKER', 'realtime.broker.InProcessBroker')
+REALTIME_QUEUE_SIZE = int(os.getenv('REALTIME_QUEUE_SIZE', '1000'))  # events buffered per connection
+REALTIME_HEARTBEAT_SECONDS = float(os.getenv('REALTIME_HEARTBEAT_SECONDS', '15'))
+REALTIME_STREAM_MAX_SECONDS = int(os.getenv('REALTIME_STREAM_MAX_SECONDS', '600'))
+REALTIME_RETRY_MS = int(os.getenv('REALTIME_RETRY_MS', '3000'))
+
+# Delta sync (GET /api/realtime/sync/?since=<cursor>). Cursors only advance past
+# change log entries older than the settle window, so it must exceed the longest
+# write transaction. Entries older than the retention are pruned by the daily
+# prune_change_log job; clients with older cursors get a 410 and reload.
+REALTIME_SYNC_PAGE_SIZE = int(os.getenv('REALTIME_SYNC_PAGE_SIZE', '500'))
+REALTIME_SYNC_SETTLE_SECONDS = int(os.getenv('REALTIME_SYNC_SETTLE_SECONDS', '10'))
+CHANGE_LOG_RETENTION_DAYS = int(os.getenv('CHANGE_LOG_RETENTION_DAYS', '7'))
+
+# Longest date range GET /api/analytics/ serves in one response
+ANALYTICS_MAX_RANGE_DAYS = int(os.getenv('ANALYTICS_MAX_RANGE_DAYS', '1096'))
+
+# Request timing (food_donation/middleware.py): Server-Timing header, one log
+# line per request and a slow-query log with SQL and stack
+REQUEST_TIMING_ENABLED = os.getenv('REQUEST_TIMING_ENABLED', 'True').lower() == 'true'
+SERVER_TIMING_HEADER = os.getenv('SERVER_TIMING_HEADER', 'True').lower() == 'true'
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', '200'))
+SLOW_QUERY_STACK_DEPTH = int(os.getenv('SLOW_QUERY_STACK_DEPTH', '8'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'plain': {'format': '%(asctime)s %(levelname)s %(name)s %(message)s'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'plain'},
+    },
+    'root': {'handlers': ['console'], 'level': os.getenv('LOG_LEVEL', 'INFO')},
+    # Django's default config gives 'django' its own console handler; don't log twice
+    'loggers': {
+        'django': {'handlers': ['console'], 'level': os.getenv('LOG_LEVEL', 'INFO'), 'propagate': False},
+    },
+}
@@ -0,0 +1,48 @@
+"""
+Streaming JSON responses for large, unpaginated collections.
+
+The queryset is read with a server-side cursor (QuerySet.iterator) and
+serialized chunk by chunk, so peak memory is bounded by the chunk size instead
+of the result size and the first bytes go out before the last row is read.
+"""
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+
+from .middleware import serialization_timer
+
+def wants_stream(request):
+    """True if the client asked for a streamed response with ?stream=1"""
+    return request.query_params.get('stream', '').lower() in ('1', 'true', 'yes')
+
+def iter_json_array(queryset, serializer_class, chunk_size=None, context=None):
+    """Yield a JSON array of serialized rows as byte chunks"""
+    chunk_size = chunk_size or settings.STREAMING_CHUNK_SIZE
+    renderer = JSONRenderer()
+    chunk = []
+    first = True
+
+    yield b'['
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            yield (b'' if first else b',') + _render_items(renderer, serializer_class, chunk, context)
+            first = False
+            chunk = []
+    if chunk:
+        yield (b'' if first else b',') + _render_items(renderer, serializer_class, chunk, context)
+    yield b']'
+
+def _render_items(renderer, serializer_class, objects, context):
+    # Render the chunk as a list with DRF's renderer and drop the brackets, so
+    # the bytes match what the non-streaming Response would produce
+    with serialization_timer():
+        data = serializer_class(objects, many=True, context=context or {}).data
+        return renderer.render(data)[1:-1]
+
+def stream_json_list(queryset, serializer_class, chunk_size=None, context=None):
+    """Return a StreamingHttpResponse containing the serialized queryset as a JSON array"""
+    return StreamingHttpResponse(
+        iter_json_array(queryset, serializer_class, chunk_size, context),
+        content_type='application/json',
+    )
@@ -23,6 +23,9 @@ def api_root(request):
                 'list_create': '/api/food/',
                 'detail': '/api/food/{id}/',
                 'available': '/api/food/available/',
+                'nearby': '/api/food/nearby/',
+                'recommended': '/api/food/recommended/',
+                'import': '/api/food/import/',
                 'stats': '/api/food/dashboard-stats/',
             },
             'requests': {
@@ -30,6 +33,14 @@ def api_root(request):
                 'detail': '/api/requests/{id}/',
                 'my_requests': '/api/requests/my-requests/',
                 'for_my_food': '/api/requests/for-my-food/',
+                'route': '/api/requests/route/',
+            },
+            'realtime': {
+                'events': '/api/realtime/events/',
+                'sync': '/api/realtime/sync/?since={cursor}',
+            },
+            'analytics': {
+                'impact': '/api/analytics/?start=YYYY-MM-DD&end=YYYY-MM-DD&interval=day',
             }
         }
     })
@@ -41,6 +52,8 @@ urlpatterns = [
     path('api/auth/', include('accounts.urls')),
     path('api/food/', include('food_listings.urls')),
     path('api/requests/', include('requests_app.urls')),
+    path('api/realtime/', include('realtime.urls')),
+    path('api/analytics/', include('analytics.urls')),
 ]
 
 # Serve media files during development
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import FoodListing
+from .models import FoodListing, GeocodeCache, ListingStatusCounter
 
 @admin.register(FoodListing)
 class FoodListingAdmin(admin.ModelAdmin):
@@ -7,12 +7,16 @@ class FoodListingAdmin(admin.ModelAdmin):
     list_filter = ('status', 'created_at', 'expiry_time')
     search_fields = ('title', 'description', 'location', 'created_by__full_name')
     ordering = ('-created_at',)
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('geohash', 'created_at', 'updated_at')
     
     fieldsets = (
         ('Basic Information', {
             'fields': ('title', 'description', 'quantity', 'location')
         }),
+        ('Coordinates', {
+            'fields': ('latitude', 'longitude', 'geohash'),
+            'classes': ('collapse',)
+        }),
         ('Status & Timing', {
             'fields': ('status', 'expiry_time')
         }),
@@ -20,4 +24,14 @@ class FoodListingAdmin(admin.ModelAdmin):
             'fields': ('created_by', 'created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
-    )
\ No newline at end of file
+    )
+
+@admin.register(GeocodeCache)
+class GeocodeCacheAdmin(admin.ModelAdmin):
+    list_display = ('query', 'latitude', 'longitude', 'source', 'created_at')
+    search_fields = ('query',)
+
+@admin.register(ListingStatusCounter)
+class ListingStatusCounterAdmin(admin.ModelAdmin):
+    list_display = ('provider', 'status', 'count')
+    list_filter = ('status',)
\ No newline at end of file
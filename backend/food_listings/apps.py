@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class FoodListingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'food_listings'
\ No newline at end of file
+    name = 'food_listings'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,63 @@
+"""
+Versioned cache for the available-food feed.
+
+The feed is the same for every NGO, so the rendered JSON is cached under a key
+that includes a version number. Any listing (or provider profile) change bumps
+the version after its transaction commits, which makes every cached copy
+stale at once; a short TTL drops listings that expire between changes.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.http import quote_etag
+
+VERSION_KEY = 'food_feed:version'
+HITS_KEY = 'food_feed:hits'
+MISSES_KEY = 'food_feed:misses'
+
+def get_cache():
+    return caches[settings.FOOD_FEED_CACHE_ALIAS]
+
+def _incr(key):
+    cache = get_cache()
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Missing (first use or evicted); add() keeps concurrent creators from clobbering each other
+        if cache.add(key, 1, timeout=None):
+            return 1
+        return cache.incr(key)
+
+def get_feed_version():
+    return get_cache().get_or_set(VERSION_KEY, 1, timeout=None)
+
+def bump_feed_version():
+    """Invalidate the cached feed once the current transaction commits"""
+    transaction.on_commit(lambda: _incr(VERSION_KEY))
+
+def get_cached_feed():
+    """Return (body, etag) cached for the current version, counting the hit or miss"""
+    cached = get_cache().get(f'food_feed:{get_feed_version()}')
+    _incr(HITS_KEY if cached is not None else MISSES_KEY)
+    return cached
+
+def set_cached_feed(body, version):
+    """Cache the rendered feed with its ETag and return the ETag"""
+    etag = quote_etag(hashlib.md5(body, usedforsecurity=False).hexdigest())
+    get_cache().set(f'food_feed:{version}', (body, etag), timeout=settings.FOOD_FEED_CACHE_TTL)
+    return etag
+
+def get_feed_stats():
+    cache = get_cache()
+    values = cache.get_many([VERSION_KEY, HITS_KEY, MISSES_KEY])
+    hits = values.get(HITS_KEY, 0)
+    misses = values.get(MISSES_KEY, 0)
+    return {
+        'version': values.get(VERSION_KEY),
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / (hits + misses), 4) if hits + misses else None,
+        'ttl': settings.FOOD_FEED_CACHE_TTL,
+    }
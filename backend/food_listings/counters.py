@@ -0,0 +1,82 @@
+"""
+Incrementally maintained listing counts for dashboard_stats.
+
+Every status transition is folded into per-(provider, status) deltas, which
+are applied with a single conditional UPDATE; counter rows are created the
+first time a provider reaches a status.
+"""
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Q, Value, When
+
+from .models import ListingStatusCounter
+
+def status_deltas(changes):
+    """
+    Fold (provider_id, old_status, new_status) transitions into
+    {(provider_id, status): delta}, including the global (None) scope.
+    """
+    deltas = Counter()
+    for provider_id, old_status, new_status in changes:
+        if old_status == new_status:
+            continue
+        for scope in (provider_id, None):
+            if old_status is not None:
+                deltas[(scope, old_status)] -= 1
+            if new_status is not None:
+                deltas[(scope, new_status)] += 1
+    return {key: delta for key, delta in deltas.items() if delta}
+
+def _condition(provider_id, status):
+    if provider_id is None:
+        return Q(provider__isnull=True, status=status)
+    return Q(provider_id=provider_id, status=status)
+
+def apply_status_changes(changes):
+    """
+    Apply (provider_id, old_status, new_status) transitions to the counters.
+
+    Normally a single UPDATE; rows seen for the first time are inserted.
+    """
+    deltas = status_deltas(changes)
+    if not deltas:
+        return
+
+    scope = Q()
+    whens = []
+    for (provider_id, status), delta in deltas.items():
+        condition = _condition(provider_id, status)
+        scope |= condition
+        whens.append(When(condition, then=Value(delta)))
+
+    with transaction.atomic():
+        updated = ListingStatusCounter.objects.filter(scope).update(
+            count=F('count') + Case(*whens, default=Value(0))
+        )
+        if updated == len(deltas):
+            return
+
+        existing = set(ListingStatusCounter.objects.filter(scope).values_list('provider_id', 'status'))
+        for (provider_id, status), delta in deltas.items():
+            if (provider_id, status) in existing or delta < 0:
+                # A missing row with a negative delta means the provider's
+                # counters are being deleted along with the provider
+                continue
+            try:
+                with transaction.atomic():
+                    ListingStatusCounter.objects.create(provider_id=provider_id, status=status, count=delta)
+            except IntegrityError:
+                # Created concurrently after our UPDATE; apply the delta to it instead
+                ListingStatusCounter.objects.filter(_condition(provider_id, status)).update(
+                    count=F('count') + delta
+                )
+
+def get_status_counts(provider=None):
+    """Return {status: count} for a provider, or globally when provider is None"""
+    counters = ListingStatusCounter.objects.all()
+    if provider is None:
+        counters = counters.filter(provider__isnull=True)
+    else:
+        counters = counters.filter(provider=provider)
+    return dict(counters.values_list('status', 'count'))
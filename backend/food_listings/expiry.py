@@ -0,0 +1,83 @@
+"""
+Batched expiry handling, run by `manage.py sweep_expired_listings`.
+
+- expire_listings(): Available listings past their expiry time become
+  'Expired' in set-based UPDATEs, so they stop weighing on every
+  status='Available' query.
+- notify_expiring_listings(): providers get one reminder per listing when it
+  enters the last 24 hours. Listings are found with a range scan on the
+  partial (expiry_time WHERE status='Available') index and stamped with
+  expiring_notified_at in the same transaction that queues the emails, so
+  repeated runs never send twice.
+
+Both walk the index in batches and lock rows with SKIP LOCKED (where
+supported), so several sweepers can run side by side.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.template.loader import get_template
+from django.utils import timezone
+
+from notifications.utils import build_email, queue_emails
+from .models import FoodListing
+from .signals import listings_bulk_changed
+
+EXPIRING_WINDOW = timedelta(hours=24)
+
+def expire_listings(now=None, batch_size=1000):
+    """Mark Available listings whose expiry time has passed as Expired; return how many"""
+    now = now or timezone.now()
+    expired = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                FoodListing.objects.select_for_update(skip_locked=True)
+                .filter(status='Available', expiry_time__lte=now)
+                .order_by('expiry_time')
+                .values_list('id', 'created_by_id')[:batch_size]
+            )
+            if not batch:
+                return expired
+            FoodListing.objects.filter(id__in=[listing_id for listing_id, _ in batch]).update(
+                status='Expired', updated_at=now
+            )
+            listings_bulk_changed.send(
+                sender=FoodListing,
+                changes=[(listing_id, provider_id, 'Available', 'Expired') for listing_id, provider_id in batch],
+            )
+        expired += len(batch)
+
+def notify_expiring_listings(now=None, batch_size=500):
+    """Queue one reminder per listing entering its last 24 hours; return how many"""
+    now = now or timezone.now()
+    notified = 0
+    template = get_template('emails/food_listing_expiring.html')
+    while True:
+        with transaction.atomic():
+            batch = list(
+                FoodListing.objects.select_for_update(skip_locked=True, of=('self',))
+                .select_related('created_by')
+                .filter(
+                    status='Available',
+                    expiry_time__gt=now,
+                    expiry_time__lte=now + EXPIRING_WINDOW,
+                    expiring_notified_at__isnull=True,
+                )
+                .order_by('expiry_time')[:batch_size]
+            )
+            if not batch:
+                return notified
+            if settings.NOTIFICATION_EMAIL_ENABLED:
+                queue_emails([
+                    build_email(
+                        listing.created_by.email,
+                        f'Food Item Expiring Soon: {listing.title}',
+                        template.render({'user': listing.created_by, 'listing': listing}),
+                    )
+                    for listing in batch
+                ])
+            # Not a user-visible change, so updated_at is left alone
+            FoodListing.objects.filter(id__in=[listing.id for listing in batch]).update(expiring_notified_at=now)
+        notified += len(batch)
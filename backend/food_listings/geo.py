@@ -0,0 +1,131 @@
+"""
+Small geospatial helpers: great-circle distance, bounding boxes and geohashes.
+
+Radius queries use two cheap, index-friendly prefilters before the exact
+distance check: a set of geohash prefix ranges covering the search area and a
+latitude/longitude bounding box. Both work as plain range scans on SQLite and
+PostgreSQL, so no GIS extension is required.
+"""
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+GEOHASH_PRECISION = 9
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+# Sorts after every geohash character, so [prefix, prefix + '{') is a prefix range
+GEOHASH_RANGE_END = '{'
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance between two points in kilometres"""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def bounding_box(lat, lng, radius_km):
+    """
+    Return (min_lat, min_lng, max_lat, max_lng) enclosing a circle.
+
+    Longitudes are not wrapped: near the antimeridian they run past -180 or
+    180. Use longitude_ranges() to turn them into ranges a query can use.
+    """
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(lat))
+    if cos_lat < 1e-6:
+        lng_delta = 180.0
+    else:
+        lng_delta = min(180.0, math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)))
+    return (
+        max(-90.0, lat - lat_delta),
+        lng - lng_delta,
+        min(90.0, lat + lat_delta),
+        lng + lng_delta,
+    )
+
+def longitude_ranges(min_lng, max_lng):
+    """Split a longitude span that may run past -180/180 into one or two ranges within it"""
+    if max_lng - min_lng >= 360.0:
+        return [(-180.0, 180.0)]
+    if min_lng < -180.0:
+        return [(min_lng + 360.0, 180.0), (-180.0, max_lng)]
+    if max_lng > 180.0:
+        return [(min_lng, 180.0), (-180.0, max_lng - 360.0)]
+    return [(min_lng, max_lng)]
+
+def encode_geohash(lat, lng, precision=GEOHASH_PRECISION):
+    """Encode a coordinate as a base32 geohash string"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        rng, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(chars)
+
+def geohash_cell_size(precision):
+    """Return (lat_degrees, lng_degrees) covered by one cell at a precision"""
+    total_bits = precision * 5
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lng_bits)
+
+def geohash_cover(min_lat, min_lng, max_lat, max_lng, max_cells=16):
+    """
+    Return geohash prefixes whose cells together cover a bounding box.
+
+    Uses the finest precision that needs at most max_cells prefixes, so the
+    prefilter stays tight without turning into a huge OR of ranges.
+    """
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_step, lng_step = geohash_cell_size(precision)
+        rows = math.floor(max_lat / lat_step) - math.floor(min_lat / lat_step) + 1
+        cols = math.floor(max_lng / lng_step) - math.floor(min_lng / lng_step) + 1
+        if rows * cols <= max_cells:
+            break
+    else:
+        return []
+
+    cells = set()
+    lat = min_lat
+    while True:
+        lng = min_lng
+        while True:
+            cells.add(encode_geohash(lat, lng, precision))
+            if lng >= max_lng:
+                break
+            lng = min(lng + lng_step, max_lng)
+        if lat >= max_lat:
+            break
+        lat = min(lat + lat_step, max_lat)
+    return sorted(cells)
+
+def normalize_place(text):
+    """Normalize free-text locations for gazetteer lookups"""
+    return ' '.join((text or '').lower().split())
+
+def place_candidates(text):
+    """
+    Yield lookup keys for a free-text location, most specific first.
+
+    "Sector 5, Noida, UP" tries the whole string, then "noida, up", then "up".
+    """
+    parts = [normalize_place(part) for part in (text or '').split(',')]
+    parts = [part for part in parts if part]
+    for i in range(len(parts)):
+        yield ', '.join(parts[i:])
\ No newline at end of file
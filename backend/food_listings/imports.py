@@ -0,0 +1,177 @@
+"""
+Bulk listing imports from CSV or NDJSON, for providers with many listings a day.
+
+import_listings() reads rows one line at a time and works in chunks of
+IMPORT_BATCH_SIZE rows, so memory stays bounded however large the file is.
+For each chunk it:
+
+1. validates every row with one FoodListingCreateSerializer, so a row gets
+   the same checks as POST /api/food/,
+2. fills missing coordinates from the gazetteer with one GeocodeCache query,
+3. inserts the valid rows with one bulk_create and applies the side effects
+   that save() and its signal handlers would have had. The search index is
+   filled and listings_bulk_changed updates counters, caches, matches, the
+   change log and rollups.
+
+Each chunk is committed on its own, so a failure late in a large file keeps
+the chunks before it. Rows that fail validation are reported by line number
+and skipped. Only the first IMPORT_MAX_REPORTED_ERRORS errors are kept.
+The provider gets one summary email instead of one email per listing.
+"""
+import codecs
+import csv
+import json
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework import serializers
+
+from accounts.utils import send_notification_email
+from .geo import place_candidates
+from .models import FoodListing, GeocodeCache
+from .search import get_backend, index_listings
+from .serializers import FoodListingCreateSerializer
+from .signals import listings_bulk_changed
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+# Upload extensions and request content types that name a format
+FORMAT_EXTENSIONS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+FORMAT_MEDIA_TYPES = {'text/csv': 'csv', 'application/x-ndjson': 'ndjson', 'application/jsonl': 'ndjson'}
+
+class ListingImportError(Exception):
+    """The input can't be read any further (bad encoding, missing CSV header)"""
+
+def _decoded_lines(stream):
+    """Text lines of a binary stream (file, upload or request body), decoded as UTF-8"""
+    return codecs.iterdecode(stream, 'utf-8-sig')
+
+def iter_csv_rows(stream):
+    """Yield (line number, row dict) for a CSV file with a header row"""
+    reader = csv.DictReader(_decoded_lines(stream))
+    try:
+        if not reader.fieldnames:
+            raise ListingImportError('CSV input needs a header row')
+        for row in reader:
+            # Empty cells count as missing; extra cells land under the None key
+            yield reader.line_num, {
+                field: value for field, value in row.items() if field is not None and value not in ('', None)
+            }
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise ListingImportError(f'Line {reader.line_num}: {e}') from e
+
+def iter_ndjson_rows(stream):
+    """Yield (line number, row dict or error message) for newline-delimited JSON"""
+    line_number = 0
+    try:
+        for line_number, line in enumerate(_decoded_lines(stream), start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_number, f'Invalid JSON: {e}'
+                continue
+            yield line_number, row if isinstance(row, dict) else 'Each line must be a JSON object'
+    except UnicodeDecodeError as e:
+        raise ListingImportError(f'Line {line_number + 1}: {e}') from e
+
+def iter_rows(stream, import_format):
+    if import_format == 'csv':
+        return iter_csv_rows(stream)
+    if import_format == 'ndjson':
+        return iter_ndjson_rows(stream)
+    raise ValueError(f'Unknown import format {import_format!r}')
+
+def geocode_missing(listings):
+    """Fill coordinates of listings without them from the gazetteer, with one query"""
+    pending = [
+        (listing, list(place_candidates(listing.location)))
+        for listing in listings if listing.latitude is None or listing.longitude is None
+    ]
+    candidates = {candidate for _, names in pending for candidate in names}
+    if not candidates:
+        return
+    places = {
+        query: (latitude, longitude)
+        for query, latitude, longitude in GeocodeCache.objects.filter(query__in=candidates)
+        .values_list('query', 'latitude', 'longitude')
+    }
+    for listing, names in pending:
+        for candidate in names:
+            if candidate in places:
+                listing.latitude, listing.longitude = places[candidate]
+                break
+
+def create_listings(provider, rows):
+    """Insert validated serializer data as Available listings of `provider`; return them"""
+    listings = [FoodListing(created_by=provider, **row) for row in rows]
+    geocode_missing(listings)
+    for listing in listings:
+        listing.geohash = listing.compute_geohash()
+    with transaction.atomic():
+        listings = FoodListing.objects.bulk_create(listings)
+        if get_backend() == 'inverted':
+            index_listings(listings)
+        listings_bulk_changed.send(
+            sender=FoodListing,
+            changes=[(listing.id, provider.id, None, listing.status) for listing in listings],
+        )
+    return listings
+
+def import_listings(provider, stream, import_format, batch_size=None, notify=True):
+    """
+    Import listings for `provider` from a binary stream.
+
+    Returns {'rows', 'created', 'failed', 'errors': [{'line', 'errors'}],
+    'errors_truncated', 'aborted'}. 'aborted' holds the reason when the
+    input stopped being readable part way through, else None.
+    """
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    result = {'rows': 0, 'created': 0, 'failed': 0, 'errors': [], 'errors_truncated': False, 'aborted': None}
+
+    def fail(line_number, errors):
+        result['failed'] += 1
+        if len(result['errors']) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            result['errors'].append({'line': line_number, 'errors': errors})
+        else:
+            result['errors_truncated'] = True
+
+    # One bound serializer validates every row, as ListSerializer would, but a
+    # bad row doesn't discard the validated data of the good ones
+    validator = FoodListingCreateSerializer()
+
+    def flush(batch):
+        valid = []
+        for line_number, row in batch:
+            try:
+                valid.append(validator.run_validation(row))
+            except serializers.ValidationError as e:
+                # Plain strings instead of ErrorDetail, for the email and command output
+                fail(line_number, json.loads(json.dumps(e.detail)))
+        if valid:
+            result['created'] += len(create_listings(provider, valid))
+
+    batch = []
+    try:
+        for line_number, row in iter_rows(stream, import_format):
+            result['rows'] += 1
+            if isinstance(row, str):
+                fail(line_number, {'non_field_errors': [row]})
+                continue
+            batch.append((line_number, row))
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+    except ListingImportError as e:
+        result['aborted'] = str(e)
+    if batch:
+        flush(batch)
+
+    if notify and (result['created'] or result['failed']):
+        send_notification_email(
+            user=provider,
+            subject=f"Food Listings Imported: {result['created']} created, {result['failed']} failed",
+            template_name='food_listing_import_summary.html',
+            context={'result': result},
+        )
+    return result
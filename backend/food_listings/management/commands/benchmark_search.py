@@ -0,0 +1,97 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from food_listings.models import FoodListing
+from food_listings.search import get_backend, index_listings, search_listings
+
+User = get_user_model()
+
+FOODS = ['rice', 'dal', 'biryani', 'chapati', 'paneer', 'sandwich', 'bread', 'fruit', 'salad',
+         'curry', 'noodles', 'pasta', 'idli', 'dosa', 'samosa', 'milk', 'curd', 'vegetables',
+         'pulao', 'khichdi', 'soup', 'cake', 'muffins', 'poha', 'upma', 'halwa']
+ADJECTIVES = ['fresh', 'leftover', 'surplus', 'packed', 'hot', 'vegetarian', 'homemade', 'frozen']
+PLACES = ['Connaught Place', 'Karol Bagh', 'Noida Sector 18', 'Gurgaon Cyber City', 'Dwarka',
+          'Saket', 'Lajpat Nagar', 'Rohini', 'Andheri', 'Bandra', 'Koramangala', 'Indiranagar']
+QUERIES = ['rice', 'paneer curry', 'fresh bread', 'biryani dwarka', 'vegetarian soup bandra',
+           'kitchen42', 'xyzzy']
+
+def make_vocabulary(rng, size=5000):
+    """Long-tail vocabulary: restaurant/dish names that only a few listings share"""
+    syllables = ['ka', 'ri', 'mo', 'la', 'po', 'shi', 'na', 'ta', 'gu', 'ven', 'dor', 'mi']
+    words = {f'kitchen{n}' for n in range(100)}
+    while len(words) < size:
+        words.add(''.join(rng.choices(syllables, k=rng.randint(2, 4))))
+    return sorted(words)
+
+class Command(BaseCommand):
+    help = 'Compare the search index with the old icontains filter (all rows are rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Search backend: {get_backend()}")
+        for size in options['sizes']:
+            with transaction.atomic():
+                self.run_size(size, options['repeat'])
+                transaction.set_rollback(True)
+
+    def run_size(self, size, repeat):
+        rng = random.Random(size)
+        vocabulary = make_vocabulary(rng)
+        # Zipf-like weights so a few words are common and most are rare
+        vocabulary_weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+        provider = User.objects.create_user(
+            username='search-bench', email='search-bench@example.com', password=None,
+            full_name='Search Benchmark', role='FoodProvider',
+        )
+        expiry = timezone.now() + timedelta(days=1)
+
+        start = time.perf_counter()
+        for offset in range(0, size, 5000):
+            batch = []
+            for _ in range(min(5000, size - offset)):
+                food = rng.choice(FOODS)
+                batch.append(FoodListing(
+                    title=f"{rng.choice(ADJECTIVES).title()} {food} from "
+                          f"{rng.choices(vocabulary, vocabulary_weights)[0].title()}",
+                    description=' '.join(
+                        rng.choices(FOODS + ADJECTIVES, k=4)
+                        + rng.choices(vocabulary, vocabulary_weights, k=8)
+                    ),
+                    location=rng.choice(PLACES),
+                    expiry_time=expiry,
+                    created_by=provider,
+                ))
+            created = FoodListing.objects.bulk_create(batch)
+            if get_backend() == 'inverted':
+                index_listings(created)
+        self.stdout.write(f"\n{size:,} listings generated and indexed in {time.perf_counter() - start:.1f}s")
+        self.stdout.write(f"{'query':<26}{'icontains ms':>14}{'index ms':>12}{'hits':>10}")
+
+        for text in QUERIES:
+            old = FoodListing.objects.filter(
+                Q(title__icontains=text) | Q(description__icontains=text) | Q(location__icontains=text)
+            )
+            new = search_listings(FoodListing.objects.all(), text)
+            old_ms = self.time_query(old, repeat)
+            new_ms = self.time_query(new, repeat)
+            self.stdout.write(f"{text:<26}{old_ms:>14.2f}{new_ms:>12.2f}{new.count():>10}")
+
+    def time_query(self, queryset, repeat):
+        """Median time to fetch the first page, as the list endpoint does"""
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            list(queryset.values_list('id', flat=True)[:20])
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
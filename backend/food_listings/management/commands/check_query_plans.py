@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from food_listings.query_plans import PlanCheckError, find_sequential_scans, seed
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN the hot listing/request queries on a large synthetic dataset and fail if any plan '
+        'falls back to a sequential scan (seeded rows are rolled back)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--listings', type=int, default=50_000)
+        parser.add_argument('--providers', type=int, default=200)
+        parser.add_argument('--ngos', type=int, default=100)
+        parser.add_argument('--no-seed', action='store_true', help='Check plans against the existing data only')
+        parser.add_argument('--show-plans', action='store_true')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if not options['no_seed']:
+                seed(options['listings'], options['providers'], options['ngos'])
+                self.stdout.write(
+                    f"Seeded {options['listings']:,} listings for {options['providers']} providers "
+                    f"and {options['ngos']} NGOs"
+                )
+            try:
+                results = find_sequential_scans()
+            except PlanCheckError as e:
+                raise CommandError(str(e))
+            transaction.set_rollback(True)
+
+        failures = []
+        for name, scanned, plan in results:
+            if scanned:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"{name}: sequential scan on {', '.join(scanned)}"))
+            else:
+                self.stdout.write(f"{name}: ok")
+            if options['show_plans'] or scanned:
+                self.stdout.write('    ' + plan.replace('\n', '\n    '))
+
+        if failures:
+            raise CommandError(f"Sequential scans in: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS('All hot queries use indexes'))
@@ -0,0 +1,95 @@
+import csv
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from food_listings.geo import encode_geohash, normalize_place, place_candidates
+from food_listings.models import FoodListing, GeocodeCache
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    help = 'Load an offline gazetteer and fill missing listing/user coordinates from it'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--gazetteer', help='CSV file with name,latitude,longitude columns')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        if options['gazetteer']:
+            loaded = self.load_gazetteer(options['gazetteer'], batch_size)
+            self.stdout.write(f"Loaded {loaded} gazetteer entries")
+
+        places = {
+            query: (latitude, longitude)
+            for query, latitude, longitude in GeocodeCache.objects.values_list('query', 'latitude', 'longitude')
+        }
+
+        listings = self.fill(
+            FoodListing.objects.filter(latitude__isnull=True).exclude(location=''),
+            'location', ['latitude', 'longitude', 'geohash'], places, batch_size,
+        )
+        users = self.fill(
+            User.objects.filter(latitude__isnull=True, address__isnull=False).exclude(address=''),
+            'address', ['latitude', 'longitude'], places, batch_size,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Geocoded {listings} listings and {users} users"))
+
+    def load_gazetteer(self, path, batch_size):
+        loaded = 0
+        batch = []
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                batch.append(GeocodeCache(
+                    query=normalize_place(row['name']),
+                    latitude=float(row['latitude']),
+                    longitude=float(row['longitude']),
+                ))
+                if len(batch) >= batch_size:
+                    loaded += self.save_places(batch)
+                    batch = []
+        if batch:
+            loaded += self.save_places(batch)
+        return loaded
+
+    def save_places(self, batch):
+        # Later rows for the same place win
+        unique = {place.query: place for place in batch}
+        GeocodeCache.objects.bulk_create(
+            unique.values(),
+            update_conflicts=True,
+            unique_fields=['query'],
+            update_fields=['latitude', 'longitude'],
+        )
+        return len(unique)
+
+    def fill(self, queryset, text_field, fields, places, batch_size):
+        """Walk rows missing coordinates by primary key and bulk-update the ones we can resolve"""
+        updated = 0
+        last_id = 0
+        while True:
+            rows = list(queryset.filter(id__gt=last_id).order_by('id').only('id', text_field)[:batch_size])
+            if not rows:
+                return updated
+            last_id = rows[-1].id
+
+            resolved = []
+            for row in rows:
+                for candidate in place_candidates(getattr(row, text_field)):
+                    if candidate in places:
+                        row.latitude, row.longitude = places[candidate]
+                        if 'geohash' in fields:
+                            row.geohash = encode_geohash(row.latitude, row.longitude)
+                        # bulk_update() skips auto_now; keep conditional GET validators honest
+                        row.updated_at = timezone.now()
+                        resolved.append(row)
+                        break
+
+            if resolved:
+                with transaction.atomic():
+                    queryset.model.objects.bulk_update(resolved, fields)
+                updated += len(resolved)
\ No newline at end of file
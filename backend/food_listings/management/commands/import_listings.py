@@ -0,0 +1,53 @@
+import os
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from food_listings.imports import FORMAT_EXTENSIONS, IMPORT_FORMATS, import_listings
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    help = 'Import listings for a provider from a CSV or NDJSON file, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or NDJSON file ('-' for stdin)")
+        parser.add_argument('--provider', required=True, help='Email of the provider who owns the listings')
+        parser.add_argument('--type', choices=IMPORT_FORMATS, help='File format (default: from the file extension)')
+        parser.add_argument('--batch-size', type=int, help='Rows validated and inserted at a time')
+        parser.add_argument('--no-notify', action='store_true', help="Don't email the provider a summary")
+
+    def handle(self, *args, **options):
+        try:
+            provider = User.objects.get(email=options['provider'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['provider']}")
+        if provider.role not in ['FoodProvider', 'Admin']:
+            raise CommandError(f"{provider.email} is a {provider.role}; only Food Providers and Admins own listings")
+
+        path = options['path']
+        import_format = options['type'] or FORMAT_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+        if import_format is None:
+            raise CommandError('Unknown file format; pass --type')
+
+        if path == '-':
+            result = self.run_import(provider, sys.stdin.buffer, import_format, options)
+        else:
+            with open(path, 'rb') as f:
+                result = self.run_import(provider, f, import_format, options)
+
+        for error in result['errors']:
+            self.stderr.write(f"Line {error['line']}: {error['errors']}")
+        if result['errors_truncated']:
+            self.stderr.write(f"... {result['failed'] - len(result['errors'])} more rows with errors")
+        if result['aborted']:
+            self.stderr.write(self.style.ERROR(f"Stopped early: {result['aborted']}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Read {result['rows']} rows: created {result['created']} listings, skipped {result['failed']}"
+        ))
+
+    def run_import(self, provider, stream, import_format, options):
+        return import_listings(
+            provider, stream, import_format, batch_size=options['batch_size'], notify=not options['no_notify'],
+        )
@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from food_listings.matching import NGOIndex, load_ngo_profiles, refresh_listing_matches
+from food_listings.models import FoodListing, ListingMatch
+
+class Command(BaseCommand):
+    help = 'Re-match every Available listing to NGOs in batches, e.g. to take in new NGOs and history'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        # One fresh snapshot of NGO profiles for the whole run
+        index = NGOIndex(load_ngo_profiles(), settings.MATCHING_RADIUS_KM)
+
+        listings = matches = 0
+        last_id = 0
+        while True:
+            ids = list(
+                FoodListing.objects.filter(id__gt=last_id, status='Available', expiry_time__gt=timezone.now())
+                .order_by('id').values_list('id', flat=True)[:options['batch_size']]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                matches += refresh_listing_matches(ids, index)
+            listings += len(ids)
+            last_id = ids[-1]
+
+        # Matches of listings that expired without a status change
+        stale = ListingMatch.objects.filter(expiry_time__lte=timezone.now()).delete()[0]
+        self.stdout.write(self.style.SUCCESS(
+            f"Matched {listings} listings to {matches} NGO slots, dropped {stale} expired matches "
+            f"in {time.perf_counter() - started:.1f}s"
+        ))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from food_listings.models import FoodListing, ListingSearchTerm
+from food_listings.search import get_backend, index_listings
+
+class Command(BaseCommand):
+    help = 'Rebuild the inverted search index for all food listings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if get_backend() != 'inverted':
+            self.stdout.write('The PostgreSQL search backend is served by its GIN index; nothing to rebuild.')
+            return
+
+        batch_size = options['batch_size']
+        ListingSearchTerm.objects.all().delete()
+
+        indexed = 0
+        last_id = 0
+        fields = ('id', 'title', 'description', 'location')
+        while True:
+            listings = list(
+                FoodListing.objects.filter(id__gt=last_id).order_by('id').only(*fields)[:batch_size]
+            )
+            if not listings:
+                break
+            last_id = listings[-1].id
+            with transaction.atomic():
+                indexed += index_listings(listings)
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} listings"))
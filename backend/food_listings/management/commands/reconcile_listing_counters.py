@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from food_listings.models import FoodListing, ListingStatusCounter
+
+class Command(BaseCommand):
+    help = 'Recompute listing status counters from food_listings and repair any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without fixing it')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            # Lock the counters so concurrent transitions wait for the repair
+            current = {
+                (counter.provider_id, counter.status): counter
+                for counter in ListingStatusCounter.objects.select_for_update()
+            }
+
+            expected = {}
+            rows = FoodListing.objects.order_by().values('created_by', 'status').annotate(total=Count('id'))
+            for row in rows:
+                expected[(row['created_by'], row['status'])] = row['total']
+                expected[(None, row['status'])] = expected.get((None, row['status']), 0) + row['total']
+
+            to_update, to_create = [], []
+            for key in set(current) | set(expected):
+                actual = current[key].count if key in current else 0
+                wanted = expected.get(key, 0)
+                if actual == wanted:
+                    continue
+                provider_id, status = key
+                self.stdout.write(f"{provider_id or 'global'} {status}: {actual} -> {wanted}")
+                if key in current:
+                    current[key].count = wanted
+                    to_update.append(current[key])
+                else:
+                    to_create.append(ListingStatusCounter(provider_id=provider_id, status=status, count=wanted))
+
+            if options['dry_run']:
+                transaction.set_rollback(True)
+            else:
+                ListingStatusCounter.objects.bulk_update(to_update, ['count'], batch_size=1000)
+                ListingStatusCounter.objects.bulk_create(to_create, batch_size=1000)
+
+        drift = len(to_update) + len(to_create)
+        verb = 'Found' if options['dry_run'] else 'Repaired'
+        self.stdout.write(self.style.SUCCESS(f"{verb} {drift} drifted counters"))
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from food_listings.expiry import expire_listings, notify_expiring_listings
+
+class Command(BaseCommand):
+    help = 'Mark expired listings as Expired and queue expiring-soon reminders, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--interval', type=float, default=300,
+                            help='Seconds between sweeps when running continuously')
+        parser.add_argument('--once', action='store_true', help='Run a single sweep, then exit')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        try:
+            while True:
+                expired = expire_listings(batch_size=batch_size)
+                notified = notify_expiring_listings(batch_size=batch_size)
+                if expired or notified:
+                    self.stdout.write(f"Expired {expired} listings, queued {notified} expiring-soon reminders")
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
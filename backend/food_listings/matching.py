@@ -0,0 +1,202 @@
+"""
+Matching engine: which NGOs each Available listing is recommended to.
+
+A listing's score for an NGO is its base score minus URGENCY_PER_HOUR for
+every hour until the listing expires. The base score adds up:
+
+- distance: 1 at the NGO's location, falling to 0 at MATCHING_RADIUS_KM.
+  NGOs further away are not candidates. UNKNOWN_DISTANCE is used when
+  either side has no coordinates.
+- quantity: how large the listing is, and how close it is to the
+  quantities the NGO usually requests.
+- affinity: the NGO's earlier requests to the same provider, with
+  completed ones counting double.
+- reliability: the smoothed share of the NGO's requests it completed.
+
+Urgency is the same for every NGO, so it has no say in which NGOs a
+listing goes to. Each listing is matched to the MATCHING_FANOUT NGOs with
+the best base score. This spreads listings over the NGOs best placed to
+collect them, instead of showing every listing to everyone. Urgency is
+linear in the expiry time, so the stored priority orders an NGO's matches
+the same way at any moment. That makes the NGO's queue a plain index scan.
+
+Refreshing a listing scores it only against NGOs in nearby grid cells, so
+the cost does not depend on how many listings exist. NGO profiles
+(location and request history) are aggregated in one query and cached for
+MATCHING_PROFILE_TTL seconds.
+"""
+import heapq
+import math
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+
+from requests_app.models import FoodRequest
+from .geo import EARTH_RADIUS_KM, haversine_km
+from .models import FoodListing, ListingMatch
+
+User = get_user_model()
+
+WEIGHTS = {'distance': 3.0, 'quantity': 1.0, 'affinity': 1.5, 'reliability': 1.0}
+URGENCY_PER_HOUR = 0.05  # expiring a day sooner is worth 1.2 points
+UNKNOWN_DISTANCE = 0.25
+AFFINITY_SATURATION = 5  # past requests (completed ones doubled) for full affinity
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+PROFILES_KEY = 'matching:ngo_profiles'
+
+# Listing fields scores depend on; changing any of them re-matches the listing
+MATCH_FIELDS = ('id', 'latitude', 'longitude', 'quantity', 'expiry_time', 'created_by_id')
+
+def load_ngo_profiles():
+    """[(ngo_id, latitude, longitude, usual_quantity, reliability)] for every active NGO"""
+    history = {
+        row['requested_by_id']: row
+        for row in FoodRequest.objects.order_by().values('requested_by_id').annotate(
+            requests=Count('id'),
+            completed=Count('id', filter=Q(status='Completed')),
+            quantity=Avg('food_item__quantity'),
+        )
+    }
+    profiles = []
+    ngos = User.objects.filter(role='NGO/Volunteer', is_active=True).values_list('id', 'latitude', 'longitude')
+    for ngo_id, latitude, longitude in ngos:
+        row = history.get(ngo_id)
+        if row is None:
+            profiles.append((ngo_id, latitude, longitude, None, 0.5))
+        else:
+            reliability = (row['completed'] + 1) / (row['requests'] + 2)
+            profiles.append((ngo_id, latitude, longitude, row['quantity'], reliability))
+    return profiles
+
+def get_ngo_profiles():
+    profiles = cache.get(PROFILES_KEY)
+    if profiles is None:
+        profiles = load_ngo_profiles()
+        cache.set(PROFILES_KEY, profiles, settings.MATCHING_PROFILE_TTL)
+    return profiles
+
+def invalidate_ngo_profiles():
+    transaction.on_commit(lambda: cache.delete(PROFILES_KEY))
+
+class NGOIndex:
+    """NGO profiles in a grid of MATCHING_RADIUS_KM cells, for radius lookups"""
+
+    def __init__(self, profiles, radius_km):
+        self.cell_degrees = radius_km / KM_PER_DEGREE
+        self.cells = defaultdict(list)
+        self.unplaced = []  # NGOs without coordinates are candidates everywhere
+        for profile in profiles:
+            _ngo_id, latitude, longitude, _quantity, _reliability = profile
+            if latitude is None or longitude is None:
+                self.unplaced.append(profile)
+            else:
+                self.cells[self.cell(latitude, longitude)].append(profile)
+
+    def cell(self, latitude, longitude):
+        return math.floor(latitude / self.cell_degrees), math.floor(longitude / self.cell_degrees)
+
+    def near(self, latitude, longitude):
+        """Profiles that may lie within the radius of a point (all of them for no point)"""
+        if latitude is None or longitude is None:
+            return [profile for cell in self.cells.values() for profile in cell] + self.unplaced
+        row, column = self.cell(latitude, longitude)
+        # Longitude degrees shrink towards the poles, so more columns are in reach
+        span = math.ceil(1 / max(math.cos(math.radians(latitude)), 0.01))
+        candidates = list(self.unplaced)
+        for cell_row in (row - 1, row, row + 1):
+            for cell_column in range(column - span, column + span + 1):
+                candidates.extend(self.cells.get((cell_row, cell_column), ()))
+        return candidates
+
+def provider_affinities(provider_ids):
+    """{(ngo_id, provider_id): past requests, completed ones counting double}"""
+    rows = (
+        FoodRequest.objects.filter(food_item__created_by_id__in=provider_ids).order_by()
+        .values('requested_by_id', 'food_item__created_by_id')
+        .annotate(requests=Count('id'), completed=Count('id', filter=Q(status='Completed')))
+    )
+    return {
+        (row['requested_by_id'], row['food_item__created_by_id']): row['requests'] + row['completed']
+        for row in rows
+    }
+
+def base_scores(listing, candidates, affinities):
+    """Score one listing (a dict of MATCH_FIELDS) for NGO profiles: [(score, ngo_id, distance_km)]"""
+    latitude, longitude = listing['latitude'], listing['longitude']
+    quantity = max(listing['quantity'], 1)
+    provider_id = listing['created_by_id']
+    radius = settings.MATCHING_RADIUS_KM
+    size = min(1.0, math.log1p(quantity) / math.log1p(100))
+
+    scored = []
+    for ngo_id, ngo_latitude, ngo_longitude, usual_quantity, reliability in candidates:
+        if latitude is None or longitude is None or ngo_latitude is None or ngo_longitude is None:
+            distance, closeness = None, UNKNOWN_DISTANCE
+        else:
+            distance = haversine_km(latitude, longitude, ngo_latitude, ngo_longitude)
+            if distance > radius:
+                continue
+            closeness = 1 - distance / radius
+        if usual_quantity:
+            fit = max(0.0, 1 - abs(math.log(quantity / usual_quantity)) / math.log(10))
+        else:
+            fit = size
+        affinity = min(1.0, affinities.get((ngo_id, provider_id), 0) / AFFINITY_SATURATION)
+        score = (
+            WEIGHTS['distance'] * closeness
+            + WEIGHTS['quantity'] * (size + fit) / 2
+            + WEIGHTS['affinity'] * affinity
+            + WEIGHTS['reliability'] * reliability
+        )
+        scored.append((score, ngo_id, distance))
+    return scored
+
+def urgency_offset(expiry_time):
+    return -URGENCY_PER_HOUR * (expiry_time - EPOCH).total_seconds() / 3600
+
+def match_score(priority, now=None):
+    """A match's score at `now`: its base score minus URGENCY_PER_HOUR per hour left"""
+    now = now or timezone.now()
+    return priority + URGENCY_PER_HOUR * (now - EPOCH).total_seconds() / 3600
+
+def write_matches(listings, index=None):
+    """Match listings (dicts of MATCH_FIELDS) that have no matches yet; return the number written"""
+    if not listings:
+        return 0
+    if index is None:
+        index = NGOIndex(get_ngo_profiles(), settings.MATCHING_RADIUS_KM)
+    affinities = provider_affinities({listing['created_by_id'] for listing in listings})
+
+    matches = []
+    for listing in listings:
+        candidates = index.near(listing['latitude'], listing['longitude'])
+        best = heapq.nlargest(settings.MATCHING_FANOUT, base_scores(listing, candidates, affinities))
+        offset = urgency_offset(listing['expiry_time'])
+        matches.extend(
+            ListingMatch(
+                listing_id=listing['id'], ngo_id=ngo_id, priority=score + offset,
+                expiry_time=listing['expiry_time'], distance_km=distance,
+            )
+            for score, ngo_id, distance in best
+        )
+    ListingMatch.objects.bulk_create(matches, batch_size=1000)
+    return len(matches)
+
+def drop_listing_matches(listing_ids):
+    ListingMatch.objects.filter(listing_id__in=listing_ids).delete()
+
+def refresh_listing_matches(listing_ids, index=None):
+    """Re-match listings; those no longer Available just lose their matches"""
+    drop_listing_matches(listing_ids)
+    listings = list(
+        FoodListing.objects.filter(id__in=listing_ids, status='Available', expiry_time__gt=timezone.now())
+        .values(*MATCH_FIELDS)
+    )
+    return write_matches(listings, index)
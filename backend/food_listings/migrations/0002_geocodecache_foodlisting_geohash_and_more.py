@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:27
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_listings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodeCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(max_length=255, unique=True)),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('source', models.CharField(default='gazetteer', max_length=50)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'geocode_cache',
+            },
+        ),
+        migrations.AddField(
+            model_name='foodlisting',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='foodlisting',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)]),
+        ),
+        migrations.AddField(
+            model_name='foodlisting',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)]),
+        ),
+        migrations.AddIndex(
+            model_name='foodlisting',
+            index=models.Index(fields=['latitude', 'longitude'], name='food_listing_lat_lng_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+SEARCH_INDEX_NAME = 'food_listing_search_gin'
+
+
+def create_search_index(apps, schema_editor):
+    """GIN index for the PostgreSQL search backend; other databases use the inverted index"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from django.contrib.postgres.indexes import GinIndex
+    from food_listings.search import listing_search_vector
+
+    model = apps.get_model('food_listings', 'FoodListing')
+    schema_editor.add_index(model, GinIndex(listing_search_vector(), name=SEARCH_INDEX_NAME))
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS {SEARCH_INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_listings', '0002_geocodecache_foodlisting_geohash_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListingSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('weight', models.PositiveIntegerField(default=1)),
+                ('listing', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='food_listings.foodlisting')),
+            ],
+            options={
+                'db_table': 'food_listing_search_terms',
+                'unique_together': {('term', 'listing')},
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_listings', '0003_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='foodlisting',
+            index=models.Index(fields=['-created_at', '-id'], name='food_listing_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='foodlisting',
+            index=models.Index(fields=['created_by', '-created_at', '-id'], name='food_listing_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='foodlisting',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='food_listing_status_crt_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:36
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_counters(apps, schema_editor):
+    FoodListing = apps.get_model('food_listings', 'FoodListing')
+    ListingStatusCounter = apps.get_model('food_listings', 'ListingStatusCounter')
+
+    totals = {}
+    rows = FoodListing.objects.order_by().values('created_by', 'status').annotate(total=models.Count('id'))
+    for row in rows:
+        totals[(row['created_by'], row['status'])] = row['total']
+        totals[(None, row['status'])] = totals.get((None, row['status']), 0) + row['total']
+
+    ListingStatusCounter.objects.bulk_create([
+        ListingStatusCounter(provider_id=provider_id, status=status, count=count)
+        for (provider_id, status), count in totals.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('food_listings', '0004_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListingStatusCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('provider', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='listing_counters', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'food_listing_counters',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='listingstatuscounter',
+            constraint=models.UniqueConstraint(fields=('provider', 'status'), name='listing_counter_provider_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='listingstatuscounter',
+            constraint=models.UniqueConstraint(condition=models.Q(('provider__isnull', True)), fields=('status',), name='listing_counter_global_uniq'),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_listings', '0005_listing_status_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='foodlisting',
+            index=models.Index(condition=models.Q(('status', 'Available')), fields=['expiry_time'], name='food_listing_available_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='foodlisting',
+            index=models.Index(fields=['created_by', 'status', 'expiry_time'], name='food_listing_owner_exp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='foodlisting',
+            index=models.Index(fields=['expiry_time'], name='food_listing_expiry_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_listings', '0006_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='foodlisting',
+            name='expiring_notified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='foodlisting',
+            name='status',
+            field=models.CharField(choices=[('Available', 'Available'), ('Requested', 'Requested'), ('Collected', 'Collected'), ('Distributed', 'Distributed'), ('Expired', 'Expired')], default='Available', max_length=20),
+        ),
+    ]
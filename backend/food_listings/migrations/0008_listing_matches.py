@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:15
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('food_listings', '0007_listing_expiry_tracking'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListingMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('priority', models.FloatField()),
+                ('expiry_time', models.DateTimeField()),
+                ('distance_km', models.FloatField(blank=True, null=True)),
+                ('listing', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='food_listings.foodlisting')),
+                ('ngo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='listing_matches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'food_listing_matches',
+                'indexes': [models.Index(fields=['ngo', '-priority'], name='food_listing_match_queue_idx')],
+                'unique_together': {('listing', 'ngo')},
+            },
+        ),
+    ]
@@ -1,7 +1,10 @@
-from django.db import models
+from django.db import models, transaction
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
+from .geo import encode_geohash, place_candidates
+
 User = get_user_model()
 
 class FoodListing(models.Model):
@@ -10,25 +13,96 @@ class FoodListing(models.Model):
         ('Requested', 'Requested'),
         ('Collected', 'Collected'),
         ('Distributed', 'Distributed'),
+        ('Expired', 'Expired'),
     ]
     
     title = models.CharField(max_length=255)
     description = models.TextField()
     quantity = models.PositiveIntegerField(default=1)
     location = models.CharField(max_length=255)
+    latitude = models.FloatField(
+        blank=True, null=True, validators=[MinValueValidator(-90), MaxValueValidator(90)]
+    )
+    longitude = models.FloatField(
+        blank=True, null=True, validators=[MinValueValidator(-180), MaxValueValidator(180)]
+    )
+    geohash = models.CharField(max_length=12, blank=True, db_index=True)
     expiry_time = models.DateTimeField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Available')
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='food_listings')
+    # Set by the expiry sweeper once the provider was told the listing expires soon
+    expiring_notified_at = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         db_table = 'food_listings'
         ordering = ['-created_at']
+        indexes = [
+            # Bounding-box prefilter for radius queries
+            models.Index(fields=['latitude', 'longitude'], name='food_listing_lat_lng_idx'),
+            # Keyset pagination, globally and for each role-scoped filter
+            models.Index(fields=['-created_at', '-id'], name='food_listing_created_idx'),
+            models.Index(fields=['created_by', '-created_at', '-id'], name='food_listing_owner_created_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='food_listing_status_crt_idx'),
+            # Hot filters: the available feed (partial, ordered by expiry),
+            # provider dashboards and expiry-based counts
+            models.Index(
+                fields=['expiry_time'], condition=models.Q(status='Available'), name='food_listing_available_idx'
+            ),
+            models.Index(fields=['created_by', 'status', 'expiry_time'], name='food_listing_owner_exp_idx'),
+            models.Index(fields=['expiry_time'], name='food_listing_expiry_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.status}"
     
+    # Fields whose loaded values are remembered so save() and signal handlers
+    # can tell what actually changed without re-reading the row
+    TRACKED_FIELDS = ('title', 'description', 'location', 'latitude', 'longitude', 'quantity', 'status', 'expiry_time')
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            field: instance.__dict__[field] for field in cls.TRACKED_FIELDS if field in instance.__dict__
+        }
+        return instance
+    
+    def has_changed(self, field):
+        """True for unsaved instances or if a tracked field differs from the database"""
+        loaded = getattr(self, '_loaded_values', {})
+        return field not in loaded or loaded[field] != getattr(self, field)
+    
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'location', 'latitude', 'longitude'} & set(update_fields):
+            if (self.latitude is None or self.longitude is None) and self.has_changed('location'):
+                coordinates = GeocodeCache.lookup(self.location)
+                if coordinates:
+                    self.latitude, self.longitude = coordinates
+            self.geohash = self.compute_geohash()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'latitude', 'longitude', 'geohash'}
+        if self.expiring_notified_at and self.has_changed('expiry_time'):
+            # A new expiry time deserves a new reminder
+            self.expiring_notified_at = None
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'expiring_notified_at'}
+        # Signal handlers (counters, search index) write in the same transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self._loaded_values = {field: getattr(self, field) for field in self.TRACKED_FIELDS}
+    
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
+    
+    def compute_geohash(self):
+        if self.latitude is None or self.longitude is None:
+            return ''
+        return encode_geohash(self.latitude, self.longitude)
+    
     @property
     def is_expired(self):
         return timezone.now() > self.expiry_time
@@ -36,4 +110,100 @@ class FoodListing(models.Model):
     @property
     def is_expiring_soon(self):
         time_diff = self.expiry_time - timezone.now()
-        return time_diff.total_seconds() <= 24 * 3600 and time_diff.total_seconds() > 0
\ No newline at end of file
+        return time_diff.total_seconds() <= 24 * 3600 and time_diff.total_seconds() > 0
+
+class GeocodeCache(models.Model):
+    """Offline gazetteer: normalized place names mapped to coordinates"""
+    query = models.CharField(max_length=255, unique=True)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    source = models.CharField(max_length=50, default='gazetteer')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'geocode_cache'
+    
+    def __str__(self):
+        return f"{self.query} ({self.latitude}, {self.longitude})"
+    
+    @classmethod
+    def lookup(cls, location):
+        """Return (latitude, longitude) for the most specific known part of a location"""
+        candidates = list(place_candidates(location))
+        if not candidates:
+            return None
+        
+        matches = {
+            query: (latitude, longitude)
+            for query, latitude, longitude in cls.objects.filter(query__in=candidates)
+            .values_list('query', 'latitude', 'longitude')
+        }
+        for candidate in candidates:
+            if candidate in matches:
+                return matches[candidate]
+        return None
+
+class ListingSearchTerm(models.Model):
+    """Inverted index entry: one term of one listing with its field-weighted score"""
+    term = models.CharField(max_length=64)
+    listing = models.ForeignKey(FoodListing, on_delete=models.CASCADE, related_name='search_terms')
+    weight = models.PositiveIntegerField(default=1)
+    
+    class Meta:
+        db_table = 'food_listing_search_terms'
+        # The unique index doubles as the (term, listing) lookup index
+        unique_together = ['term', 'listing']
+    
+    def __str__(self):
+        return f"{self.term} -> {self.listing_id} ({self.weight})"
+
+class ListingStatusCounter(models.Model):
+    """
+    Number of listings per status, per provider and globally (provider=None).
+
+    Maintained transactionally by the handlers in food_listings/signals.py;
+    `manage.py reconcile_listing_counters` repairs any drift.
+    """
+    provider = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='listing_counters', blank=True, null=True
+    )
+    status = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'food_listing_counters'
+        constraints = [
+            models.UniqueConstraint(fields=['provider', 'status'], name='listing_counter_provider_uniq'),
+            models.UniqueConstraint(
+                fields=['status'], condition=models.Q(provider__isnull=True), name='listing_counter_global_uniq'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.provider_id or 'global'} {self.status}: {self.count}"
+
+class ListingMatch(models.Model):
+    """
+    One of the NGOs an Available listing is recommended to.
+
+    Each listing is matched to its MATCHING_FANOUT best-scoring NGOs by
+    food_listings/matching.py. The rows of one NGO, read in priority order,
+    are that NGO's recommendation queue. Urgency is folded into `priority`
+    so that the order never goes stale as expiry times approach.
+    """
+    listing = models.ForeignKey(FoodListing, on_delete=models.CASCADE, related_name='matches')
+    ngo = models.ForeignKey(User, on_delete=models.CASCADE, related_name='listing_matches')
+    priority = models.FloatField()
+    # Copied from the listing so expired matches are skipped by the index scan
+    expiry_time = models.DateTimeField()
+    distance_km = models.FloatField(blank=True, null=True)
+    
+    class Meta:
+        db_table = 'food_listing_matches'
+        unique_together = ['listing', 'ngo']
+        indexes = [
+            models.Index(fields=['ngo', '-priority'], name='food_listing_match_queue_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.listing_id} -> {self.ngo_id} ({self.priority:.2f})"
@@ -22,4 +22,15 @@ class IsOwnerOrAdmin(permissions.BasePermission):
             return True
         
         # Write permissions are only allowed to the owner of the listing or admin.
-        return obj.created_by == request.user or request.user.role == 'Admin'
\ No newline at end of file
+        return obj.created_by_id == request.user.id or request.user.role == 'Admin'
+
+def visible_listings(user, queryset):
+    """The listings `user` sees in list views and sync"""
+    if user.role == 'FoodProvider':
+        # Food providers see only their own listings
+        return queryset.filter(created_by=user)
+    if user.role == 'NGO/Volunteer':
+        # NGOs see only available listings
+        return queryset.filter(status='Available')
+    # Admins see all listings
+    return queryset
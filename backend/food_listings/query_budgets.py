@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from food_donation.query_budgets import QueryBudget
+
+def new_listing(world):
+    return {
+        'title': 'Budget soup', 'description': 'Synthetic', 'quantity': 5, 'location': 'Nowhere',
+        'expiry_time': (timezone.now() + timedelta(days=1)).isoformat(),
+    }
+
+QUERY_BUDGETS = [
+    QueryBudget('food_listing_list', 'GET', '/api/food/', 'FoodProvider', 4),
+    QueryBudget('food_listing_list_ngo', 'GET', '/api/food/', 'NGO/Volunteer', 4),
+    QueryBudget('food_listing_search', 'GET', '/api/food/?search=budget', 'NGO/Volunteer', 4),
+    QueryBudget('food_listing_create', 'POST', '/api/food/', 'FoodProvider', 19, data=new_listing),
+    QueryBudget('food_listing_detail', 'GET', '/api/food/{listing}/', 'NGO/Volunteer', 2),
+    QueryBudget('food_listing_update', 'PATCH', '/api/food/{listing}/', 'FoodProvider', 10, data={'quantity': 7}),
+    QueryBudget('food_listing_delete', 'DELETE', '/api/food/{listing}/', 'FoodProvider', 12),
+    QueryBudget('dashboard_stats_provider', 'GET', '/api/food/dashboard-stats/', 'FoodProvider', 3),
+    QueryBudget('dashboard_stats_ngo', 'GET', '/api/food/dashboard-stats/', 'NGO/Volunteer', 3),
+    QueryBudget('dashboard_stats_admin', 'GET', '/api/food/dashboard-stats/', 'Admin', 3),
+    QueryBudget('available_food', 'GET', '/api/food/available/', 'NGO/Volunteer', 3),
+    QueryBudget('available_food_stream', 'GET', '/api/food/available/?stream=1', 'NGO/Volunteer', 2),
+    QueryBudget('nearby_food', 'GET', '/api/food/nearby/?lat=28.6&lng=77.2&radius=10', 'NGO/Volunteer', 3),
+    QueryBudget('recommended_food', 'GET', '/api/food/recommended/', 'NGO/Volunteer', 3),
+]
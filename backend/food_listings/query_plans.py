@@ -0,0 +1,115 @@
+"""
+Query plan checks for the hot listing and request filters.
+
+seed() fills the tables with a synthetic dataset shaped like production
+(mostly Distributed listings, a few Available ones), then find_sequential_scans()
+EXPLAINs every query from hot_queries() and reports any that read a whole
+table. Used by `manage.py check_query_plans` and the food_listings tests.
+"""
+import random
+import re
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from requests_app.models import FoodRequest
+from .models import FoodListing
+
+User = get_user_model()
+
+# Plan lines that mean a whole table is read, per database vendor
+SEQUENTIAL_SCAN = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'sqlite': re.compile(r'\bSCAN (\w+)'),
+}
+STATUS_WEIGHTS = {'Available': 10, 'Requested': 5, 'Collected': 10, 'Distributed': 60, 'Expired': 15}
+
+class PlanCheckError(Exception):
+    """The plans can't be checked (unsupported backend, no data to check against)"""
+
+def hot_queries(provider, ngo, listing, food_request):
+    """
+    (name, queryset) for each hot filter the indexes are designed for; counts
+    are unordered like count()
+    """
+    now = timezone.now()
+    expiring_window = Q(expiry_time__lte=now + timedelta(hours=24), expiry_time__gt=now, status='Available')
+    return [
+        ('available_food', FoodListing.objects.filter(status='Available', expiry_time__gt=now).order_by('expiry_time')),
+        ('expiry_sweep', FoodListing.objects.filter(status='Available', expiry_time__lte=now).order_by('expiry_time')),
+        ('expiring_soon_reminders', FoodListing.objects.filter(
+            expiring_window, expiring_notified_at__isnull=True
+        ).order_by('expiry_time')),
+        ('dashboard_provider_expiring', FoodListing.objects.filter(expiring_window, created_by=provider).order_by()),
+        ('dashboard_expiring', FoodListing.objects.filter(expiring_window).order_by()),
+        ('dashboard_unswept_expired', FoodListing.objects.filter(status='Available', expiry_time__lt=now).order_by()),
+        ('provider_listings', FoodListing.objects.filter(created_by=provider).order_by('-created_at', '-id')),
+        ('ngo_listings', FoodListing.objects.filter(status='Available').order_by('-created_at', '-id')),
+        ('other_pending_requests', FoodRequest.objects.filter(
+            food_item=listing, status='Pending'
+        ).exclude(id=food_request.id).order_by()),
+        ('my_requests', FoodRequest.objects.filter(requested_by=ngo).order_by('-created_at', '-id')),
+        ('requests_for_my_food', FoodRequest.objects.filter(food_item__created_by=provider).order_by('-created_at')),
+    ]
+
+def seed(listings, providers, ngos):
+    """Bulk-insert synthetic users, listings and requests, then refresh planner statistics"""
+    rng = random.Random(listings)
+    now = timezone.now()
+    users = User.objects.bulk_create([
+        User(
+            username=f'plan-check-{role}-{n}', email=f'plan-check-{role}-{n}@example.com',
+            password='!', full_name=f'Plan Check {n}', role=role,
+        )
+        for role, total in (('FoodProvider', providers), ('NGO/Volunteer', ngos))
+        for n in range(total)
+    ])
+    provider_ids = [user.id for user in users if user.role == 'FoodProvider']
+    ngo_ids = [user.id for user in users if user.role == 'NGO/Volunteer']
+
+    statuses, weights = zip(*STATUS_WEIGHTS.items())
+    for offset in range(0, listings, 5000):
+        batch = [
+            FoodListing(
+                title=f'Plan check listing {offset + n}', description='Synthetic', location='Nowhere',
+                expiry_time=now + timedelta(hours=rng.uniform(-24 * 30, 72)),
+                status=rng.choices(statuses, weights)[0], created_by_id=rng.choice(provider_ids),
+            )
+            for n in range(min(5000, listings - offset))
+        ]
+        created = FoodListing.objects.bulk_create(batch)
+        requests = []
+        for listing in created:
+            if listing.status != 'Distributed' and rng.random() < 0.5:
+                for ngo_id in rng.sample(ngo_ids, rng.randint(1, 3)):
+                    requests.append(FoodRequest(
+                        food_item_id=listing.id, requested_by_id=ngo_id,
+                        status='Pending' if listing.status in ('Available', 'Requested') else 'Approved',
+                    ))
+        FoodRequest.objects.bulk_create(requests)
+
+    # Give the planner statistics that reflect the seeded data
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+def find_sequential_scans():
+    """
+    EXPLAIN every hot query against the current data; returns
+    [(name, tables read sequentially, plan)] for all of them.
+    """
+    pattern = SEQUENTIAL_SCAN.get(connection.vendor)
+    if pattern is None:
+        raise PlanCheckError(f"No plan checks defined for the {connection.vendor} backend")
+    food_request = FoodRequest.objects.select_related('food_item', 'requested_by').filter(status='Pending').first()
+    provider = User.objects.filter(role='FoodProvider').first()
+    if food_request is None or provider is None:
+        raise PlanCheckError('Need at least one provider and one pending request')
+
+    results = []
+    for name, queryset in hot_queries(provider, food_request.requested_by, food_request.food_item, food_request):
+        plan = queryset.explain()
+        results.append((name, sorted(set(pattern.findall(plan))), plan))
+    return results
@@ -0,0 +1,140 @@
+"""
+Ranked full-text search over food listings.
+
+Two backends are available, picked by settings.FOOD_SEARCH_BACKEND:
+
+- 'postgres': to_tsvector/websearch_to_tsquery ranked with ts_rank, served by
+  the GIN expression index created in migration 0003.
+- 'inverted': a portable inverted index (ListingSearchTerm) kept up to date
+  from FoodListing's post_save signal. Used on SQLite and anywhere else.
+
+'auto' (the default) chooses 'postgres' when the database is PostgreSQL.
+"""
+import re
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q, Subquery, Sum
+
+from .models import ListingSearchTerm
+
+FIELD_WEIGHTS = {
+    'title': 3,
+    'location': 2,
+    'description': 1,
+}
+MAX_TERM_LENGTH = 64
+MAX_QUERY_TERMS = 8
+TERM_RANGE_END = '\uffff'
+STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in',
+    'is', 'it', 'of', 'on', 'or', 'the', 'to', 'with',
+})
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+def tokenize(text):
+    """Split text into lowercase index terms"""
+    return [
+        token[:MAX_TERM_LENGTH]
+        for token in TOKEN_RE.findall((text or '').lower())
+        if len(token) > 1 and token not in STOP_WORDS
+    ]
+
+def get_backend():
+    backend = settings.FOOD_SEARCH_BACKEND
+    if backend == 'auto':
+        return 'postgres' if connection.vendor == 'postgresql' else 'inverted'
+    return backend
+
+def listing_search_vector():
+    """The weighted tsvector expression; must match the GIN index in migration 0003"""
+    from django.contrib.postgres.search import SearchVector
+
+    return (
+        SearchVector('title', weight='A', config='english')
+        + SearchVector('location', weight='B', config='english')
+        + SearchVector('description', weight='C', config='english')
+    )
+
+def build_terms(listing):
+    """Return {term: weight} for a listing"""
+    weights = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in tokenize(getattr(listing, field)):
+            weights[token] += weight
+    return weights
+
+def index_listing(listing):
+    """Replace the inverted index entries of one listing"""
+    terms = build_terms(listing)
+    with transaction.atomic():
+        ListingSearchTerm.objects.filter(listing=listing).delete()
+        ListingSearchTerm.objects.bulk_create([
+            ListingSearchTerm(term=term, listing=listing, weight=weight)
+            for term, weight in terms.items()
+        ])
+
+def index_listings(listings, batch_size=5000):
+    """Index many listings (assumed not yet indexed) with chunked bulk inserts"""
+    batch = []
+    indexed = 0
+    for listing in listings:
+        for term, weight in build_terms(listing).items():
+            batch.append(ListingSearchTerm(term=term, listing_id=listing.id, weight=weight))
+        indexed += 1
+        if len(batch) >= batch_size:
+            ListingSearchTerm.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        ListingSearchTerm.objects.bulk_create(batch)
+    return indexed
+
+def _term_filter(token):
+    # Prefix match as a plain range so the (term, listing) index is used
+    return Q(term__gte=token, term__lt=token + TERM_RANGE_END)
+
+def search_listings(queryset, text):
+    """
+    Filter a FoodListing queryset to listings matching every word of `text`
+    and order it by relevance (annotated as `search_rank`).
+    """
+    if get_backend() == 'postgres':
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        query = SearchQuery(text, search_type='websearch', config='english')
+        vector = listing_search_vector()
+        return (
+            queryset.annotate(search_vector=vector)
+            .filter(search_vector=query)
+            .annotate(search_rank=SearchRank(vector, query))
+            .order_by('-search_rank', '-created_at')
+        )
+
+    tokens = list(dict.fromkeys(tokenize(text)))[:MAX_QUERY_TERMS]
+    if not tokens:
+        # Nothing indexable (e.g. a single character); keep the old substring behaviour
+        return queryset.filter(
+            Q(title__icontains=text) |
+            Q(description__icontains=text) |
+            Q(location__icontains=text)
+        )
+
+    # Drive the query from the term index: candidates must contain the first
+    # term, and every other term must also be present for the same listing
+    queryset = queryset.filter(
+        id__in=ListingSearchTerm.objects.filter(_term_filter(tokens[0])).values('listing_id')
+    )
+    for token in tokens[1:]:
+        queryset = queryset.filter(Exists(
+            ListingSearchTerm.objects.filter(_term_filter(token), listing=OuterRef('pk'))
+        ))
+
+    any_term = Q()
+    for token in tokens:
+        any_term |= _term_filter(token)
+    rank = (
+        ListingSearchTerm.objects.filter(any_term, listing=OuterRef('pk'))
+        .order_by().values('listing').annotate(score=Sum('weight')).values('score')
+    )
+    return queryset.annotate(search_rank=Subquery(rank)).order_by('-search_rank', '-created_at')
\ No newline at end of file
@@ -1,7 +1,11 @@
+from datetime import timedelta
+
 from rest_framework import serializers
+from django.db.models import BooleanField, ExpressionWrapper, Q
 from django.utils import timezone
 from .models import FoodListing
 from accounts.serializers import UserSerializer
+from food_donation import compiled_serializers
 
 class FoodListingSerializer(serializers.ModelSerializer):
     created_by_details = UserSerializer(source='created_by', read_only=True)
@@ -11,7 +15,7 @@ class FoodListingSerializer(serializers.ModelSerializer):
     class Meta:
         model = FoodListing
         fields = [
-            'id', 'title', 'description', 'quantity', 'location', 
+            'id', 'title', 'description', 'quantity', 'location', 'latitude', 'longitude',
             'expiry_time', 'status', 'created_by', 'created_by_details',
             'created_at', 'updated_at', 'is_expired', 'is_expiring_soon'
         ]
@@ -29,7 +33,8 @@ class FoodListingSerializer(serializers.ModelSerializer):
 class FoodListingCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = FoodListing
-        fields = ['id', 'title', 'description', 'quantity', 'location', 'expiry_time', 'status', 'created_at']
+        fields = ['id', 'title', 'description', 'quantity', 'location', 'latitude', 'longitude',
+                  'expiry_time', 'status', 'created_at']
         read_only_fields = ['id', 'status', 'created_at']
     
     def validate_expiry_time(self, value):
@@ -40,9 +45,29 @@ class FoodListingCreateSerializer(serializers.ModelSerializer):
 class FoodListingUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = FoodListing
-        fields = ['title', 'description', 'quantity', 'location', 'expiry_time', 'status']
+        fields = ['title', 'description', 'quantity', 'location', 'latitude', 'longitude', 'expiry_time', 'status']
     
     def validate_expiry_time(self, value):
         if value <= timezone.now():
             raise serializers.ValidationError("Expiry time must be in the future")
-        return value
\ No newline at end of file
+        return value
+    
+    def update(self, instance, validated_data):
+        # Coordinates of the old location are stale; let the gazetteer refill them
+        location = validated_data.get('location')
+        if location is not None and location != instance.location and 'latitude' not in validated_data:
+            instance.latitude = instance.longitude = None
+        return super().update(instance, validated_data)
+
+def expiry_annotations():
+    """SQL equivalents of FoodListing.is_expired / is_expiring_soon for the compiled path"""
+    now = timezone.now()
+    return {
+        'is_expired': ExpressionWrapper(Q(expiry_time__lt=now), output_field=BooleanField()),
+        'is_expiring_soon': ExpressionWrapper(
+            Q(expiry_time__gt=now, expiry_time__lte=now + timedelta(hours=24)),
+            output_field=BooleanField(),
+        ),
+    }
+
+compiled_serializers.register(FoodListingSerializer, annotations=expiry_annotations)
\ No newline at end of file
@@ -0,0 +1,87 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from .cache import bump_feed_version
+from .counters import apply_status_changes
+from .matching import MATCH_FIELDS, drop_listing_matches, invalidate_ngo_profiles, refresh_listing_matches, write_matches
+from .models import FoodListing
+from .search import get_backend, index_listing
+
+# Sent by code paths that change listing statuses without Model.save()/delete(),
+# such as QuerySet.update() or bulk_create(). `changes` is a list of
+# (listing_id, provider_id, old_status, new_status) tuples; old_status is None
+# for new listings and new_status is None for deleted ones. Senders must send it
+# inside the transaction that made the change.
+listings_bulk_changed = Signal()
+
+@receiver(post_save, sender=FoodListing)
+def update_search_index(sender, instance, created, raw=False, **kwargs):
+    """Keep the inverted index in step with listing text (not needed on PostgreSQL)"""
+    if raw or get_backend() != 'inverted':
+        return
+    if created or any(instance.has_changed(field) for field in ('title', 'description', 'location')):
+        index_listing(instance)
+
+@receiver(post_save, sender=FoodListing)
+def count_saved_listing(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        apply_status_changes([(instance.created_by_id, None, instance.status)])
+    elif instance.has_changed('status'):
+        old_status = getattr(instance, '_loaded_values', {}).get('status')
+        apply_status_changes([(instance.created_by_id, old_status, instance.status)])
+
+@receiver(post_delete, sender=FoodListing)
+def count_deleted_listing(sender, instance, **kwargs):
+    status = getattr(instance, '_loaded_values', {}).get('status', instance.status)
+    apply_status_changes([(instance.created_by_id, status, None)])
+
+@receiver(listings_bulk_changed)
+def count_bulk_changes(sender, changes, **kwargs):
+    apply_status_changes([
+        (provider_id, old_status, new_status)
+        for _listing_id, provider_id, old_status, new_status in changes
+    ])
+
+@receiver(post_save, sender=FoodListing)
+def match_saved_listing(sender, instance, created, raw=False, **kwargs):
+    """Keep the listing's NGO matches in step with the fields they are scored on"""
+    if raw:
+        return
+    if not created and not any(
+        instance.has_changed(field) for field in ('status', 'latitude', 'longitude', 'quantity', 'expiry_time')
+    ):
+        return
+    # Only Available listings have matches; drop them when unsure
+    if not created and getattr(instance, '_loaded_values', {}).get('status', 'Available') == 'Available':
+        drop_listing_matches([instance.id])
+    if instance.status == 'Available' and instance.expiry_time > timezone.now():
+        write_matches([{field: getattr(instance, field) for field in MATCH_FIELDS}])
+
+@receiver(listings_bulk_changed)
+def match_bulk_changes(sender, changes, **kwargs):
+    leaving = [listing_id for listing_id, _, old_status, new_status in changes
+               if old_status == 'Available' and new_status != 'Available']
+    entering = [listing_id for listing_id, _, old_status, new_status in changes
+                if new_status == 'Available' and old_status != 'Available']
+    if leaving:
+        drop_listing_matches(leaving)
+    if entering:
+        refresh_listing_matches(entering)
+
+@receiver(post_save, sender=get_user_model())
+def refresh_ngo_profiles(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login, which matching doesn't use
+    if instance.role == 'NGO/Volunteer' and not (update_fields and set(update_fields) <= {'last_login'}):
+        invalidate_ngo_profiles()
+
+@receiver(post_save, sender=FoodListing)
+@receiver(post_delete, sender=FoodListing)
+@receiver(post_save, sender=get_user_model())
+@receiver(listings_bulk_changed)
+def invalidate_feed_cache(sender, **kwargs):
+    # Provider profiles are embedded in the feed, so user changes count too
+    bump_feed_version()
\ No newline at end of file
@@ -0,0 +1,124 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .geo import bounding_box, longitude_ranges
+from .models import FoodListing
+from .query_plans import find_sequential_scans, seed
+
+User = get_user_model()
+
+class AntimeridianTests(TestCase):
+    def test_longitude_ranges_split_across_antimeridian(self):
+        self.assertEqual(longitude_ranges(10.0, 20.0), [(10.0, 20.0)])
+        self.assertEqual(longitude_ranges(179.0, 181.0), [(179.0, 180.0), (-180.0, -179.0)])
+        self.assertEqual(longitude_ranges(-181.0, -179.0), [(179.0, 180.0), (-180.0, -179.0)])
+        self.assertEqual(longitude_ranges(-200.0, 200.0), [(-180.0, 180.0)])
+
+    def test_bounding_box_runs_past_180(self):
+        _, min_lng, _, max_lng = bounding_box(0.0, 179.99, 20)
+        self.assertLess(min_lng, 179.99)
+        self.assertGreater(max_lng, 180.0)
+
+    def test_nearby_food_finds_listings_across_antimeridian(self):
+        provider = User.objects.create_user(
+            username='provider', email='provider@example.com', password='pw',
+            full_name='Provider', role='FoodProvider',
+        )
+        ngo = User.objects.create_user(
+            username='ngo', email='ngo@example.com', password='pw', full_name='NGO', role='NGO/Volunteer',
+        )
+        expiry = timezone.now() + timedelta(hours=6)
+        east, west, far = [
+            FoodListing.objects.create(
+                title=title, description='Soup', location='Pacific', latitude=-16.5, longitude=longitude,
+                expiry_time=expiry, created_by=provider,
+            )
+            for title, longitude in (('East', 179.95), ('West', -179.95), ('Far', -170.0))
+        ]
+
+        client = APIClient()
+        client.force_authenticate(ngo)
+        response = client.get('/api/food/nearby/', {'lat': -16.5, 'lng': 179.99, 'radius': 20})
+
+        self.assertEqual(response.status_code, 200)
+        ids = [item['id'] for item in response.data['results']]
+        self.assertEqual(ids, [east.id, west.id])
+        self.assertNotIn(far.id, ids)
+
+class NearbyFoodValidationTests(TestCase):
+    def setUp(self):
+        self.ngo = User.objects.create_user(
+            username='ngo', email='ngo@example.com', password='pw', full_name='NGO', role='NGO/Volunteer',
+            latitude=28.6, longitude=77.2,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.ngo)
+
+    def get(self, **params):
+        return self.client.get('/api/food/nearby/', params)
+
+    def test_rejects_non_finite_values(self):
+        for params in ({'lat': 10, 'lng': 10, 'radius': 'nan'}, {'lat': 10, 'lng': 10, 'radius': 'inf'},
+                       {'lat': 'nan', 'lng': 10}, {'lat': 10, 'lng': '-inf'}):
+            with self.subTest(**params):
+                response = self.get(**params)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data['error'], 'Invalid coordinates or radius')
+
+    def test_rejects_only_one_coordinate(self):
+        for params in ({'lat': 10}, {'lng': 10}):
+            with self.subTest(**params):
+                response = self.get(**params)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data['error'], 'Pass both lat and lng, or neither')
+
+    def test_bad_limit_has_its_own_error(self):
+        response = self.get(lat=10, lng=10, limit='many')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'limit must be an integer')
+
+    def test_falls_back_to_profile_location(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['latitude'], response.data['longitude']), (28.6, 77.2))
+
+class AdminDashboardStatsTests(TestCase):
+    def test_expired_counts_swept_and_unswept_listings(self):
+        provider = User.objects.create_user(
+            username='provider', email='provider@example.com', password='pw',
+            full_name='Provider', role='FoodProvider',
+        )
+        admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='pw', full_name='Admin', role='Admin',
+        )
+        now = timezone.now()
+        for listing_status, expiry in (
+            ('Expired', now - timedelta(hours=2)),      # swept
+            ('Available', now - timedelta(minutes=5)),  # past expiry, not swept yet
+            ('Available', now + timedelta(hours=6)),
+            ('Distributed', now - timedelta(days=3)),   # handed out before it expired
+        ):
+            FoodListing.objects.create(
+                title=listing_status, description='Soup', location='Delhi', expiry_time=expiry,
+                status=listing_status, created_by=provider,
+            )
+
+        client = APIClient()
+        client.force_authenticate(admin)
+        response = client.get('/api/food/dashboard-stats/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['expired'], 2)
+        self.assertEqual(response.data['distributed'], 1)
+        self.assertEqual(response.data['total_listings'], 4)
+
+class QueryPlanTests(TestCase):
+    def test_hot_queries_use_indexes(self):
+        seed(listings=5000, providers=50, ngos=30)
+        for name, scanned, plan in find_sequential_scans():
+            with self.subTest(name):
+                self.assertEqual(scanned, [], plan)
@@ -6,4 +6,8 @@ urlpatterns = [
     path('<int:pk>/', views.FoodListingDetailView.as_view(), name='food_listing_detail'),
     path('dashboard-stats/', views.dashboard_stats, name='dashboard_stats'),
     path('available/', views.available_food, name='available_food'),
+    path('available/cache-stats/', views.available_food_cache_stats, name='available_food_cache_stats'),
+    path('nearby/', views.nearby_food, name='nearby_food'),
+    path('recommended/', views.recommended_food, name='recommended_food'),
+    path('import/', views.import_food, name='import_food'),
 ]
\ No newline at end of file
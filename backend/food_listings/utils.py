@@ -1,5 +1,6 @@
 from django.conf import settings
 from accounts.utils import send_notification_email
+from notifications.utils import record_digest_event
 
 def send_listing_notification(listing, action, old_status=None):
     """Send notification emails for food listing actions"""
@@ -44,17 +45,21 @@ def send_request_notification(request_obj, action):
     """Send notification emails for food request actions"""
     
     if action == 'created':
-        # Notify the food provider about new request
-        send_notification_email(
-            user=request_obj.food_item.created_by,
-            subject=f'New Food Request: {request_obj.food_item.title}',
-            template_name='food_request_created.html',
-            context={
-                'request': request_obj,
-                'requester': request_obj.requested_by,
-                'listing': request_obj.food_item
-            }
-        )
+        # Notify the food provider about new request, batched if they opted into digests
+        provider = request_obj.food_item.created_by
+        if provider.notification_digest_minutes and settings.NOTIFICATION_EMAIL_ENABLED:
+            record_digest_event(provider, 'food_request_created', request_obj)
+        else:
+            send_notification_email(
+                user=provider,
+                subject=f'New Food Request: {request_obj.food_item.title}',
+                template_name='food_request_created.html',
+                context={
+                    'request': request_obj,
+                    'requester': request_obj.requested_by,
+                    'listing': request_obj.food_item
+                }
+            )
         
         # Notify the requester about successful submission
         send_notification_email(
@@ -1,34 +1,48 @@
+import math
+import os
+
 from rest_framework import generics, permissions, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import BaseParser, MultiPartParser
 from rest_framework.response import Response
+from django.conf import settings
 from django.db.models import Q
+from django.http import HttpResponse
 from django.utils import timezone
 
-from .models import FoodListing
+from food_donation.compiled_serializers import compile_serializer
+from food_donation.conditional import (
+    ConditionalListMixin, ConditionalRetrieveMixin, not_modified, set_validators
+)
+from food_donation.renderers import TimedJSONRenderer
+from food_donation.streaming import stream_json_list, wants_stream
+from .cache import get_cached_feed, get_feed_stats, get_feed_version, set_cached_feed
+from .counters import get_status_counts
+from .geo import GEOHASH_RANGE_END, bounding_box, geohash_cover, haversine_km, longitude_ranges
+from .imports import FORMAT_EXTENSIONS, FORMAT_MEDIA_TYPES, IMPORT_FORMATS, import_listings
+from .matching import match_score
+from .models import FoodListing, ListingMatch
 from .serializers import (
     FoodListingSerializer, 
     FoodListingCreateSerializer,
     FoodListingUpdateSerializer
 )
-from .permissions import IsFoodProviderOrAdmin, IsOwnerOrAdmin
+from .permissions import IsFoodProviderOrAdmin, IsOwnerOrAdmin, visible_listings
+from .search import search_listings
 from .utils import send_listing_notification
 
-class FoodListingListCreateView(generics.ListCreateAPIView):
+# Listing responses embed the provider's profile and time-dependent expiry flags
+LISTING_MODIFIED_FIELDS = ('updated_at', 'created_by__updated_at')
+
+class FoodListingListCreateView(ConditionalListMixin, generics.ListCreateAPIView):
     serializer_class = FoodListingSerializer
     permission_classes = [permissions.IsAuthenticated]
+    etag_modified_fields = LISTING_MODIFIED_FIELDS
+    etag_expiry_field = 'expiry_time'
     
     def get_queryset(self):
-        queryset = FoodListing.objects.select_related('created_by')
-        
         # Filter based on user role
-        user = self.request.user
-        if user.role == 'FoodProvider':
-            # Food providers see only their own listings
-            queryset = queryset.filter(created_by=user)
-        elif user.role == 'NGO/Volunteer':
-            # NGOs see only available listings
-            queryset = queryset.filter(status='Available')
-        # Admins see all listings
+        queryset = visible_listings(self.request.user, FoodListing.objects.select_related('created_by'))
         
         # Apply filters
         status_filter = self.request.query_params.get('status')
@@ -37,11 +51,8 @@ class FoodListingListCreateView(generics.ListCreateAPIView):
         
         search = self.request.query_params.get('search')
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | 
-                Q(description__icontains=search) |
-                Q(location__icontains=search)
-            )
+            # Relevance-ranked; see food_listings/search.py
+            queryset = search_listings(queryset, search)
         
         return queryset
     
@@ -65,9 +76,11 @@ class FoodListingListCreateView(generics.ListCreateAPIView):
         # Send notification email
         send_listing_notification(listing, 'created')
 
-class FoodListingDetailView(generics.RetrieveUpdateDestroyAPIView):
+class FoodListingDetailView(ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = FoodListing.objects.select_related('created_by')
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
+    etag_modified_fields = LISTING_MODIFIED_FIELDS
+    etag_expiry_field = 'expiry_time'
     
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
@@ -87,34 +100,39 @@ class FoodListingDetailView(generics.RetrieveUpdateDestroyAPIView):
 def dashboard_stats(request):
     """Get dashboard statistics for the current user"""
     user = request.user
+    now = timezone.now()
+    expiring_window = Q(
+        expiry_time__lte=now + timezone.timedelta(hours=24),
+        expiry_time__gt=now,
+        status='Available'
+    )
     
+    # Status counts come from the incrementally maintained counters; the
+    # time-dependent numbers are counted with index-backed WHERE clauses
     if user.role == 'FoodProvider':
-        my_listings = FoodListing.objects.filter(created_by=user)
+        counts = get_status_counts(provider=user)
         stats = {
-            'active_listings': my_listings.exclude(status='Distributed').count(),
-            'total_distributed': my_listings.filter(status='Distributed').count(),
-            'expiring_soon': my_listings.filter(
-                expiry_time__lte=timezone.now() + timezone.timedelta(hours=24),
-                expiry_time__gt=timezone.now(),
-                status='Available'
-            ).count(),
+            'active_listings': sum(counts.values()) - counts.get('Distributed', 0) - counts.get('Expired', 0),
+            'total_distributed': counts.get('Distributed', 0),
+            'expiring_soon': FoodListing.objects.filter(expiring_window, created_by=user).count(),
         }
     elif user.role == 'NGO/Volunteer':
-        available_listings = FoodListing.objects.filter(status='Available')
+        counts = get_status_counts()
         stats = {
-            'available_food': available_listings.count(),
-            'expiring_soon': available_listings.filter(
-                expiry_time__lte=timezone.now() + timezone.timedelta(hours=24),
-                expiry_time__gt=timezone.now()
-            ).count(),
+            'available_food': counts.get('Available', 0),
+            'expiring_soon': FoodListing.objects.filter(expiring_window).count(),
         }
     else:  # Admin
-        all_listings = FoodListing.objects.all()
+        counts = get_status_counts()
         stats = {
-            'total_listings': all_listings.count(),
-            'active_listings': all_listings.exclude(status='Distributed').count(),
-            'distributed': all_listings.filter(status='Distributed').count(),
-            'expired': all_listings.filter(expiry_time__lt=timezone.now()).count(),
+            'total_listings': sum(counts.values()),
+            'active_listings': sum(counts.values()) - counts.get('Distributed', 0) - counts.get('Expired', 0),
+            'distributed': counts.get('Distributed', 0),
+            # Listings the sweep has marked Expired, plus the few Available ones
+            # past expiry it hasn't reached yet (a range on the partial index)
+            'expired': counts.get('Expired', 0) + FoodListing.objects.filter(
+                status='Available', expiry_time__lt=now
+            ).count(),
         }
     
     return Response(stats)
@@ -134,5 +152,228 @@ def available_food(request):
         expiry_time__gt=timezone.now()
     ).select_related('created_by').order_by('expiry_time')
     
-    serializer = FoodListingSerializer(listings, many=True)
-    return Response(serializer.data)
\ No newline at end of file
+    if wants_stream(request):
+        return stream_json_list(listings, FoodListingSerializer)
+    
+    # The feed is identical for every caller, so serve it from the versioned
+    # cache; its ETag is stored alongside, so a 304 costs no query at all
+    cached = get_cached_feed()
+    if cached is None:
+        version = get_feed_version()
+        if settings.FAST_SERIALIZERS_ENABLED:
+            compiled = compile_serializer(FoodListingSerializer)
+            data = compiled.serialize(compiled.values(listings))
+        else:
+            data = FoodListingSerializer(listings, many=True).data
+        body = TimedJSONRenderer().render(data)
+        etag = set_cached_feed(body, version)
+        cache_status = 'MISS'
+    else:
+        body, etag = cached
+        cache_status = 'HIT'
+    
+    response = not_modified(request, etag) or HttpResponse(body, content_type='application/json')
+    response['X-Cache'] = cache_status
+    return set_validators(response, etag)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def available_food_cache_stats(request):
+    """Hit/miss counters of the available-food cache (Admin only)"""
+    if request.user.role != 'Admin':
+        return Response(
+            {'error': 'Only Admins can access this endpoint'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    return Response(get_feed_stats())
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def nearby_food(request):
+    """Get available food within a radius (km) of a point, nearest first"""
+    user = request.user
+    if ('lat' in request.query_params) != ('lng' in request.query_params):
+        return Response(
+            {'error': 'Pass both lat and lng, or neither'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        lat = float(request.query_params.get('lat', user.latitude))
+        lng = float(request.query_params.get('lng', user.longitude))
+    except (TypeError, ValueError):
+        return Response(
+            {'error': 'lat and lng are required (or set a location on your profile)'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        radius = float(request.query_params.get('radius', settings.NEARBY_DEFAULT_RADIUS_KM))
+    except ValueError:
+        return Response(
+            {'error': 'radius must be a number'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        limit = int(request.query_params.get('limit', 50))
+    except ValueError:
+        return Response(
+            {'error': 'limit must be an integer'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # float() accepts 'nan' and 'inf', which every comparison below would let through
+    if not all(map(math.isfinite, (lat, lng, radius))) or not (-90 <= lat <= 90 and -180 <= lng <= 180) or radius <= 0:
+        return Response(
+            {'error': 'Invalid coordinates or radius'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    radius = min(radius, settings.NEARBY_MAX_RADIUS_KM)
+    limit = max(1, min(limit, 200))
+    
+    # Index prefilters: geohash prefix ranges, then the exact bounding box.
+    # Near the antimeridian the box is split in two, one on each side.
+    min_lat, min_lng, max_lat, max_lng = bounding_box(lat, lng, radius)
+    box_filter = Q()
+    cell_filter = Q()
+    for range_min_lng, range_max_lng in longitude_ranges(min_lng, max_lng):
+        box_filter |= Q(longitude__range=(range_min_lng, range_max_lng))
+        cells = geohash_cover(min_lat, range_min_lng, max_lat, range_max_lng)
+        if not cells:
+            # Too large to cover; this side is only filtered by the box
+            cell_filter = None
+        elif cell_filter is not None:
+            for cell in cells:
+                cell_filter |= Q(geohash__gte=cell, geohash__lt=cell + GEOHASH_RANGE_END)
+    listings = FoodListing.objects.filter(
+        box_filter,
+        status='Available',
+        expiry_time__gt=timezone.now(),
+        latitude__range=(min_lat, max_lat),
+    )
+    if cell_filter is not None:
+        listings = listings.filter(cell_filter)
+    
+    # Exact distance ranking over the (small) candidate set
+    candidates = listings.values_list('id', 'latitude', 'longitude')
+    distances = {}
+    for listing_id, listing_lat, listing_lng in candidates.iterator():
+        distance = haversine_km(lat, lng, listing_lat, listing_lng)
+        if distance <= radius:
+            distances[listing_id] = distance
+    nearest = sorted(distances, key=distances.get)[:limit]
+    
+    listings = FoodListing.objects.filter(id__in=nearest).select_related('created_by').in_bulk()
+    data = []
+    for listing_id in nearest:
+        item = FoodListingSerializer(listings[listing_id]).data
+        item['distance_km'] = round(distances[listing_id], 3)
+        data.append(item)
+    
+    return Response({
+        'latitude': lat,
+        'longitude': lng,
+        'radius_km': radius,
+        'count': len(data),
+        'results': data,
+    })
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def recommended_food(request):
+    """
+    Available food recommended to the calling NGO, best match first.
+
+    Listings matched to the NGO come first (see food_listings/matching.py).
+    Other available listings, soonest expiry first, fill up the rest.
+    """
+    if request.user.role not in ['NGO/Volunteer', 'Admin']:
+        return Response(
+            {'error': 'Only NGOs/Volunteers can access this endpoint'}, 
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    try:
+        limit = max(1, min(int(request.query_params.get('limit', 20)), 100))
+    except ValueError:
+        return Response(
+            {'error': 'limit must be an integer'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    now = timezone.now()
+    matches = list(
+        ListingMatch.objects.filter(ngo=request.user, expiry_time__gt=now, listing__status='Available')
+        .select_related('listing__created_by').order_by('-priority')[:limit]
+    )
+    listings = [match.listing for match in matches]
+    if len(listings) < limit:
+        listings += FoodListing.objects.filter(
+            status='Available', expiry_time__gt=now
+        ).exclude(
+            id__in=[listing.id for listing in listings]
+        ).select_related('created_by').order_by('expiry_time')[:limit - len(listings)]
+    
+    data = FoodListingSerializer(listings, many=True).data
+    for index, item in enumerate(data):
+        match = matches[index] if index < len(matches) else None
+        item['match_score'] = round(match_score(match.priority, now), 3) if match else None
+        item['distance_km'] = round(match.distance_km, 3) if match and match.distance_km is not None else None
+    
+    return Response({
+        'count': len(data),
+        'matched': len(matches),
+        'results': data,
+    })
+
+class StreamParser(BaseParser):
+    """Hands the unread request body to the view, which parses it line by line"""
+    
+    def parse(self, stream, media_type=None, parser_context=None):
+        return stream
+
+class CSVStreamParser(StreamParser):
+    media_type = 'text/csv'
+
+class NDJSONStreamParser(StreamParser):
+    media_type = 'application/x-ndjson'
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated, IsFoodProviderOrAdmin])
+@parser_classes([MultiPartParser, CSVStreamParser, NDJSONStreamParser])
+def import_food(request):
+    """
+    Create many listings from a CSV or NDJSON file (see food_listings/imports.py).
+
+    Send the file as multipart `file`, or as the request body with a text/csv
+    or application/x-ndjson content type. ?type=csv|ndjson overrides the
+    format taken from the file name or content type.
+    """
+    upload = request.FILES.get('file') if request.content_type.startswith('multipart/') else None
+    if upload is not None:
+        stream = upload if upload.size else None
+        import_format = FORMAT_EXTENSIONS.get(os.path.splitext(upload.name)[1].lower())
+    elif request.content_type.startswith('multipart/'):
+        return Response(
+            {'error': 'Upload the listings as the multipart field "file"'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    else:
+        # An empty body parses to {} instead of reaching the stream parsers
+        stream = request.data or None
+        import_format = FORMAT_MEDIA_TYPES.get(request.content_type.split(';')[0].strip())
+    
+    import_format = request.query_params.get('type', import_format)
+    if import_format not in IMPORT_FORMATS:
+        return Response(
+            {'error': f"Unknown import format; use ?type= with one of: {', '.join(IMPORT_FORMATS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if stream is None:
+        return Response(
+            {'error': 'The import file is empty'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    result = import_listings(request.user, stream, import_format)
+    # Rows before an unreadable part are kept, so report them either way
+    response_status = status.HTTP_400_BAD_REQUEST if result['aborted'] and not result['created'] else status.HTTP_200_OK
+    return Response(result, status=response_status)
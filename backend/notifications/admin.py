@@ -0,0 +1,16 @@
+from django.contrib import admin
+from .models import NotificationEvent, OutboundEmail
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'recipient', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'created_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('recipient', 'subject')
+    ordering = ('-created_at',)
+    readonly_fields = ('created_at', 'updated_at', 'sent_at', 'last_error')
+
+@admin.register(NotificationEvent)
+class NotificationEventAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'recipient', 'food_request', 'created_at', 'digested_at')
+    list_filter = ('kind', 'digested_at')
+    ordering = ('-created_at',)
\ No newline at end of file
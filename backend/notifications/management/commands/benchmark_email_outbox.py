@@ -0,0 +1,68 @@
+import tempfile
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from notifications.models import OutboundEmail
+from notifications.utils import build_email, queue_email, queue_emails, send_queued_emails
+
+BACKENDS = {
+    'locmem': 'django.core.mail.backends.locmem.EmailBackend',
+    'file': 'django.core.mail.backends.filebased.EmailBackend',
+}
+
+class Command(BaseCommand):
+    help = 'Measure enqueue latency and outbox drain throughput (all rows are rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=2000)
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--backend', choices=sorted(BACKENDS), default='locmem')
+
+    def handle(self, *args, **options):
+        count = options['count']
+        html = '<p>' + 'Benchmark message body. ' * 40 + '</p>'
+
+        with tempfile.TemporaryDirectory() as tmpdir, transaction.atomic():
+            # Latency a view pays per notification: one render-free INSERT
+            start = time.perf_counter()
+            for i in range(min(count, 200)):
+                queue_email(f'bench{i}@example.com', 'Benchmark', html)
+            single = (time.perf_counter() - start) / min(count, 200)
+
+            remaining = count - min(count, 200)
+            start = time.perf_counter()
+            queue_emails([
+                build_email(f'bench{i}@example.com', 'Benchmark', html)
+                for i in range(remaining)
+            ])
+            bulk = (time.perf_counter() - start) / max(remaining, 1)
+
+            kwargs = {'file_path': tmpdir} if options['backend'] == 'file' else {}
+            connection = get_connection(BACKENDS[options['backend']], **kwargs)
+            connection.open()
+
+            total_sent = total_failed = batches = 0
+            start = time.perf_counter()
+            while True:
+                sent, failed = send_queued_emails(connection=connection, batch_size=options['batch_size'])
+                if not sent and not failed:
+                    break
+                total_sent += sent
+                total_failed += failed
+                batches += 1
+            elapsed = time.perf_counter() - start
+            connection.close()
+
+            pending = OutboundEmail.objects.filter(status='Pending').count()
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"Backend:              {options['backend']}")
+        self.stdout.write(f"Enqueue (single row): {single * 1000:.3f} ms/email")
+        self.stdout.write(f"Enqueue (bulk):       {bulk * 1000:.3f} ms/email")
+        self.stdout.write(f"Drained:              {total_sent} sent, {total_failed} failed in {batches} batches")
+        self.stdout.write(f"Drain time:           {elapsed:.3f} s")
+        self.stdout.write(f"Throughput:           {total_sent / elapsed if elapsed else 0:.0f} emails/s")
+        self.stdout.write(f"Left pending:         {pending}")
\ No newline at end of file
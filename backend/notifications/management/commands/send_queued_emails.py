@@ -0,0 +1,53 @@
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from notifications.utils import send_due_digests, send_queued_emails
+
+class Command(BaseCommand):
+    help = 'Queue due notification digests and drain the email outbox in batches over one reused mail connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.EMAIL_OUTBOX_BATCH_SIZE)
+        parser.add_argument('--interval', type=float, default=settings.EMAIL_OUTBOX_POLL_INTERVAL,
+                            help='Seconds to sleep when the outbox is empty')
+        parser.add_argument('--once', action='store_true',
+                            help='Drain everything that is currently due, then exit')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        connection = None
+
+        try:
+            while True:
+                digests = send_due_digests()
+                if digests:
+                    self.stdout.write(f"Queued {digests} digest emails")
+
+                if connection is None:
+                    connection = get_connection()
+                    connection.open()
+
+                sent, failed = send_queued_emails(connection=connection, batch_size=batch_size)
+                if sent or failed:
+                    self.stdout.write(f"Sent {sent} emails, {failed} failed")
+                    if failed:
+                        # A broken connection fails the whole batch; start fresh next time
+                        connection.close()
+                        connection = None
+                    continue
+
+                if options['once']:
+                    break
+
+                # Don't hold an idle SMTP session open while waiting for work
+                connection.close()
+                connection = None
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if connection is not None:
+                connection.close()
\ No newline at end of file
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('requests_app', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('food_request_created', 'Food request created')], max_length=50)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('digested_at', models.DateTimeField(blank=True, null=True)),
+                ('food_request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_events', to='requests_app.foodrequest')),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'notification_events',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['digested_at', 'recipient', 'created_at'], name='notif_event_pending_idx')],
+            },
+        ),
+    ]
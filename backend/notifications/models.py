@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+class OutboundEmail(models.Model):
+    STATUS_CHOICES = [
+        ('Pending', 'Pending'),
+        ('Sent', 'Sent'),
+        ('Failed', 'Failed'),
+    ]
+
+    recipient = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'email_outbox'
+        ordering = ['next_attempt_at', 'id']
+        indexes = [
+            # The worker only ever scans due, pending rows
+            models.Index(fields=['status', 'next_attempt_at'], name='email_outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.recipient} ({self.status})"
+
+class NotificationEvent(models.Model):
+    """A notification held back for a recipient's next digest email"""
+    KIND_CHOICES = [
+        ('food_request_created', 'Food request created'),
+    ]
+
+    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notification_events')
+    kind = models.CharField(max_length=50, choices=KIND_CHOICES)
+    food_request = models.ForeignKey('requests_app.FoodRequest', on_delete=models.CASCADE, related_name='notification_events')
+    created_at = models.DateTimeField(auto_now_add=True)
+    digested_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'notification_events'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['digested_at', 'recipient', 'created_at'], name='notif_event_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} for {self.recipient_id}"
\ No newline at end of file
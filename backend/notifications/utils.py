@@ -0,0 +1,169 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Min
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from .models import NotificationEvent, OutboundEmail
+
+def build_email(recipient, subject, html_message):
+    """Build an unsaved outbox row from a rendered HTML message"""
+    return OutboundEmail(
+        recipient=recipient,
+        subject=subject[:255],
+        body=strip_tags(html_message),
+        html_body=html_message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+    )
+
+def queue_email(recipient, subject, html_message):
+    """Store an email in the outbox; the worker delivers it later"""
+    email = build_email(recipient, subject, html_message)
+    email.save()
+    return email
+
+def queue_emails(emails):
+    """Store several unsaved outbox rows with a single INSERT"""
+    return OutboundEmail.objects.bulk_create(emails)
+
+def get_retry_delay(attempts):
+    """Exponential backoff: base, 2x base, 4x base, ... capped at one hour"""
+    delay = settings.EMAIL_OUTBOX_RETRY_BACKOFF * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(delay, 3600))
+
+def claim_due_emails(batch_size):
+    """
+    Lease a batch of due emails to this worker.
+
+    Claimed rows have their next_attempt_at pushed forward by the lease, so
+    other workers skip them and a crashed worker's batch is retried later.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(status='Pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if batch:
+            lease_until = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+            OutboundEmail.objects.filter(id__in=[email.id for email in batch]).update(
+                next_attempt_at=lease_until, updated_at=now
+            )
+    return batch
+
+def send_queued_emails(connection=None, batch_size=None):
+    """
+    Deliver one batch of due outbox emails over a single mail connection.
+
+    Returns a (sent, failed) tuple. Failed emails are rescheduled with
+    exponential backoff until EMAIL_OUTBOX_MAX_ATTEMPTS is reached.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    batch = claim_due_emails(batch_size)
+    if not batch:
+        return 0, 0
+
+    own_connection = connection is None
+    if own_connection:
+        connection = get_connection()
+    connection.open()
+
+    sent, failed = [], []
+    try:
+        for email in batch:
+            message = EmailMultiAlternatives(
+                subject=email.subject,
+                body=email.body,
+                from_email=email.from_email,
+                to=[email.recipient],
+                connection=connection,
+            )
+            if email.html_body:
+                message.attach_alternative(email.html_body, 'text/html')
+
+            email.attempts += 1
+            try:
+                connection.send_messages([message])
+                sent.append(email)
+            except Exception as e:
+                email.last_error = str(e)
+                failed.append(email)
+    finally:
+        if own_connection:
+            connection.close()
+
+    now = timezone.now()
+    for email in sent:
+        email.status = 'Sent'
+        email.sent_at = now
+        email.updated_at = now
+    for email in failed:
+        if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            email.status = 'Failed'
+        else:
+            email.next_attempt_at = now + get_retry_delay(email.attempts)
+        email.updated_at = now
+
+    OutboundEmail.objects.bulk_update(
+        batch,
+        ['status', 'attempts', 'last_error', 'next_attempt_at', 'sent_at', 'updated_at'],
+    )
+    return len(sent), len(failed)
+
+def record_digest_event(user, kind, food_request):
+    """Hold a notification back for the user's next digest instead of emailing now"""
+    return NotificationEvent.objects.create(recipient=user, kind=kind, food_request=food_request)
+
+def send_due_digests(now=None):
+    """
+    Render one summary email per recipient whose oldest pending event is older
+    than their digest window, and queue them in the outbox.
+
+    Returns the number of digests queued.
+    """
+    now = now or timezone.now()
+    pending = NotificationEvent.objects.filter(digested_at__isnull=True)
+
+    due_recipients = [
+        row['recipient']
+        for row in pending.values('recipient', 'recipient__notification_digest_minutes')
+        .annotate(oldest=Min('created_at'))
+        if row['oldest'] <= now - timedelta(minutes=row['recipient__notification_digest_minutes'])
+    ]
+    if not due_recipients:
+        return 0
+
+    events = list(
+        pending.filter(recipient__in=due_recipients, created_at__lte=now)
+        .select_related('recipient', 'food_request__food_item', 'food_request__requested_by')
+        .order_by('recipient', 'created_at')
+    )
+
+    grouped = {}
+    for event in events:
+        grouped.setdefault(event.recipient_id, []).append(event)
+
+    emails = []
+    for recipient_events in grouped.values():
+        user = recipient_events[0].recipient
+        requests = [event.food_request for event in recipient_events]
+        html_message = render_to_string('emails/food_request_digest.html', {
+            'user': user,
+            'requests': requests,
+        })
+        emails.append(build_email(
+            user.email,
+            f'{len(requests)} New Food Request{"s" if len(requests) != 1 else ""}',
+            html_message,
+        ))
+
+    with transaction.atomic():
+        queue_emails(emails)
+        NotificationEvent.objects.filter(id__in=[event.id for event in events]).update(digested_at=now)
+
+    return len(emails)
\ No newline at end of file
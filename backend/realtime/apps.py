@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+class RealtimeConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'realtime'
+
+    def ready(self):
+        from . import signals  # noqa: F401
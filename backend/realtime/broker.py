@@ -0,0 +1,196 @@
+"""
+Publish/subscribe for realtime events.
+
+publish() takes a list of event dicts and hands it to every subscriber that
+accepts it. The broker class is settings.REALTIME_BROKER:
+
+- InProcessBroker (default) delivers within the current process only. It is
+  enough for one ASGI worker, or for runserver.
+- PostgresNotifyBroker relays events through PostgreSQL LISTEN/NOTIFY, so
+  every worker's subscribers see every worker's events. One listener thread
+  per process holds one extra database connection.
+
+Any replacement (Redis and so on) needs to implement publish(events) and
+deliver received events with InProcessBroker.deliver().
+
+Subscribers are either async (they pass their event loop and read from an
+asyncio.Queue) or sync (they read from a queue.Queue). Publishing never
+blocks on a subscriber. For each event loop, delivery costs one
+call_soon_threadsafe per batch, and the fan-out then runs inside that loop.
+A subscriber whose queue fills up is marked overflowed and should resync.
+"""
+import asyncio
+import json
+import logging
+import queue
+import select
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+class Subscription:
+    def __init__(self, broker, accepts, loop=None):
+        self.broker = broker
+        self.accepts = accepts
+        self.loop = loop
+        self.queue = asyncio.Queue(settings.REALTIME_QUEUE_SIZE) if loop else queue.Queue(settings.REALTIME_QUEUE_SIZE)
+        self.overflowed = False
+
+    def put(self, events):
+        """Queue the accepted events; runs in the subscriber's loop for async subscribers"""
+        for event in events:
+            if not self.accepts(event):
+                continue
+            try:
+                self.queue.put_nowait(event)
+            except (asyncio.QueueFull, queue.Full):
+                self.overflowed = True
+                return
+
+    async def aget(self, timeout):
+        """Next event, or None after `timeout` seconds"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def get(self, timeout):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+class InProcessBroker:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sync_subscribers = set()
+        self.async_subscribers = defaultdict(set)  # {loop: {subscription}}
+
+    def subscribe(self, accepts, loop=None):
+        subscription = Subscription(self, accepts, loop)
+        with self.lock:
+            if loop is None:
+                self.sync_subscribers.add(subscription)
+            else:
+                self.async_subscribers[loop].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            if subscription.loop is None:
+                self.sync_subscribers.discard(subscription)
+            else:
+                subscribers = self.async_subscribers.get(subscription.loop)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self.async_subscribers[subscription.loop]
+
+    @property
+    def subscriber_count(self):
+        return len(self.sync_subscribers) + sum(len(subs) for subs in self.async_subscribers.values())
+
+    def publish(self, events):
+        self.deliver(events)
+
+    def deliver(self, events):
+        """Hand `events` to this process's subscribers"""
+        if not events:
+            return
+        with self.lock:
+            sync_subscribers = list(self.sync_subscribers)
+            loops = [(loop, list(subs)) for loop, subs in self.async_subscribers.items()]
+        for subscription in sync_subscribers:
+            subscription.put(events)
+        for loop, subscribers in loops:
+            try:
+                loop.call_soon_threadsafe(_fan_out, subscribers, events)
+            except RuntimeError:
+                # The loop has been closed; its subscribers are gone
+                with self.lock:
+                    self.async_subscribers.pop(loop, None)
+
+def _fan_out(subscribers, events):
+    for subscription in subscribers:
+        subscription.put(events)
+
+class PostgresNotifyBroker(InProcessBroker):
+    """Relay events between processes with NOTIFY; a listener thread delivers them locally"""
+
+    channel = 'sharebite_realtime'
+    max_payload = 7000  # PostgreSQL's NOTIFY limit is 8000 bytes
+
+    def __init__(self):
+        super().__init__()
+        self.listener = None
+
+    def subscribe(self, accepts, loop=None):
+        self.ensure_listening()
+        return super().subscribe(accepts, loop)
+
+    def publish(self, events):
+        with connections['default'].cursor() as cursor:
+            for payload in self.payloads(events):
+                cursor.execute('SELECT pg_notify(%s, %s)', [self.channel, payload])
+
+    def payloads(self, events):
+        """Split events into JSON arrays that fit in one notification each"""
+        batch, size = [], 2
+        for event in events:
+            encoded = json.dumps(event, separators=(',', ':'))
+            if batch and size + len(encoded) + 1 > self.max_payload:
+                yield '[' + ','.join(batch) + ']'
+                batch, size = [], 2
+            batch.append(encoded)
+            size += len(encoded) + 1
+        if batch:
+            yield '[' + ','.join(batch) + ']'
+
+    def ensure_listening(self):
+        with self.lock:
+            if self.listener is None or not self.listener.is_alive():
+                self.listener = threading.Thread(target=self.listen, name='realtime-listener', daemon=True)
+                self.listener.start()
+
+    def listen(self):
+        wrapper = connections['default']
+        while True:
+            conn = None
+            try:
+                conn = wrapper.get_new_connection(wrapper.get_connection_params())
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN {self.channel}')
+                while True:
+                    if select.select([conn], [], [], 30) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notification = conn.notifies.pop(0)
+                        self.deliver(json.loads(notification.payload))
+            except Exception:
+                logger.exception('Realtime listener lost its connection; reconnecting')
+                time.sleep(1)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+_broker = None
+_broker_lock = threading.Lock()
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.REALTIME_BROKER)()
+    return _broker
@@ -0,0 +1,59 @@
+"""
+Listing and request events, and who may see them.
+
+Every change is recorded as a ChangeLogEntry in the changing transaction.
+Creates, status changes and deletes are also published as events once it
+commits. Events are small dicts carrying the ids and statuses needed to decide
+visibility without touching the database; clients refetch details, or call
+/api/realtime/sync/?since=<cursor>, if they need them:
+
+    {'type': 'listing.status_changed', 'cursor': 41, 'listing_id': 7,
+     'provider_id': 3, 'old_status': 'Available', 'status': 'Requested', 'at': '...'}
+    {'type': 'request.created', 'cursor': 42, 'request_id': 12, 'listing_id': 7,
+     'requester_id': 9, 'provider_id': 3, 'old_status': None,
+     'status': 'Pending', 'at': '...'}
+
+Types are <kind>.created, <kind>.status_changed and <kind>.deleted, for
+kinds listing and request.
+
+Visibility follows food_listings.permissions.visible_listings and
+requests_app.permissions.visible_requests.
+"""
+from django.db import transaction
+
+from .broker import get_broker
+from .models import ChangeLogEntry
+
+# Actions pushed to event streams; plain field updates only reach sync
+PUBLISHED_ACTIONS = ('created', 'status_changed', 'deleted')
+
+def can_see(user_id, role, event):
+    """Whether a caller with `user_id` and `role` may receive `event`"""
+    if event['type'].startswith('listing.'):
+        if role == 'FoodProvider':
+            return event['provider_id'] == user_id
+        if role == 'NGO/Volunteer':
+            # Listings entering or leaving the Available set NGOs see
+            return 'Available' in (event['old_status'], event['status'])
+        return True
+    if role == 'NGO/Volunteer':
+        return event['requester_id'] == user_id
+    if role == 'FoodProvider':
+        return event['provider_id'] == user_id
+    return True
+
+def action_for(old_status, new_status):
+    if old_status is None:
+        return 'created'
+    if new_status is None:
+        return 'deleted'
+    return 'status_changed' if old_status != new_status else 'updated'
+
+def record_changes(entries):
+    """Write unsaved ChangeLogEntry objects and publish their events on commit"""
+    if not entries:
+        return
+    entries = ChangeLogEntry.objects.bulk_create(entries)
+    events = [entry.as_event() for entry in entries if entry.action in PUBLISHED_ACTIONS]
+    if events:
+        transaction.on_commit(lambda: get_broker().publish(events))
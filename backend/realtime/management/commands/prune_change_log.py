@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from realtime.models import ChangeLogEntry, ChangeLogPruned
+
+class Command(BaseCommand):
+    help = 'Delete change log entries older than CHANGE_LOG_RETENTION_DAYS, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.CHANGE_LOG_RETENTION_DAYS)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        # Prune a prefix of ids, so the oldest remaining id tells sync which cursors expired
+        last_id = (
+            ChangeLogEntry.objects.filter(created_at__lt=cutoff)
+            .order_by('-created_at').values_list('id', flat=True).first()
+        )
+        pruned = 0
+        while last_id is not None:
+            ids = list(
+                ChangeLogEntry.objects.filter(id__lte=last_id).order_by('id')
+                .values_list('id', flat=True)[:options['batch_size']]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                pruned += ChangeLogEntry.objects.filter(id__in=ids).delete()[0]
+                # Cursors below this have expired even once the log is empty
+                ChangeLogPruned.objects.update_or_create(pk=1, defaults={'last_id': ids[-1]})
+        self.stdout.write(self.style.SUCCESS(f"Pruned {pruned} change log entries"))
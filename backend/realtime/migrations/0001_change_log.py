@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('listing', 'Listing'), ('request', 'Request')], max_length=10)),
+                ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('status_changed', 'Status changed'), ('deleted', 'Deleted')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('listing_id', models.BigIntegerField()),
+                ('provider_id', models.BigIntegerField(blank=True, null=True)),
+                ('requester_id', models.BigIntegerField(blank=True, null=True)),
+                ('old_status', models.CharField(blank=True, max_length=20, null=True)),
+                ('status', models.CharField(blank=True, max_length=20, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'db_table': 'change_log',
+                'indexes': [models.Index(fields=['provider_id', 'id'], name='change_log_provider_idx'), models.Index(fields=['requester_id', 'id'], name='change_log_requester_idx'), models.Index(condition=models.Q(('kind', 'listing'), models.Q(('status', 'Available'), ('old_status', 'Available'), _connector='OR')), fields=['id'], name='change_log_available_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('realtime', '0001_change_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogPruned',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('pruned_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'change_log_pruned',
+            },
+        ),
+    ]
@@ -0,0 +1,84 @@
+from django.db import models
+from django.db.models import Q
+
+class ChangeLogEntry(models.Model):
+    """
+    One row per listing or request change, written in the changing transaction.
+
+    The auto-incrementing id is the sync cursor (GET /api/realtime/sync/?since=)
+    and the id of the matching realtime event. Ids and statuses are copied
+    rather than referenced, so entries outlive the objects they describe
+    (deletes are tombstones).
+    """
+    KIND_CHOICES = [
+        ('listing', 'Listing'),
+        ('request', 'Request'),
+    ]
+    ACTION_CHOICES = [
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('status_changed', 'Status changed'),
+        ('deleted', 'Deleted'),
+    ]
+    
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    object_id = models.BigIntegerField()
+    listing_id = models.BigIntegerField()  # the listing itself, or the request's listing
+    provider_id = models.BigIntegerField(null=True, blank=True)
+    requester_id = models.BigIntegerField(null=True, blank=True)
+    old_status = models.CharField(max_length=20, null=True, blank=True)
+    status = models.CharField(max_length=20, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        db_table = 'change_log'
+        indexes = [
+            # Sync scans per role: a provider's changes, a requester's requests,
+            # and listings entering or leaving the Available set (NGOs)
+            models.Index(fields=['provider_id', 'id'], name='change_log_provider_idx'),
+            models.Index(fields=['requester_id', 'id'], name='change_log_requester_idx'),
+            models.Index(
+                fields=['id'],
+                condition=Q(kind='listing') & (Q(status='Available') | Q(old_status='Available')),
+                name='change_log_available_idx',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"#{self.id} {self.kind} {self.object_id} {self.action}"
+    
+    def as_event(self):
+        """The realtime event for this change (see realtime.events)"""
+        event = {
+            'type': f'{self.kind}.{self.action}',
+            'cursor': self.id,
+            'listing_id': self.listing_id,
+            'provider_id': self.provider_id,
+            'old_status': self.old_status,
+            'status': self.status,
+            'at': self.created_at.isoformat(),
+        }
+        if self.kind == 'request':
+            event.update(request_id=self.object_id, requester_id=self.requester_id)
+        return event
+
+class ChangeLogPruned(models.Model):
+    """
+    Single row: the highest change log id deleted by prune_change_log.
+
+    Once pruning empties the log, no row is left to show which cursors are
+    too old; sync compares them against this instead.
+    """
+    last_id = models.BigIntegerField(default=0)
+    pruned_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'change_log_pruned'
+    
+    def __str__(self):
+        return f"pruned through #{self.last_id}"
+    
+    @classmethod
+    def last_pruned_id(cls):
+        return cls.objects.filter(pk=1).values_list('last_id', flat=True).first() or 0
@@ -0,0 +1,8 @@
+from food_donation.query_budgets import QueryBudget
+
+QUERY_BUDGETS = [
+    QueryBudget('sync_cursor', 'GET', '/api/realtime/sync/', 'NGO/Volunteer', 3),
+    QueryBudget('sync_admin', 'GET', '/api/realtime/sync/?since=0', 'Admin', 9),
+    QueryBudget('sync_provider', 'GET', '/api/realtime/sync/?since=0', 'FoodProvider', 9),
+    QueryBudget('sync_ngo', 'GET', '/api/realtime/sync/?since=0', 'NGO/Volunteer', 9),
+]
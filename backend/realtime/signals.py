@@ -0,0 +1,64 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from food_listings.models import FoodListing
+from food_listings.signals import listings_bulk_changed
+from requests_app.models import FoodRequest
+from requests_app.signals import requests_bulk_changed
+from .events import action_for, record_changes
+from .models import ChangeLogEntry
+
+def listing_entry(listing_id, provider_id, old_status, new_status):
+    return ChangeLogEntry(
+        kind='listing', action=action_for(old_status, new_status), object_id=listing_id,
+        listing_id=listing_id, provider_id=provider_id, old_status=old_status, status=new_status,
+    )
+
+def request_entry(request_id, listing_id, requester_id, provider_id, old_status, new_status):
+    return ChangeLogEntry(
+        kind='request', action=action_for(old_status, new_status), object_id=request_id,
+        listing_id=listing_id, provider_id=provider_id, requester_id=requester_id,
+        old_status=old_status, status=new_status,
+    )
+
+@receiver(post_save, sender=FoodListing)
+def log_saved_listing(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_status = None if created else getattr(instance, '_loaded_values', {}).get('status', instance.status)
+    record_changes([listing_entry(instance.id, instance.created_by_id, old_status, instance.status)])
+
+@receiver(post_delete, sender=FoodListing)
+def log_deleted_listing(sender, instance, **kwargs):
+    status = getattr(instance, '_loaded_values', {}).get('status', instance.status)
+    record_changes([listing_entry(instance.id, instance.created_by_id, status, None)])
+
+@receiver(listings_bulk_changed)
+def log_bulk_listing_changes(sender, changes, **kwargs):
+    record_changes([listing_entry(*change) for change in changes])
+
+@receiver(post_save, sender=FoodRequest)
+def log_saved_request(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_status = None if created else getattr(instance, '_loaded_values', {}).get('status', instance.status)
+    record_changes([request_entry(
+        instance.id, instance.food_item_id, instance.requested_by_id, instance.food_item.created_by_id,
+        old_status, instance.status,
+    )])
+
+@receiver(post_delete, sender=FoodRequest)
+def log_deleted_request(sender, instance, **kwargs):
+    if FoodRequest._meta.get_field('food_item').is_cached(instance):
+        provider_id = instance.food_item.created_by_id
+    else:
+        # Cascades delete requests before their listing, so the row is still there
+        provider_id = FoodListing.objects.filter(id=instance.food_item_id).values_list('created_by_id', flat=True).first()
+    status = getattr(instance, '_loaded_values', {}).get('status', instance.status)
+    record_changes([request_entry(
+        instance.id, instance.food_item_id, instance.requested_by_id, provider_id, status, None,
+    )])
+
+@receiver(requests_bulk_changed)
+def log_bulk_request_changes(sender, changes, **kwargs):
+    record_changes([request_entry(*change) for change in changes])
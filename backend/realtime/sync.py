@@ -0,0 +1,115 @@
+"""
+Delta sync: listings and requests changed since a cursor.
+
+The cursor is a ChangeLogEntry id. A sync reads the caller's visible entries
+after the cursor through the change log's indexes, then loads the current
+state of the objects they mention through the list views' visibility rules.
+Changed objects the caller can still see come back in full. The rest are
+tombstones: deleted, or no longer visible, like a listing leaving Available
+for an NGO. The cost depends on the number of changes, not the table size.
+
+Ids are allocated when a row is inserted, but transactions commit in any
+order. So the cursor handed back only advances past entries older than
+REALTIME_SYNC_SETTLE_SECONDS. Newer entries are returned, and returned again
+on the next call. Delivery is at least once; applying the same change twice
+is harmless.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from food_donation.compiled_serializers import compile_serializer
+from food_listings.models import FoodListing
+from food_listings.permissions import visible_listings
+from food_listings.serializers import FoodListingSerializer
+from requests_app.models import FoodRequest
+from requests_app.permissions import visible_requests
+from requests_app.serializers import FoodRequestSerializer
+from .models import ChangeLogEntry, ChangeLogPruned
+
+class CursorExpired(Exception):
+    """The entries after the cursor have been pruned; the client must reload"""
+
+def _latest_settled_id():
+    cutoff = timezone.now() - timedelta(seconds=settings.REALTIME_SYNC_SETTLE_SECONDS)
+    return (
+        ChangeLogEntry.objects.filter(created_at__lte=cutoff)
+        .order_by('-created_at').values_list('id', flat=True).first()
+    )
+
+def settled_cursor():
+    """The newest cursor that no in-flight transaction can still slip in behind"""
+    # With nothing settled (e.g. a fully pruned log), start after the pruned ids
+    return _latest_settled_id() or ChangeLogPruned.last_pruned_id()
+
+def visible_entries(user):
+    """Change log entries that may affect what `user` sees (see realtime.events.can_see)"""
+    entries = ChangeLogEntry.objects.all()
+    if user.role == 'FoodProvider':
+        return entries.filter(provider_id=user.id)
+    if user.role == 'NGO/Volunteer':
+        return entries.filter(
+            Q(kind='listing') & (Q(status='Available') | Q(old_status='Available'))
+            | Q(kind='request', requester_id=user.id)
+        )
+    return entries
+
+def serialize(serializer_class, queryset, related):
+    if settings.FAST_SERIALIZERS_ENABLED:
+        compiled = compile_serializer(serializer_class)
+        return compiled.serialize(compiled.values(queryset))
+    return serializer_class(queryset.select_related(*related), many=True).data
+
+def sync_changes(user, since, limit):
+    """
+    Changes after cursor `since`, at most `limit` entries' worth:
+    {'cursor', 'has_more', 'listings', 'requests', 'deleted': {'listings', 'requests'}}
+    """
+    oldest = ChangeLogEntry.objects.order_by('id').values_list('id', flat=True).first()
+    # The log is pruned by id prefix, so the oldest remaining entry shows which
+    # cursors lost entries; an empty log has the last pruned id on record
+    if oldest is not None and since + 1 < oldest:
+        raise CursorExpired(since)
+    if oldest is None and since < ChangeLogPruned.last_pruned_id():
+        raise CursorExpired(since)
+    # `since` is at least the last pruned id here, so the cursor never falls behind it
+    watermark = _latest_settled_id() or 0
+
+    entries = list(
+        visible_entries(user).filter(id__gt=since).order_by('id')
+        .values_list('id', 'kind', 'object_id')[:limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    cursor = max(since, min(entries[-1][0], watermark) if has_more else watermark)
+
+    changed = {'listing': set(), 'request': set()}
+    for _entry_id, kind, object_id in entries:
+        changed[kind].add(object_id)
+
+    listings = requests = []
+    if changed['listing']:
+        listings = serialize(
+            FoodListingSerializer,
+            visible_listings(user, FoodListing.objects.filter(id__in=changed['listing'])).order_by('id'),
+            ['created_by'],
+        )
+    if changed['request']:
+        requests = serialize(
+            FoodRequestSerializer,
+            visible_requests(user, FoodRequest.objects.filter(id__in=changed['request'])).order_by('id'),
+            ['food_item', 'food_item__created_by', 'requested_by'],
+        )
+
+    return {
+        'cursor': cursor,
+        'has_more': has_more and cursor > since,
+        'listings': listings,
+        'requests': requests,
+        'deleted': {
+            'listings': sorted(changed['listing'] - {item['id'] for item in listings}),
+            'requests': sorted(changed['request'] - {item['id'] for item in requests}),
+        },
+    }
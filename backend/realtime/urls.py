@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('events/', views.event_stream, name='event_stream'),
+    path('sync/', views.sync, name='sync'),
+]
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connection
+from django.http import StreamingHttpResponse
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.response import Response
+
+from accounts.authentication import QueryParameterJWTAuthentication
+from .broker import get_broker
+from .events import can_see
+from .sync import CursorExpired, settled_cursor, sync_changes
+
+def format_event(event):
+    # The id is a sync cursor: after a resync, /sync/?since=<id> fills the gap
+    return f"id: {event['cursor']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n".encode()
+
+HEARTBEAT = b': keepalive\n\n'
+RESYNC = b'event: resync\ndata: {}\n\n'
+
+def stream_deadline(token):
+    """Streams end when the access token expires, or after REALTIME_STREAM_MAX_SECONDS"""
+    deadline = time.time() + settings.REALTIME_STREAM_MAX_SECONDS
+    if token is not None and 'exp' in token:
+        deadline = min(deadline, token['exp'])
+    return deadline
+
+async def async_event_stream(accepts, deadline):
+    """Under ASGI: an idle connection is a coroutine waiting on its queue"""
+    subscription = get_broker().subscribe(accepts, asyncio.get_running_loop())
+    try:
+        yield f'retry: {settings.REALTIME_RETRY_MS}\n\n'.encode()
+        while (remaining := deadline - time.time()) > 0:
+            event = await subscription.aget(min(settings.REALTIME_HEARTBEAT_SECONDS, remaining))
+            if subscription.overflowed:
+                yield RESYNC
+                return
+            yield HEARTBEAT if event is None else format_event(event)
+    finally:
+        subscription.close()
+
+def sync_event_stream(accepts, deadline):
+    """Under WSGI (runserver): each open stream holds a thread"""
+    subscription = get_broker().subscribe(accepts)
+    try:
+        yield f'retry: {settings.REALTIME_RETRY_MS}\n\n'.encode()
+        while (remaining := deadline - time.time()) > 0:
+            event = subscription.get(min(settings.REALTIME_HEARTBEAT_SECONDS, remaining))
+            if subscription.overflowed:
+                yield RESYNC
+                return
+            yield HEARTBEAT if event is None else format_event(event)
+    finally:
+        subscription.close()
+
+@api_view(['GET'])
+@authentication_classes([QueryParameterJWTAuthentication])
+@permission_classes([permissions.IsAuthenticated])
+def event_stream(request):
+    """
+    Server-Sent Events: listing and request changes the caller can see.
+
+    Browsers connect with `new EventSource('/api/realtime/events/?token=<access>')`
+    and reconnect on their own when the stream ends.
+    """
+    accepts = partial(can_see, request.user.id, request.user.role)
+    deadline = stream_deadline(request.auth)
+
+    # The stream needs no queries; don't keep a database connection open for it
+    if not connection.in_atomic_block:
+        connection.close()
+
+    if isinstance(request._request, ASGIRequest):
+        stream = async_event_stream(accepts, deadline)
+    else:
+        stream = sync_event_stream(accepts, deadline)
+    response = StreamingHttpResponse(stream, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # no proxy buffering
+    return response
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def sync(request):
+    """
+    Listings and requests changed since a cursor, plus ids of the ones that
+    were deleted or are no longer visible to the caller.
+
+    Without ?since=, returns only the current cursor: take it, load the full
+    lists, then call ?since=<cursor> to catch up. Repeat while has_more.
+    A 410 means the cursor is older than the change log; reload and start over.
+    """
+    since = request.query_params.get('since')
+    if since is None:
+        return Response({'cursor': settled_cursor()})
+
+    try:
+        since = int(since)
+        limit = int(request.query_params.get('limit', settings.REALTIME_SYNC_PAGE_SIZE))
+    except ValueError:
+        return Response(
+            {'error': 'since and limit must be integers'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if since < 0 or limit < 1:
+        return Response(
+            {'error': 'since must be 0 or more and limit 1 or more'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        changes = sync_changes(request.user, since, min(limit, settings.REALTIME_SYNC_PAGE_SIZE))
+    except CursorExpired:
+        return Response(
+            {'error': 'Cursor has expired; reload and sync from a new cursor', 'code': 'resync'},
+            status=status.HTTP_410_GONE
+        )
+    return Response(changes)
@@ -0,0 +1,65 @@
+"""
+Race-free claiming of food listings.
+
+A claim is a conditional UPDATE (status 'Available' -> 'Requested' only while
+the listing is still available and unexpired) followed by the request INSERT,
+in one transaction. Concurrent claimants serialize on the listing row, so
+exactly one wins; everyone else gets a ClaimConflict with a stable code. The
+(food_item, requested_by) unique constraint rejects duplicates, so nothing is
+checked up front and a successful claim costs a fixed handful of queries.
+"""
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from food_listings.models import FoodListing
+from food_listings.signals import listings_bulk_changed
+from .models import FoodRequest
+
+class ClaimConflict(Exception):
+    """A claim that lost: `code` is one of CONFLICT_MESSAGES"""
+
+    def __init__(self, code):
+        self.code = code
+        super().__init__(CONFLICT_MESSAGES[code])
+
+class ListingNotFound(Exception):
+    pass
+
+CONFLICT_MESSAGES = {
+    'duplicate_request': 'You have already requested this food item',
+    'listing_expired': 'This food item has expired',
+    'listing_unavailable': 'This food item is no longer available',
+}
+
+def claim_listing(listing_id, user, message=None):
+    """Create `user`'s request for a listing and mark the listing Requested, or raise"""
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            claimed = FoodListing.objects.filter(
+                id=listing_id, status='Available', expiry_time__gt=now
+            ).update(status='Requested', updated_at=now)
+            if claimed:
+                # The listing row is locked by our UPDATE; read it back for counters, signals and emails
+                listing = FoodListing.objects.select_related('created_by').get(id=listing_id)
+                request_obj = FoodRequest.objects.create(food_item=listing, requested_by=user, message=message)
+                listings_bulk_changed.send(
+                    sender=FoodListing, changes=[(listing_id, listing.created_by_id, 'Available', 'Requested')]
+                )
+                return request_obj
+    except IntegrityError:
+        # unique (food_item, requested_by): the whole claim was rolled back
+        raise ClaimConflict('duplicate_request')
+
+    raise _diagnose(listing_id, user, now)
+
+def _diagnose(listing_id, user, now):
+    """Explain a lost claim (only runs on the conflict path)"""
+    listing = FoodListing.objects.filter(id=listing_id).values('status', 'expiry_time').first()
+    if listing is None:
+        return ListingNotFound(listing_id)
+    if FoodRequest.objects.filter(food_item_id=listing_id, requested_by=user).exists():
+        return ClaimConflict('duplicate_request')
+    if listing['status'] == 'Expired' or (listing['status'] == 'Available' and listing['expiry_time'] <= now):
+        return ClaimConflict('listing_expired')
+    return ClaimConflict('listing_unavailable')
@@ -0,0 +1,93 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from food_donation.compiled_serializers import compile_serializer
+from food_listings.models import FoodListing
+from food_listings.serializers import FoodListingSerializer
+from requests_app.models import FoodRequest
+from requests_app.serializers import FoodRequestSerializer
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    help = 'Compare DRF and compiled serializers on list payloads (all rows are rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000)
+        parser.add_argument('--providers', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(options['rows'], options['providers'])
+            renderer = JSONRenderer()
+
+            cases = [
+                ('available listings', FoodListingSerializer,
+                 FoodListing.objects.filter(status='Requested').select_related('created_by').order_by('expiry_time')),
+                ('food requests', FoodRequestSerializer,
+                 FoodRequest.objects.select_related('food_item', 'requested_by', 'food_item__created_by')),
+            ]
+            self.stdout.write(f"{'payload':<22}{'rows':>8}{'DRF rows/s':>14}{'compiled rows/s':>18}{'speedup':>10}")
+            for label, serializer_class, queryset in cases:
+                compiled = compile_serializer(serializer_class)
+
+                drf_time, drf_body = self.measure(
+                    lambda: renderer.render(serializer_class(queryset.all(), many=True).data), options['repeat']
+                )
+                fast_time, fast_body = self.measure(
+                    lambda: renderer.render(compiled.serialize(compiled.values(queryset.all()))), options['repeat']
+                )
+                if drf_body != fast_body:
+                    raise CommandError(f"Compiled output for {label} differs from DRF")
+
+                rows = queryset.count()
+                self.stdout.write(
+                    f"{label:<22}{rows:>8}{rows / drf_time:>14,.0f}{rows / fast_time:>18,.0f}"
+                    f"{drf_time / fast_time:>9.1f}x"
+                )
+            transaction.set_rollback(True)
+        self.stdout.write(self.style.SUCCESS('Outputs are byte-for-byte identical'))
+
+    def measure(self, render, repeat):
+        best, body = None, None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            body = render()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, body
+
+    def seed(self, rows, provider_count):
+        rng = random.Random(rows)
+        now = timezone.now()
+        providers = [
+            User.objects.create_user(
+                username=f'serializer-bench-p{i}', email=f'serializer-bench-p{i}@example.com', password=None,
+                full_name=f'Provider {i}', role='FoodProvider', organization='Bench Foods',
+            )
+            for i in range(provider_count)
+        ]
+        ngo = User.objects.create_user(
+            username='serializer-bench-ngo', email='serializer-bench-ngo@example.com', password=None,
+            full_name='Bench NGO', role='NGO/Volunteer',
+        )
+        listings = FoodListing.objects.bulk_create([
+            FoodListing(
+                title=f'Listing {i}', description='Benchmark listing ' * 5, quantity=rng.randint(1, 50),
+                location='Bench Street', expiry_time=now + timedelta(hours=rng.randint(-12, 72)),
+                status='Requested', created_by=rng.choice(providers),
+            )
+            for i in range(rows)
+        ])
+        FoodRequest.objects.bulk_create([
+            FoodRequest(food_item=listing, requested_by=ngo, message='Please')
+            for listing in listings
+        ])
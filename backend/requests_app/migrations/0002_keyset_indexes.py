@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('requests_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='foodrequest',
+            index=models.Index(fields=['-created_at', '-id'], name='food_request_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='foodrequest',
+            index=models.Index(fields=['requested_by', '-created_at', '-id'], name='food_request_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('requests_app', '0002_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='foodrequest',
+            index=models.Index(condition=models.Q(('status', 'Pending')), fields=['food_item'], name='food_request_pending_idx'),
+        ),
+    ]
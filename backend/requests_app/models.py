@@ -23,6 +23,35 @@ class FoodRequest(models.Model):
         db_table = 'food_requests'
         ordering = ['-created_at']
         unique_together = ['food_item', 'requested_by']  # Prevent duplicate requests
+        indexes = [
+            # Keyset pagination, globally and for requesters
+            models.Index(fields=['-created_at', '-id'], name='food_request_created_idx'),
+            models.Index(fields=['requested_by', '-created_at', '-id'], name='food_request_user_created_idx'),
+            # "Other pending requests for this listing?" checks in status transitions
+            models.Index(
+                fields=['food_item'], condition=models.Q(status='Pending'), name='food_request_pending_idx'
+            ),
+        ]
     
     def __str__(self):
-        return f"Request for {self.food_item.title} by {self.requested_by.full_name}"
\ No newline at end of file
+        return f"Request for {self.food_item.title} by {self.requested_by.full_name}"
+    
+    # Loaded values remembered so signal handlers can tell what changed
+    TRACKED_FIELDS = ('status',)
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            field: instance.__dict__[field] for field in cls.TRACKED_FIELDS if field in instance.__dict__
+        }
+        return instance
+    
+    def has_changed(self, field):
+        """True for unsaved instances or if a tracked field differs from the database"""
+        loaded = getattr(self, '_loaded_values', {})
+        return field not in loaded or loaded[field] != getattr(self, field)
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_values = {field: getattr(self, field) for field in self.TRACKED_FIELDS}
\ No newline at end of file
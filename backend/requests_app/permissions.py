@@ -16,11 +16,22 @@ class IsRequesterOrFoodProviderOrAdmin(permissions.BasePermission):
             return True
         
         # Requesters can view their own requests
-        if obj.requested_by == user:
+        if obj.requested_by_id == user.id:
             return request.method in permissions.SAFE_METHODS
         
         # Food providers can view/update requests for their food items
-        if obj.food_item.created_by == user:
+        if obj.food_item.created_by_id == user.id:
             return True
         
-        return False
\ No newline at end of file
+        return False
+
+def visible_requests(user, queryset):
+    """The requests `user` sees in list views and sync"""
+    if user.role == 'NGO/Volunteer':
+        # NGOs see only their own requests
+        return queryset.filter(requested_by=user)
+    if user.role == 'FoodProvider':
+        # Food providers see requests for their food items
+        return queryset.filter(food_item__created_by=user)
+    # Admins see all requests
+    return queryset
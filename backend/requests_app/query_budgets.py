@@ -0,0 +1,21 @@
+from food_donation.query_budgets import QueryBudget
+
+QUERY_BUDGETS = [
+    QueryBudget('food_request_list_admin', 'GET', '/api/requests/', 'Admin', 6),
+    QueryBudget('food_request_list_provider', 'GET', '/api/requests/', 'FoodProvider', 6),
+    QueryBudget('food_request_list_ngo', 'GET', '/api/requests/', 'NGO/Volunteer', 6),
+    QueryBudget('food_request_create', 'POST', '/api/requests/', 'NGO/Volunteer', 17,
+                data={'food_item': '{listing}', 'message': 'We can collect today'}),
+    QueryBudget('food_request_detail_requester', 'GET', '/api/requests/{request}/', 'NGO/Volunteer', 2),
+    QueryBudget('food_request_detail_provider', 'GET', '/api/requests/{request}/', 'FoodProvider', 2),
+    QueryBudget('food_request_approve', 'PATCH', '/api/requests/{request}/', 'FoodProvider', 15,
+                data={'status': 'Approved'}),
+    QueryBudget('my_requests', 'GET', '/api/requests/my-requests/', 'NGO/Volunteer', 3),
+    QueryBudget('my_requests_stream', 'GET', '/api/requests/my-requests/?stream=1', 'NGO/Volunteer', 3),
+    QueryBudget('requests_for_my_food', 'GET', '/api/requests/for-my-food/', 'FoodProvider', 3),
+    QueryBudget('requests_for_my_food_stream', 'GET', '/api/requests/for-my-food/?stream=1', 'FoodProvider', 3),
+    QueryBudget('bulk_update_requests', 'POST', '/api/requests/bulk-update/', 'Admin', 9,
+                data=lambda world: {'request_ids': list(world['ngo'].food_requests.values_list('id', flat=True)),
+                                    'status': 'Rejected'}),
+    QueryBudget('pickup_route', 'GET', '/api/requests/route/?lat=28.6&lng=77.2', 'NGO/Volunteer', 3),
+]
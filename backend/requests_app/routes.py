@@ -0,0 +1,176 @@
+"""
+Pickup route planning for a volunteer's approved requests.
+
+Each stop is a listing's location, and its expiry_time is the pickup
+deadline. Travel uses straight-line (haversine) distance at ROUTE_SPEED_KMH,
+plus ROUTE_STOP_MINUTES at each stop.
+
+plan_route() orders the stops in two steps:
+
+1. Build a first order with a greedy heuristic. Nearest neighbour only
+   moves to stops it can still reach in time; once none is left, the rest
+   go by earliest deadline. An earliest-deadline-first order is also
+   built, and the better of the two is kept.
+2. Improve it with 2-opt. A segment is reversed when that shortens the
+   route without making more stops late. This repeats until no such move
+   is left, or for at most ROUTE_MAX_PASSES passes.
+
+Routes are open paths that end at the last pickup. Without a starting
+point, node 0 is a virtual start at zero distance from every stop, so the
+route begins wherever suits it best. Distance matrices are cached per
+point set. Plans are cached per request set and departure minute. Both
+last ROUTE_CACHE_TTL seconds.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+
+from food_listings.geo import haversine_km
+
+def distance_matrix(points):
+    """Distances (km) between (latitude, longitude) points; a None point is 0 km from everything"""
+    size = len(points)
+    matrix = [[0.0] * size for _ in range(size)]
+    for i in range(size):
+        if points[i] is None:
+            continue
+        for j in range(i + 1, size):
+            if points[j] is not None:
+                matrix[i][j] = matrix[j][i] = haversine_km(*points[i], *points[j])
+    return matrix
+
+def _cache_key(prefix, payload):
+    digest = hashlib.md5(json.dumps(payload).encode(), usedforsecurity=False).hexdigest()
+    return f'route:{prefix}:{digest}'
+
+def get_distance_matrix(points):
+    key = _cache_key('matrix', points)
+    matrix = cache.get(key)
+    if matrix is None:
+        matrix = distance_matrix(points)
+        cache.set(key, matrix, settings.ROUTE_CACHE_TTL)
+    return matrix
+
+class RoutePlanner:
+    """
+    Orders nodes 1..n of a distance matrix, starting from node 0.
+
+    `deadlines[node]` is in minutes after departure (deadlines[0] is unused).
+    """
+
+    def __init__(self, matrix, deadlines, speed_kmh, stop_minutes):
+        self.matrix = matrix
+        self.deadlines = deadlines
+        self.minutes_per_km = 60 / speed_kmh
+        self.stop_minutes = stop_minutes
+
+    def schedule(self, order):
+        """Arrival minute at every stop of `order`, and how many arrive after their deadline"""
+        arrivals = []
+        late = 0
+        clock = 0.0
+        position = 0
+        for node in order:
+            clock += self.matrix[position][node] * self.minutes_per_km
+            arrivals.append(clock)
+            if clock > self.deadlines[node]:
+                late += 1
+            clock += self.stop_minutes
+            position = node
+        return arrivals, late
+
+    def length(self, order):
+        return sum(self.matrix[a][b] for a, b in zip([0] + order, order))
+
+    def nearest_neighbour(self):
+        unvisited = set(range(1, len(self.matrix)))
+        order = []
+        position = 0
+        clock = 0.0
+        while unvisited:
+            distances = self.matrix[position]
+            reachable = [
+                node for node in unvisited
+                if clock + distances[node] * self.minutes_per_km <= self.deadlines[node]
+            ]
+            if reachable:
+                node = min(reachable, key=distances.__getitem__)
+            else:
+                node = min(unvisited, key=lambda candidate: (self.deadlines[candidate], distances[candidate]))
+            clock += distances[node] * self.minutes_per_km + self.stop_minutes
+            order.append(node)
+            unvisited.remove(node)
+            position = node
+        return order
+
+    def earliest_deadline_first(self):
+        return sorted(range(1, len(self.matrix)), key=self.deadlines.__getitem__)
+
+    def two_opt(self, order, max_passes):
+        """Reverse segments while that shortens the route without adding late stops"""
+        matrix = self.matrix
+        path = [0] + order
+        last = len(path) - 1
+        late = self.schedule(order)[1]
+        for _ in range(max_passes):
+            improved = False
+            for i in range(1, last):
+                for j in range(i + 1, last + 1):
+                    # Reversing path[i..j] swaps edges (a, b) and (c, d) for (a, c) and (b, d)
+                    a, b, c = path[i - 1], path[i], path[j]
+                    delta = matrix[a][c] - matrix[a][b]
+                    if j < last:
+                        d = path[j + 1]
+                        delta += matrix[b][d] - matrix[c][d]
+                    if delta >= -1e-9:
+                        continue
+                    candidate = path[:i] + path[j:i - 1:-1] + path[j + 1:]
+                    candidate_late = self.schedule(candidate[1:])[1]
+                    if candidate_late <= late:
+                        path, late, improved = candidate, candidate_late, True
+            if not improved:
+                break
+        return path[1:]
+
+    def plan(self, max_passes):
+        seeds = [self.nearest_neighbour(), self.earliest_deadline_first()]
+        order = min(seeds, key=lambda seed: (self.schedule(seed)[1], self.length(seed)))
+        return self.two_opt(order, max_passes)
+
+def plan_route(start, stops, departure):
+    """
+    Order `stops`, dicts with 'latitude', 'longitude' and 'deadline' (a datetime),
+    leaving `start` (a (latitude, longitude) pair, or None) at `departure`.
+
+    Returns {'order': stop indexes, 'arrivals': minutes after departure,
+    'legs': km per leg, 'late': stops reached after their deadline, 'distance_km'}.
+    """
+    if not stops:
+        return {'order': [], 'arrivals': [], 'legs': [], 'late': 0, 'distance_km': 0.0}
+    points = [list(start) if start else None] + [[stop['latitude'], stop['longitude']] for stop in stops]
+    matrix = get_distance_matrix(points)
+    deadlines = [0.0] + [(stop['deadline'] - departure).total_seconds() / 60 for stop in stops]
+
+    planner = RoutePlanner(matrix, deadlines, settings.ROUTE_SPEED_KMH, settings.ROUTE_STOP_MINUTES)
+    order = planner.plan(settings.ROUTE_MAX_PASSES)
+    arrivals, late = planner.schedule(order)
+    legs = [matrix[a][b] for a, b in zip([0] + order, order)]
+    return {
+        'order': [node - 1 for node in order],
+        'arrivals': arrivals,
+        'legs': legs,
+        'late': late,
+        'distance_km': sum(legs),
+    }
+
+def get_route_plan(start, stops, departure, key):
+    """plan_route() cached under `key`, which identifies the request set, and `departure`"""
+    cache_key = _cache_key('plan', [key, start, departure.isoformat()])
+    plan = cache.get(cache_key)
+    if plan is not None:
+        return plan, True
+    plan = plan_route(start, stops, departure)
+    cache.set(cache_key, plan, settings.ROUTE_CACHE_TTL)
+    return plan, False
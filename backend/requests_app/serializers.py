@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import FoodRequest
+from .transitions import TRANSITIONS, invalid_transition_message
 from food_listings.serializers import FoodListingSerializer
 from accounts.serializers import UserSerializer
 
@@ -16,25 +17,12 @@ class FoodRequestSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'requested_by', 'created_at', 'updated_at']
 
 class FoodRequestCreateSerializer(serializers.ModelSerializer):
+    # A plain id: availability and duplicates are enforced atomically by claim_listing()
+    food_item = serializers.IntegerField(source='food_item_id')
+    
     class Meta:
         model = FoodRequest
         fields = ['food_item', 'message']
-    
-    def validate_food_item(self, value):
-        # Check if food item is available
-        if value.status != 'Available':
-            raise serializers.ValidationError("This food item is no longer available")
-        
-        # Check if user already requested this item
-        user = self.context['request'].user
-        if FoodRequest.objects.filter(food_item=value, requested_by=user).exists():
-            raise serializers.ValidationError("You have already requested this food item")
-        
-        return value
-    
-    def create(self, validated_data):
-        validated_data['requested_by'] = self.context['request'].user
-        return super().create(validated_data)
 
 class FoodRequestUpdateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -46,7 +34,10 @@ class FoodRequestUpdateSerializer(serializers.ModelSerializer):
         user = self.context['request'].user
         food_request = self.instance
         
-        if user.role not in ['Admin'] and user != food_request.food_item.created_by:
+        if user.role not in ['Admin'] and user.id != food_request.food_item.created_by_id:
             raise serializers.ValidationError("You don't have permission to update this request")
         
+        if value != food_request.status and value not in TRANSITIONS[food_request.status]:
+            raise serializers.ValidationError(invalid_transition_message(food_request.status, value))
+        
         return value
\ No newline at end of file
@@ -0,0 +1,7 @@
+from django.dispatch import Signal
+
+# Sent by code paths that change request statuses without Model.save(), such as
+# QuerySet.update(). `changes` is a list of (request_id, listing_id,
+# requester_id, provider_id, old_status, new_status) tuples. Senders must send
+# it inside the transaction that made the change.
+requests_bulk_changed = Signal()
@@ -0,0 +1,226 @@
+import threading
+from collections import Counter
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from food_listings.counters import get_status_counts
+from food_listings.models import FoodListing
+from .claims import ClaimConflict, ListingNotFound, claim_listing
+from .models import FoodRequest
+
+User = get_user_model()
+
+class RequestStatusUpdateTests(TestCase):
+    def setUp(self):
+        self.provider = User.objects.create_user(
+            username='provider', email='provider@example.com', password='pw',
+            full_name='Provider', role='FoodProvider',
+        )
+        self.ngos = [
+            User.objects.create_user(
+                username=f'ngo{n}', email=f'ngo{n}@example.com', password='pw', full_name='NGO', role='NGO/Volunteer',
+            )
+            for n in range(3)
+        ]
+        self.listing = FoodListing.objects.create(
+            title='Soup', description='Soup', location='Delhi', expiry_time=timezone.now() + timedelta(hours=6),
+            status='Requested', created_by=self.provider,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.provider)
+
+    def make_request(self, request_status='Pending', ngo=0):
+        return FoodRequest.objects.create(food_item=self.listing, requested_by=self.ngos[ngo], status=request_status)
+
+    def patch(self, request_obj, new_status):
+        return self.client.patch(f'/api/requests/{request_obj.id}/', {'status': new_status}, format='json')
+
+    def test_approve_and_complete_move_the_listing(self):
+        request_obj = self.make_request()
+
+        response = self.patch(request_obj, 'Approved')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'Approved')
+        self.listing.refresh_from_db()
+        self.assertEqual(self.listing.status, 'Collected')
+
+        self.assertEqual(self.patch(request_obj, 'Completed').status_code, 200)
+        self.listing.refresh_from_db()
+        self.assertEqual(self.listing.status, 'Distributed')
+
+    def test_rejects_transitions_outside_the_state_machine(self):
+        transitions = (('Completed', 'Pending'), ('Rejected', 'Approved'), ('Pending', 'Completed'))
+        for ngo, (old_status, new_status) in enumerate(transitions):
+            with self.subTest(old_status=old_status, new_status=new_status):
+                request_obj = self.make_request(old_status, ngo)
+                response = self.patch(request_obj, new_status)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('status', response.data)
+                request_obj.refresh_from_db()
+                self.assertEqual(request_obj.status, old_status)
+
+    def test_same_status_is_a_no_op(self):
+        request_obj = self.make_request('Completed')
+        self.assertEqual(self.patch(request_obj, 'Completed').status_code, 200)
+
+    def test_reject_keeps_listing_while_another_request_is_approved(self):
+        self.listing.status = 'Collected'
+        self.listing.save()
+        self.make_request('Approved')
+        pending = self.make_request(ngo=1)
+
+        self.assertEqual(self.patch(pending, 'Rejected').status_code, 200)
+        self.listing.refresh_from_db()
+        self.assertEqual(self.listing.status, 'Collected')
+
+    def test_reject_of_last_request_puts_listing_back_on_offer(self):
+        approved = self.make_request('Approved')
+        self.listing.status = 'Collected'
+        self.listing.save()
+
+        self.assertEqual(self.patch(approved, 'Rejected').status_code, 200)
+        self.listing.refresh_from_db()
+        self.assertEqual(self.listing.status, 'Available')
+
+class ClaimListingTests(TestCase):
+    def setUp(self):
+        self.provider = User.objects.create_user(
+            username='provider', email='provider@example.com', password='pw',
+            full_name='Provider', role='FoodProvider',
+        )
+        self.ngo = User.objects.create_user(
+            username='ngo', email='ngo@example.com', password='pw', full_name='NGO', role='NGO/Volunteer',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.ngo)
+
+    def make_listing(self, listing_status='Available', expires_in=timedelta(hours=6)):
+        return FoodListing.objects.create(
+            title='Soup', description='Soup', location='Delhi', expiry_time=timezone.now() + expires_in,
+            status=listing_status, created_by=self.provider,
+        )
+
+    def post(self, listing_id):
+        return self.client.post('/api/requests/', {'food_item': listing_id, 'message': 'On our way'}, format='json')
+
+    def assertConflict(self, listing_id, code):
+        with self.assertRaises(ClaimConflict) as raised:
+            claim_listing(listing_id, self.ngo)
+        self.assertEqual(raised.exception.code, code)
+        response = self.post(listing_id)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['code'], code)
+
+    def test_claim_marks_listing_requested(self):
+        listing = self.make_listing()
+
+        response = self.post(listing.id)
+
+        self.assertEqual(response.status_code, 201)
+        listing.refresh_from_db()
+        self.assertEqual(listing.status, 'Requested')
+        self.assertTrue(FoodRequest.objects.filter(food_item=listing, requested_by=self.ngo).exists())
+
+    def test_duplicate_request(self):
+        listing = self.make_listing()
+        claim_listing(listing.id, self.ngo)
+        self.assertConflict(listing.id, 'duplicate_request')
+
+    def test_unavailable_listing(self):
+        for listing_status in ('Requested', 'Collected', 'Distributed'):
+            with self.subTest(listing_status):
+                self.assertConflict(self.make_listing(listing_status).id, 'listing_unavailable')
+
+    def test_expired_listing(self):
+        for listing in (self.make_listing(expires_in=-timedelta(minutes=1)), self.make_listing('Expired')):
+            with self.subTest(listing.status):
+                self.assertConflict(listing.id, 'listing_expired')
+
+    def test_unknown_listing(self):
+        with self.assertRaises(ListingNotFound):
+            claim_listing(999999, self.ngo)
+        response = self.post(999999)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('food_item', response.data)
+
+class ConcurrentClaimTests(TransactionTestCase):
+    """Many threads claim the same listings at once; exactly one claim per listing wins"""
+    threads = 8
+    listings = 5
+
+    def setUp(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('Threads need a shared database; use a file-based SQLite or PostgreSQL')
+        self.provider = User.objects.create_user(
+            username='provider', email='provider@example.com', password=None,
+            full_name='Provider', role='FoodProvider',
+        )
+        self.ngos = [
+            User.objects.create_user(
+                username=f'ngo{n}', email=f'ngo{n}@example.com', password=None, full_name='NGO', role='NGO/Volunteer',
+            )
+            for n in range(self.threads)
+        ]
+
+    def make_listings(self, count):
+        expiry = timezone.now() + timedelta(days=1)
+        return [
+            FoodListing.objects.create(
+                title=f'Soup {n}', description='Soup', location='Delhi', expiry_time=expiry, created_by=self.provider,
+            )
+            for n in range(count)
+        ]
+
+    def race(self, claims):
+        """Run (listing_id, user) claims in parallel, all starting together; return outcome counts"""
+        outcomes = Counter()
+        lock = threading.Lock()
+        barrier = threading.Barrier(len(claims))
+
+        def worker(listing_id, user):
+            try:
+                barrier.wait()
+                try:
+                    claim_listing(listing_id, user)
+                    outcome = 'claimed'
+                except ClaimConflict as conflict:
+                    outcome = conflict.code
+                except Exception as e:
+                    outcome = f'error: {e.__class__.__name__}: {e}'
+                with lock:
+                    outcomes[outcome] += 1
+            finally:
+                connections.close_all()
+
+        workers = [threading.Thread(target=worker, args=claim) for claim in claims]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return outcomes
+
+    def test_one_winner_per_listing(self):
+        listings = self.make_listings(self.listings)
+        for listing in listings:
+            with self.subTest(listing=listing.id):
+                outcomes = self.race([(listing.id, ngo) for ngo in self.ngos])
+                self.assertEqual(outcomes, {'claimed': 1, 'listing_unavailable': self.threads - 1})
+
+        self.assertEqual(
+            sorted(FoodRequest.objects.values_list('food_item_id', flat=True)), [listing.id for listing in listings]
+        )
+        self.assertFalse(FoodListing.objects.exclude(status='Requested').exists())
+        self.assertEqual(get_status_counts(provider=self.provider), {'Available': 0, 'Requested': self.listings})
+
+    def test_duplicate_claims_from_one_user(self):
+        listing = self.make_listings(1)[0]
+
+        outcomes = self.race([(listing.id, self.ngos[0])] * self.threads)
+
+        self.assertEqual(outcomes, {'claimed': 1, 'duplicate_request': self.threads - 1})
+        self.assertEqual(FoodRequest.objects.filter(food_item=listing).count(), 1)
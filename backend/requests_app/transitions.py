@@ -0,0 +1,138 @@
+"""
+Set-based status transitions for food requests, one or many at a time.
+
+transition_requests() is the one place request statuses change after creation:
+FoodRequestDetailView.perform_update calls it for a single request and
+bulk_update_requests for a batch. It works inside one transaction, with a fixed
+number of statements no matter how many requests are involved:
+
+1. lock and read the requests,
+2. one UPDATE for every request whose transition is allowed,
+3. one SELECT ... FOR UPDATE and one UPDATE for the listings that move
+   (Requested -> Collected on approval, Collected -> Distributed on completion,
+   back to Available when a rejection leaves a listing without pending or
+   approved requests),
+4. one INSERT queuing all requester notifications.
+
+Listing counters and caches are kept in step through listings_bulk_changed.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.template.loader import get_template
+from django.utils import timezone
+
+from food_listings.models import FoodListing
+from food_listings.signals import listings_bulk_changed
+from notifications.utils import build_email, queue_emails
+from .models import FoodRequest
+from .signals import requests_bulk_changed
+
+# Allowed request status changes
+TRANSITIONS = {
+    'Pending': {'Approved', 'Rejected'},
+    'Approved': {'Completed', 'Rejected'},
+    'Completed': set(),
+    'Rejected': set(),
+}
+
+# Listing status changes caused by moving a request to a status: {new request status: (from, to)}
+LISTING_TRANSITIONS = {
+    'Approved': (['Requested'], 'Collected'),
+    'Completed': (['Collected'], 'Distributed'),
+    'Rejected': (['Requested', 'Collected'], 'Available'),
+}
+
+MAX_BULK_REQUESTS = 5000
+
+def invalid_transition_message(old_status, new_status):
+    allowed = ', '.join(sorted(TRANSITIONS[old_status])) or 'none'
+    return f'A {old_status} request cannot become {new_status} (allowed: {allowed})'
+
+def transition_requests(request_ids, new_status):
+    """
+    Move requests to `new_status`.
+
+    Returns (outcomes, listings_changed): outcomes maps every requested id to
+    {'outcome': 'updated' | 'unchanged' | 'invalid_transition' | 'not_found',
+    'previous_status': ...}, and listings_changed is the number of listings
+    whose status moved as a consequence.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        rows = {
+            row['id']: row
+            for row in FoodRequest.objects.select_for_update(of=('self',))
+            .filter(id__in=request_ids)
+            .values('id', 'status', 'food_item_id', 'requested_by_id', 'food_item__created_by_id')
+        }
+
+        outcomes = {}
+        to_update = []
+        for request_id in request_ids:
+            row = rows.get(request_id)
+            if row is None:
+                outcomes[request_id] = {'outcome': 'not_found', 'previous_status': None}
+            elif row['status'] == new_status:
+                outcomes[request_id] = {'outcome': 'unchanged', 'previous_status': row['status']}
+            elif new_status not in TRANSITIONS[row['status']]:
+                outcomes[request_id] = {'outcome': 'invalid_transition', 'previous_status': row['status']}
+            else:
+                outcomes[request_id] = {'outcome': 'updated', 'previous_status': row['status']}
+                to_update.append(request_id)
+
+        if not to_update:
+            return outcomes, 0
+
+        FoodRequest.objects.filter(id__in=to_update).update(status=new_status, updated_at=now)
+        requests_bulk_changed.send(sender=FoodRequest, changes=[
+            (request_id, rows[request_id]['food_item_id'], rows[request_id]['requested_by_id'],
+             rows[request_id]['food_item__created_by_id'], rows[request_id]['status'], new_status)
+            for request_id in to_update
+        ])
+        listing_ids = {rows[request_id]['food_item_id'] for request_id in to_update}
+        listings_changed = _move_listings(listing_ids, new_status, now)
+        _queue_status_notifications(to_update)
+
+    return outcomes, listings_changed
+
+def _move_listings(listing_ids, new_request_status, now):
+    from_statuses, to_status = LISTING_TRANSITIONS[new_request_status]
+    listings = FoodListing.objects.filter(id__in=listing_ids, status__in=from_statuses)
+    if new_request_status == 'Rejected':
+        # Only listings nobody else is still waiting for or collecting go back on offer
+        listings = listings.exclude(Exists(
+            FoodRequest.objects.filter(food_item=OuterRef('pk'), status__in=('Pending', 'Approved'))
+        ))
+
+    moving = list(listings.select_for_update().values_list('id', 'created_by_id', 'status'))
+    if not moving:
+        return 0
+
+    FoodListing.objects.filter(id__in=[listing_id for listing_id, _, _ in moving]).update(
+        status=to_status, updated_at=now
+    )
+    listings_bulk_changed.send(
+        sender=FoodListing,
+        changes=[(listing_id, provider_id, status, to_status) for listing_id, provider_id, status in moving],
+    )
+    return len(moving)
+
+def _queue_status_notifications(request_ids):
+    """Render one status email per request and queue them with a single INSERT"""
+    if not settings.NOTIFICATION_EMAIL_ENABLED:
+        return
+    template = get_template('emails/food_request_status_updated.html')
+    emails = []
+    for request_obj in FoodRequest.objects.filter(id__in=request_ids).select_related('food_item', 'requested_by'):
+        html_message = template.render({
+            'user': request_obj.requested_by,
+            'request': request_obj,
+            'listing': request_obj.food_item,
+        })
+        emails.append(build_email(
+            request_obj.requested_by.email,
+            f'Food Request {request_obj.status}: {request_obj.food_item.title}',
+            html_message,
+        ))
+    queue_emails(emails)
@@ -7,4 +7,5 @@ urlpatterns = [
     path('my-requests/', views.my_requests, name='my_requests'),
     path('for-my-food/', views.requests_for_my_food, name='requests_for_my_food'),
     path('bulk-update/', views.bulk_update_requests, name='bulk_update_requests'),
+    path('route/', views.pickup_route, name='pickup_route'),
 ]
\ No newline at end of file
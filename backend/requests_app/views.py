@@ -1,33 +1,50 @@
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import APIException, NotFound, PermissionDenied, ValidationError
 from rest_framework.response import Response
+from django.conf import settings
 from django.db.models import Q
+from django.utils import timezone
 
+from food_donation.compiled_serializers import compile_serializer
+from food_donation.conditional import (
+    ConditionalListMixin, ConditionalRetrieveMixin, collection_etag, not_modified, set_validators
+)
+from food_donation.streaming import stream_json_list, wants_stream
+from .claims import ClaimConflict, ListingNotFound, claim_listing
 from .models import FoodRequest
 from .serializers import (
     FoodRequestSerializer, 
     FoodRequestCreateSerializer,
     FoodRequestUpdateSerializer
 )
-from .permissions import IsRequesterOrFoodProviderOrAdmin
+from .permissions import IsRequesterOrFoodProviderOrAdmin, visible_requests
+from .routes import get_route_plan
+from .transitions import MAX_BULK_REQUESTS, TRANSITIONS, invalid_transition_message, transition_requests
 from food_listings.utils import send_request_notification
 
-class FoodRequestListCreateView(generics.ListCreateAPIView):
+class Conflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Conflict'
+    default_code = 'conflict'
+
+# Request responses embed the listing, its provider and the requester
+REQUEST_MODIFIED_FIELDS = (
+    'updated_at', 'food_item__updated_at', 'food_item__created_by__updated_at', 'requested_by__updated_at'
+)
+
+class FoodRequestListCreateView(ConditionalListMixin, generics.ListCreateAPIView):
     serializer_class = FoodRequestSerializer
     permission_classes = [permissions.IsAuthenticated]
+    etag_modified_fields = REQUEST_MODIFIED_FIELDS
+    etag_expiry_field = 'food_item__expiry_time'
     
     def get_queryset(self):
-        user = self.request.user
-        queryset = FoodRequest.objects.select_related('food_item', 'requested_by', 'food_item__created_by')
-        
         # Filter based on user role
-        if user.role == 'NGO/Volunteer':
-            # NGOs see only their own requests
-            queryset = queryset.filter(requested_by=user)
-        elif user.role == 'FoodProvider':
-            # Food providers see requests for their food items
-            queryset = queryset.filter(food_item__created_by=user)
-        # Admins see all requests
+        queryset = visible_requests(
+            self.request.user,
+            FoodRequest.objects.select_related('food_item', 'requested_by', 'food_item__created_by'),
+        )
         
         # Apply filters
         status_filter = self.request.query_params.get('status')
@@ -45,25 +62,41 @@ class FoodRequestListCreateView(generics.ListCreateAPIView):
             return FoodRequestCreateSerializer
         return FoodRequestSerializer
     
+    def list(self, request, *args, **kwargs):
+        if not settings.FAST_SERIALIZERS_ENABLED:
+            return super().list(request, *args, **kwargs)
+        
+        # Paginate plain rows and render them with the compiled serializer
+        compiled = compile_serializer(FoodRequestSerializer)
+        rows = compiled.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(compiled.serialize(page))
+        return Response(compiled.serialize(rows))
+    
     def perform_create(self, serializer):
         # Only NGOs/Volunteers can create requests
         if self.request.user.role not in ['NGO/Volunteer', 'Admin']:
-            raise permissions.PermissionDenied("Only NGOs/Volunteers can create food requests")
-        
-        request_obj = serializer.save()
+            raise PermissionDenied("Only NGOs/Volunteers can create food requests")
         
-        # Update food listing status to 'Requested'
-        food_item = request_obj.food_item
-        if food_item.status == 'Available':
-            food_item.status = 'Requested'
-            food_item.save()
+        # Claim the listing and create the request in one atomic step
+        food_item_id = serializer.validated_data['food_item_id']
+        try:
+            request_obj = claim_listing(food_item_id, self.request.user, serializer.validated_data.get('message'))
+        except ListingNotFound:
+            raise ValidationError({'food_item': [f'Invalid pk "{food_item_id}" - object does not exist.']})
+        except ClaimConflict as conflict:
+            raise Conflict({'error': str(conflict), 'code': conflict.code})
+        serializer.instance = request_obj
         
         # Send notification emails
         send_request_notification(request_obj, 'created')
 
-class FoodRequestDetailView(generics.RetrieveUpdateDestroyAPIView):
+class FoodRequestDetailView(ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = FoodRequest.objects.select_related('food_item', 'requested_by', 'food_item__created_by')
     permission_classes = [permissions.IsAuthenticated, IsRequesterOrFoodProviderOrAdmin]
+    etag_modified_fields = REQUEST_MODIFIED_FIELDS
+    etag_expiry_field = 'food_item__expiry_time'
     
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
@@ -71,31 +104,17 @@ class FoodRequestDetailView(generics.RetrieveUpdateDestroyAPIView):
         return FoodRequestSerializer
     
     def perform_update(self, serializer):
-        old_status = self.get_object().status
-        request_obj = serializer.save()
-        
-        # Update food listing status based on request status
-        food_item = request_obj.food_item
-        if request_obj.status == 'Approved' and food_item.status == 'Requested':
-            food_item.status = 'Collected'
-            food_item.save()
-        elif request_obj.status == 'Completed' and food_item.status == 'Collected':
-            food_item.status = 'Distributed'
-            food_item.save()
-        elif request_obj.status == 'Rejected':
-            # Check if there are other pending requests
-            other_pending = FoodRequest.objects.filter(
-                food_item=food_item, 
-                status='Pending'
-            ).exclude(id=request_obj.id).exists()
-            
-            if not other_pending:
-                food_item.status = 'Available'
-                food_item.save()
-        
-        # Send notification if status changed
-        if old_status != request_obj.status:
-            send_request_notification(request_obj, 'status_updated')
+        # Same rules, listing moves and notifications as bulk updates
+        request_obj = serializer.instance
+        new_status = serializer.validated_data.get('status', request_obj.status)
+        outcomes, _ = transition_requests([request_obj.id], new_status)
+        outcome = outcomes[request_obj.id]
+        if outcome['outcome'] == 'not_found':
+            raise NotFound()
+        if outcome['outcome'] == 'invalid_transition':
+            # Another update moved the request after the serializer checked it
+            raise ValidationError({'status': [invalid_transition_message(outcome['previous_status'], new_status)]})
+        request_obj.status = new_status
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
@@ -109,10 +128,18 @@ def my_requests(request):
     
     requests = FoodRequest.objects.filter(
         requested_by=request.user
-    ).select_related('food_item', 'food_item__created_by').order_by('-created_at')
+    ).select_related('food_item', 'food_item__created_by', 'requested_by').order_by('-created_at')
+    
+    etag = collection_etag(request, requests, REQUEST_MODIFIED_FIELDS, 'food_item__expiry_time')
+    response = not_modified(request, etag)
+    if response is not None:
+        return set_validators(response, etag)
+    
+    if wants_stream(request):
+        return set_validators(stream_json_list(requests, FoodRequestSerializer), etag)
     
     serializer = FoodRequestSerializer(requests, many=True)
-    return Response(serializer.data)
+    return set_validators(Response(serializer.data), etag)
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
@@ -126,10 +153,18 @@ def requests_for_my_food(request):
     
     requests = FoodRequest.objects.filter(
         food_item__created_by=request.user
-    ).select_related('food_item', 'requested_by').order_by('-created_at')
+    ).select_related('food_item', 'food_item__created_by', 'requested_by').order_by('-created_at')
+    
+    etag = collection_etag(request, requests, REQUEST_MODIFIED_FIELDS, 'food_item__expiry_time')
+    response = not_modified(request, etag)
+    if response is not None:
+        return set_validators(response, etag)
+    
+    if wants_stream(request):
+        return set_validators(stream_json_list(requests, FoodRequestSerializer), etag)
     
     serializer = FoodRequestSerializer(requests, many=True)
-    return Response(serializer.data)
+    return set_validators(Response(serializer.data), etag)
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
@@ -150,11 +185,130 @@ def bulk_update_requests(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    updated_count = FoodRequest.objects.filter(
-        id__in=request_ids
-    ).update(status=new_status)
+    if new_status not in TRANSITIONS:
+        return Response(
+            {'error': f'Invalid status. Choose from: {", ".join(TRANSITIONS)}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # A string would otherwise be iterated character by character ("123" -> 1, 2, 3)
+    if not isinstance(request_ids, list) or not all(
+        isinstance(request_id, int) and not isinstance(request_id, bool) for request_id in request_ids
+    ):
+        return Response(
+            {'error': 'request_ids must be a list of integers'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    request_ids = list(dict.fromkeys(request_ids))
+    
+    if len(request_ids) > MAX_BULK_REQUESTS:
+        return Response(
+            {'error': f'At most {MAX_BULK_REQUESTS} requests can be updated at once'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    outcomes, listings_changed = transition_requests(request_ids, new_status)
+    updated_count = sum(1 for outcome in outcomes.values() if outcome['outcome'] == 'updated')
     
     return Response({
         'message': f'Updated {updated_count} requests to {new_status}',
-        'updated_count': updated_count
-    })
\ No newline at end of file
+        'updated_count': updated_count,
+        'listings_updated': listings_changed,
+        'results': [{'id': request_id, **outcome} for request_id, outcome in outcomes.items()],
+    })
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def pickup_route(request):
+    """
+    Order the caller's approved pickups into a route that meets expiry times
+    (see requests_app/routes.py).
+
+    The route starts from ?lat=&lng=, else from the caller's profile location,
+    else at whichever pickup suits it best.
+    """
+    user = request.user
+    if user.role not in ['NGO/Volunteer', 'Admin']:
+        return Response(
+            {'error': 'Only NGOs/Volunteers can access this endpoint'}, 
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    if ('lat' in request.query_params) != ('lng' in request.query_params):
+        return Response(
+            {'error': 'Pass both lat and lng, or neither'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        lat = request.query_params.get('lat', user.latitude)
+        lng = request.query_params.get('lng', user.longitude)
+        start = (float(lat), float(lng)) if lat is not None and lng is not None else None
+    except ValueError:
+        return Response(
+            {'error': 'lat and lng must be numbers'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if start and not (-90 <= start[0] <= 90 and -180 <= start[1] <= 180):
+        return Response(
+            {'error': 'Invalid coordinates'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    approved = FoodRequest.objects.filter(
+        requested_by=user, status='Approved'
+    ).select_related('food_item', 'food_item__created_by').order_by('id')
+    stops, unroutable = [], []
+    for food_request in approved:
+        listing = food_request.food_item
+        if listing.latitude is None or listing.longitude is None:
+            unroutable.append(food_request)
+        else:
+            stops.append(food_request)
+    if len(stops) > settings.ROUTE_MAX_STOPS:
+        return Response(
+            {'error': f'Too many approved pickups to plan at once (at most {settings.ROUTE_MAX_STOPS})'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    departure = timezone.now().replace(second=0, microsecond=0)
+    points = [
+        {'latitude': r.food_item.latitude, 'longitude': r.food_item.longitude, 'deadline': r.food_item.expiry_time}
+        for r in stops
+    ]
+    # The request set, as far as planning is concerned
+    key = [[r.id, point['latitude'], point['longitude'], point['deadline'].isoformat()] for r, point in zip(stops, points)]
+    plan, cached = get_route_plan(start, points, departure, key)
+    
+    route = []
+    for index, arrival, leg in zip(plan['order'], plan['arrivals'], plan['legs']):
+        food_request = stops[index]
+        listing = food_request.food_item
+        arrives_at = departure + timezone.timedelta(minutes=arrival)
+        route.append({
+            'request_id': food_request.id,
+            'listing_id': listing.id,
+            'title': listing.title,
+            'location': listing.location,
+            'latitude': listing.latitude,
+            'longitude': listing.longitude,
+            'provider': listing.created_by.organization or listing.created_by.full_name,
+            'provider_phone': listing.created_by.phone,
+            'leg_km': round(leg, 3),
+            'arrival': arrives_at,
+            'deadline': listing.expiry_time,
+            'on_time': arrives_at <= listing.expiry_time,
+        })
+    
+    return Response({
+        'departure': departure,
+        'start': {'latitude': start[0], 'longitude': start[1]} if start else None,
+        'distance_km': round(plan['distance_km'], 3),
+        'duration_minutes': round(plan['arrivals'][-1], 1) if plan['arrivals'] else 0,
+        'late_stops': plan['late'],
+        'stops': route,
+        'unroutable': [
+            {'request_id': r.id, 'listing_id': r.food_item.id, 'title': r.food_item.title, 'location': r.food_item.location}
+            for r in unroutable
+        ],
+        'cached': cached,
+    })
@@ -204,7 +204,7 @@ class ApiClient {
 
       if (response.ok) {
         const data = await response.json();
-        TokenManager.setTokens(data.access, refreshToken);
+        TokenManager.setTokens(data.access, data.refresh ?? refreshToken);
         return true;
       }
     } catch (error) {